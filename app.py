@@ -1,8 +1,11 @@
 import pandas as pd
 import streamlit as st
-from src.cloud_io import MongoIO
-from src.constants import SESSION_PRODUCT_KEY
-from src.scrapper.scrape import ScrapeReviews 
+import time
+from src.constants import (JOB_POLL_SECONDS, PAGE_CACHE_MODE, PAGE_CACHE_TTL_SECONDS, SESSION_JOB_KEY,
+                           SESSION_PRODUCT_KEY)
+from src.jobs import get_job_queue
+from src.jobs.store import JobStore
+from src.metrics import get_metrics, prometheus_text, summary_table
 
 
 
@@ -32,40 +35,134 @@ def form_input():
                                      step=1,
                                      min_value=1)
 
+    incremental = st.checkbox("Only fetch reviews newer than the ones already stored",
+                              help="Stops scrolling each product at the reviews already in MongoDB "
+                                   "and stores only the new ones.")
+
+    if PAGE_CACHE_MODE != "off":
+        # Pages may then come from the on-disk cache instead of the live site
+        st.caption(f"Page cache is {PAGE_CACHE_MODE} (PAGE_CACHE_MODE): cached pages can be up to "
+                   f"{PAGE_CACHE_TTL_SECONDS / 3600:g} hours old; cache hits are listed under "
+                   "Diagnostics.")
+
     if st.button("Scrape Reviews"):
         st.session_state["data_available_for_analysis"] = False # Assume no data until proven otherwise
         st.session_state["scraped_reviews_df"] = pd.DataFrame() # Clear old data before new scrape
 
-        scrapper = ScrapeReviews(
-            product_name=product,
-            no_of_products=int(no_of_products)
-        )
+        # The crawl runs in a background worker process; this page only polls it
+        job_id = get_job_queue().submit(product, int(no_of_products), incremental=incremental)
+        st.session_state[SESSION_JOB_KEY] = job_id
+        st.session_state["loaded_job_id"] = None
+        # Kept in the URL too, so a browser refresh finds the job again
+        st.experimental_set_query_params(job=job_id)
 
-        with st.spinner("Scraping reviews... this might take a moment."):
-            scrapped_data = scrapper.get_review_data()
+    show_job()
 
-        if scrapped_data is not None and not scrapped_data.empty:
-            st.session_state["data_available_for_analysis"] = True
-            st.session_state['scraped_reviews_df'] = scrapped_data # Store the actual DataFrame!
-            
-            mongoio = MongoIO()
-            try:
-                mongoio.store_reviews(product_name=product, reviews=scrapped_data)
-                st.success(f"Successfully scraped and stored {len(scrapped_data)} reviews for '{product}' into MongoDB!")
-            except Exception as e:
-                st.error(f"Failed to store reviews in MongoDB: {e}")
-                st.warning("Analysis will proceed with currently scraped data, but it might not be persistent.")
-            
-            st.dataframe(scrapped_data)
+
+def show_job():
+    job_id = st.session_state.get(SESSION_JOB_KEY) or st.experimental_get_query_params().get("job", [None])[0]
+    if not job_id:
+        return
+    queue = get_job_queue()
+    job = queue.status(job_id)
+    if job is None:
+        return
+    st.session_state[SESSION_JOB_KEY] = job_id
+    product = job["product_name"]
+    incremental = job["options"].get("incremental", False)
+
+    if job["status"] in (JobStore.QUEUED, JobStore.RUNNING):
+        if job["status"] == JobStore.QUEUED:
+            st.info(f"Scrape of '{product}' is queued (position {job['queue_position']})…")
         else:
-            st.session_state["data_available_for_analysis"] = False
+            eta = f", about {job['eta_seconds']:.0f}s left" if job["eta_seconds"] is not None else ""
+            st.info(f"Scraped {job['products_done']} of {job['no_of_products']} products "
+                    f"({job['reviews']} reviews so far{eta})…")
+            st.progress(min(1.0, job["products_done"] / max(1, job["no_of_products"])))
+        if st.button("Cancel scrape"):
+            queue.cancel(job_id)
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
+        return
+
+    if job["status"] == JobStore.FAILED:
+        st.session_state["data_available_for_analysis"] = False
+        st.error(f"Scraping '{product}' failed: {job['error'].splitlines()[0] if job['error'] else ''}")
+        return
+
+    if st.session_state.get("loaded_job_id") != job_id:
+        # Results are read once per job, then kept in the session
+        st.session_state["loaded_job_id"] = job_id
+        st.session_state[SESSION_PRODUCT_KEY] = product
+        scrapped_data = queue.results(job_id)
+        if incremental:
+            # Only new rows were scraped; the analysis page reads the full set from MongoDB
             st.session_state["scraped_reviews_df"] = pd.DataFrame()
-            st.warning(f"No reviews found for '{product}' or unable to scrape. Please try a different product or adjust the number of products.")
-            if scrapped_data is not None:
-                 st.dataframe(scrapped_data) # Still display an empty dataframe if it's empty but not None
+            st.session_state["data_available_for_analysis"] = True
+        else:
+            st.session_state["scraped_reviews_df"] = scrapped_data
+            st.session_state["data_available_for_analysis"] = not scrapped_data.empty
+        st.session_state["job_review_count"] = len(scrapped_data)
+
+    review_count = st.session_state.get("job_review_count", 0)
+    if job["status"] == JobStore.CANCELLED:
+        st.warning(f"Scrape of '{product}' was cancelled after {job['products_done']} products "
+                   f"({review_count} reviews, {job['stored']} new ones stored).")
+    elif incremental:
+        if review_count == 0:
+            st.info(f"No new reviews for '{product}' since the last scrape.")
+        else:
+            st.success(f"Stored {job['stored']} new reviews for '{product}' into MongoDB!")
+    elif review_count and job["error"]:
+        st.error(f"Scraped {review_count} reviews for '{product}' but failed to store them: {job['error']}")
+        st.warning("Analysis will proceed with currently scraped data, but it might not be persistent.")
+    elif review_count:
+        st.success(f"Successfully scraped {review_count} reviews for '{product}' and stored "
+                   f"{job['stored']} new ones into MongoDB (the rest were already stored)!")
+    else:
+        st.warning(f"No reviews found for '{product}' or unable to scrape. Please try a different product or adjust the number of products.")
+
+    if review_count and not incremental:
+        st.dataframe(st.session_state["scraped_reviews_df"])
+
+
+def show_diagnostics():
+    """Optional sidebar panel with the pipeline metrics of the current scrape job and this app."""
+    if not st.sidebar.checkbox("Show diagnostics",
+                               help="Timers and counters per pipeline stage (src/metrics.py)"):
+        return
+    snapshots = {}
+    job_id = st.session_state.get(SESSION_JOB_KEY)
+    if job_id:
+        # Scrapes run in worker processes, which write their metrics next to the job results
+        job_metrics = get_job_queue().metrics(job_id)
+        if job_metrics is not None:
+            snapshots[f"Scrape job {job_id}"] = job_metrics
+    snapshots["App process"] = get_metrics().snapshot()
+
+    for title, snapshot in snapshots.items():
+        st.sidebar.subheader(title)
+        timings = summary_table(snapshot)
+        if not timings and not snapshot["counters"]:
+            st.sidebar.caption("Nothing recorded yet.")
+            continue
+        if timings:
+            st.sidebar.dataframe(pd.DataFrame(timings), hide_index=True)
+        if snapshot["counters"]:
+            st.sidebar.dataframe(pd.DataFrame([
+                {"metric": counter["name"],
+                 "labels": ", ".join(f"{key}={value}" for key, value in counter["labels"].items()),
+                 "value": counter["value"]}
+                for counter in snapshot["counters"]
+            ]), hide_index=True)
+        st.sidebar.download_button("Download (Prometheus format)", prometheus_text(snapshot),
+                                   file_name="metrics.prom", key=f"metrics-{title}")
+
 
 # The main function call
 if __name__ == "__main__":
+    # Before the form: a running job reruns the script from show_job
+    show_diagnostics()
     form_input()
 
     # Add a button to navigate to analysis page or trigger analysis
@@ -0,0 +1,69 @@
+"""
+Microbenchmark of the HTML parser backends on review pages.
+
+    python -m benchmarks.bench_parser                     # generated pages
+    python -m benchmarks.bench_parser --pages saved.html  # pages saved from a scrape
+
+Every backend must produce the same review DataFrame as the BeautifulSoup
+backend; a mismatch is reported and makes the run fail.
+"""
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.fixtures import review_page
+from src.scrapper.parser import PARSERS, get_parser
+
+
+def best_time(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--pages", nargs="*", default=[],
+                            help="saved review page HTML files")
+    arg_parser.add_argument("--sizes", nargs="*", type=int, default=[50, 500, 5000],
+                            help="reviews per generated page (ignored with --pages)")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args(argv)
+
+    if args.pages:
+        pages = {}
+        for path in args.pages:
+            with open(path, encoding="utf-8") as page_file:
+                pages[path] = page_file.read()
+    else:
+        pages = {f"{size} reviews": review_page(size) for size in args.sizes}
+
+    parsers = [get_parser(name) for name in PARSERS]
+    failed = False
+
+    print(f"{'page':<24}{'backend':<10}{'reviews':>9}{'seconds':>12}{'speedup':>10}")
+    for label, page in pages.items():
+        baseline = None
+        for parser in parsers:
+            frame = pd.DataFrame(parser.reviews(page))
+            seconds = best_time(lambda: parser.reviews(page), args.repeat)
+
+            if baseline is None:
+                baseline = (frame, seconds)
+            elif not frame.equals(baseline[0]):
+                print(f"  {parser.name} output differs from {parsers[0].name} on {label}")
+                failed = True
+
+            print(f"{label:<24}{parser.name:<10}{len(frame):>9}{seconds:>12.4f}"
+                  f"{baseline[1] / seconds:>9.1f}x")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+End-to-end benchmark of the scrape and store pipeline on fixture pages.
+
+    python -m benchmarks.bench_pipeline --output bench.json
+    python -m benchmarks.bench_pipeline --output new.json --baseline bench.json [--threshold 0.2]
+
+Each size (total reviews, spread over --products products) is a fixture
+site served by a local HTTP server. The scraper runs against it with the
+HTTP fetcher, and review pages are loaded by FixtureDriver, which gets the
+already scrolled page over HTTP (--chrome scrolls them in a real browser
+instead). Reviews are stored through MongoIO into an in-memory mongomock
+database unless --mongo-url points elsewhere; mongomock has no real
+indexes, so its store timings grow quickly with size and are only
+comparable with other mongomock runs.
+
+With --baseline, a stage that got slower than the baseline by more than
+--threshold (and at least --min-seconds) is reported and fails the run.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.fixtures import FixtureServer, site_pages
+from src.schema import REVIEW_COLUMNS, type_reviews
+from src.scrapper.browser_scripts import PAGE_PROGRESS_JS
+
+SEARCH = "men tshirt"
+STAGES = ["scrape_product_urls", "extract_reviews", "extract_products", "build_dataframe",
+          "store_reviews_new", "store_reviews_existing", "get_review_data"]
+
+
+class FixtureDriver:
+    """
+    Minimal webdriver for fixture review pages: `get` downloads the page,
+    which is already fully scrolled, so the scroll loop has nothing to wait
+    for. Only what ScrapeReviews uses with page_source extraction exists.
+    """
+
+    def __init__(self):
+        self.page_source = ""
+
+    def get(self, url: str):
+        if not url.startswith("http"):
+            self.page_source = ""
+            return
+        with urllib.request.urlopen(url) as response:
+            self.page_source = response.read().decode("utf-8")
+
+    def execute_script(self, script: str, *args):
+        if script == PAGE_PROGRESS_JS:
+            return [self.page_source.count("user-review-main"), len(self.page_source)]
+        return None
+
+    def set_window_size(self, width: int, height: int):
+        pass
+
+    def quit(self):
+        pass
+
+
+def use_mongomock():
+    """Makes the shared MongoDB clients in-memory mongomock clients (needs `mongomock`)."""
+    import mongomock
+    from src import database_connect
+
+    database_connect.close_clients()
+    database_connect._new_client = lambda client_url, listener, **options: mongomock.MongoClient()
+
+
+def timed(func, repeat: int) -> dict:
+    """Best and median wall time of `repeat` calls of func() -> seconds."""
+    timings = [func() for _ in range(repeat)]
+    return {"best": round(min(timings), 6), "median": round(statistics.median(timings), 6)}
+
+
+def clock(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def bench_size(size: int, args) -> dict:
+    from src.cloud_io import MongoIO
+    from src.scrapper.scrape import ScrapeReviews
+
+    per_product = max(1, size // args.products)
+    options = dict(fetch_mode="http", review_extraction="page_source",
+                   max_reviews=per_product, checkpoint_path="", store_dir="", cache_mode="off",
+                   workers=args.workers)
+    if args.chrome:
+        options.update(review_extraction="script", max_reviews=None)
+    else:
+        options["driver_factory"] = FixtureDriver
+
+    results = {}
+    with FixtureServer(site_pages(SEARCH, args.products, per_product)) as server:
+        scrapper = ScrapeReviews(SEARCH, args.products, base_url=server.url, **options)
+        if not args.chrome:
+            scrapper._driver = FixtureDriver()
+
+        product_urls = scrapper.scrape_product_urls(SEARCH, 1)
+        results["scrape_product_urls"] = timed(
+            lambda: clock(lambda: scrapper.scrape_product_urls(SEARCH, 1)), args.repeat)
+
+        results["extract_reviews"] = timed(
+            lambda: sum(clock(lambda: scrapper.extract_reviews(url)) for url in product_urls),
+            args.repeat)
+
+        def extract_products() -> float:
+            seconds = 0.0
+            for url in product_urls:
+                # Product details (title, price, ...) are state on the scraper
+                details = scrapper.extract_reviews(url)
+                seconds += clock(lambda: scrapper.extract_products(details))
+            return seconds
+
+        results["extract_products"] = timed(extract_products, args.repeat)
+
+        # Untyped review records, as the page parser returns them
+        records = []
+        for url in product_urls:
+            details = scrapper.extract_reviews(url)
+            page_reviews = scrapper._load_page_reviews(scrapper.base_url + details["href"])
+            records.append([{"Product Name": scrapper.product_title,
+                             "Over_All_Rating": scrapper.product_rating_value,
+                             "Price": scrapper.product_price, **review}
+                            for review in page_reviews])
+        results["build_dataframe"] = timed(lambda: clock(lambda: type_reviews(pd.concat(
+            [type_reviews(pd.DataFrame(product, columns=REVIEW_COLUMNS)) for product in records]))),
+            args.repeat)
+        reviews = type_reviews(pd.concat(
+            [pd.DataFrame(product, columns=REVIEW_COLUMNS) for product in records]))
+
+        os.environ["MONGO_DB_URL"] = args.mongo_url
+        if args.mongo_url.startswith("mongomock://"):
+            use_mongomock()
+        mongoio = MongoIO()
+        database = mongoio.mongo_ins.get_database()
+
+        def store_new() -> float:
+            for name in database.list_collection_names():
+                database.drop_collection(name)
+            return clock(lambda: mongoio.store_reviews(product_name=SEARCH, reviews=reviews))
+
+        results["store_reviews_new"] = timed(store_new, args.repeat)
+        results["store_reviews_existing"] = timed(
+            lambda: clock(lambda: mongoio.store_reviews(product_name=SEARCH, reviews=reviews)),
+            args.repeat)
+
+        def get_review_data() -> float:
+            end_to_end = ScrapeReviews(SEARCH, args.products, base_url=server.url, **options)
+            return clock(end_to_end.get_review_data)
+
+        results["get_review_data"] = timed(get_review_data, args.repeat)
+
+    for stage in results.values():
+        stage["reviews"] = len(reviews)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_seconds: float) -> list:
+    """Prints current vs baseline best times; returns the regressed (size, stage) pairs."""
+    regressions = []
+    print(f"\n{'size':>6}  {'stage':<24}{'baseline':>12}{'current':>12}{'ratio':>8}")
+    for size, stages in results.items():
+        for stage, timing in stages.items():
+            before = baseline.get("results", {}).get(size, {}).get(stage)
+            if before is None:
+                continue
+            ratio = timing["best"] / before["best"] if before["best"] else float("inf")
+            regressed = (timing["best"] > before["best"] * (1 + threshold)
+                         and timing["best"] - before["best"] >= min_seconds)
+            if regressed:
+                regressions.append((size, stage))
+            print(f"{size:>6}  {stage:<24}{before['best']:>12.4f}{timing['best']:>12.4f}"
+                  f"{ratio:>7.2f}x{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sizes", nargs="*", type=int, default=[50, 500, 5000],
+                            help="total reviews per fixture site")
+    arg_parser.add_argument("--products", type=int, default=5, help="products per fixture site")
+    arg_parser.add_argument("--workers", type=int, default=1,
+                            help="browser sessions for the end-to-end get_review_data stage")
+    arg_parser.add_argument("--repeat", type=int, default=3)
+    arg_parser.add_argument("--mongo-url", default="mongomock://localhost")
+    arg_parser.add_argument("--chrome", action="store_true",
+                            help="scroll review pages in Chrome instead of FixtureDriver")
+    arg_parser.add_argument("--output", help="write the results to this JSON file")
+    arg_parser.add_argument("--baseline", help="results JSON of an earlier run to compare with")
+    arg_parser.add_argument("--threshold", type=float, default=0.2,
+                            help="allowed slowdown per stage, as a fraction of the baseline")
+    arg_parser.add_argument("--min-seconds", type=float, default=0.005,
+                            help="slowdowns smaller than this are never regressions")
+    args = arg_parser.parse_args(argv)
+
+    results = {}
+    print(f"{'size':>6}  {'stage':<24}{'reviews':>9}{'best':>12}{'median':>12}")
+    for size in args.sizes:
+        results[str(size)] = bench_size(size, args)
+        for stage in STAGES:
+            timing = results[str(size)][stage]
+            print(f"{size:>6}  {stage:<24}{timing['reviews']:>9}{timing['best']:>12.4f}"
+                  f"{timing['median']:>12.4f}")
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "products": args.products,
+        "repeat": args.repeat,
+        "chrome": args.chrome,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.threshold, args.min_seconds)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) slower than the baseline by more than "
+                  f"{args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
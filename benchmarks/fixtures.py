@@ -0,0 +1,139 @@
+"""
+Saved-page fixtures for the benchmarks.
+
+Pages mirror the markup the scraper reads from myntra.com (search results,
+product page and the fully scrolled review page). They are generated from a
+fixed seed, so every run benchmarks exactly the same bytes.
+"""
+import html
+import http.server
+import random
+import threading
+
+NAMES = ["Rishab Jain", "Myntra Customer", "Sandeep Nayak", "Rahul Kumar",
+         "Priya Sharma", "Ananya Gupta", "Vikram Singh", "Neha Verma"]
+PHRASES = ["The fabric quality is good", "colour is same as image",
+           "fits perfectly", "size runs small", "shrinks after wash",
+           "excellent quality must buy product", "best for price range",
+           "stitching came off after a week", "very comfortable for daily wear",
+           "not worth the money"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+          "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+PRODUCT_TITLE = ("Buy Leotude Men Typography Printed Round Neck Oversized T Shirt  - "
+                 "Tshirts for Men 35502430 | Myntra")
+
+
+def search_page(no_of_products: int = 50, page: int = 1) -> str:
+    items = "".join(
+        f'<li class="product-base"><a href="tshirts/leotude/{page}{i:04d}/buy" target="_blank">'
+        f'<h3 class="product-brand">Leotude</h3></a></li>'
+        for i in range(no_of_products)
+    )
+    return (f"<!DOCTYPE html><html><head><title>Tshirts | Myntra</title></head><body>"
+            f'<div class="search-searchProductsContainer"><ul class="results-base">{items}</ul></div>'
+            f"</body></html>")
+
+
+def product_page(product_id: str = "35502430", has_reviews: bool = True,
+                 title: str = PRODUCT_TITLE) -> str:
+    reviews_link = (f'<a class="detailed-reviews-allReviews" href="/reviews/{product_id}">'
+                    f"View all reviews</a>") if has_reviews else ""
+    return (f"<!DOCTYPE html><html><head><title>{html.escape(title)}</title></head><body>"
+            f'<div class="index-overallRating"><div>4.3</div><span class="index-starIcon"></span></div>'
+            f'<p class="pdp-discount-container"><span class="pdp-price"><strong>&#8377;299</strong></span></p>'
+            f"{reviews_link}</body></html>")
+
+
+def review(rng: random.Random) -> str:
+    comment = ", ".join(rng.sample(PHRASES, rng.randint(1, 3)))
+    date = f"{rng.randint(1, 28)} {rng.choice(MONTHS)} 2025"
+    return (
+        '<div class="user-review-userReviewWrapper ">'
+        '<div class="user-review-main user-review-showRating">'
+        '<div class="user-review-starWrapper"><span class="user-review-starRating">'
+        f'{rng.randint(1, 5)}<span class="myntraweb-sprite user-review-starIcon"></span></span></div>'
+        f'<div class="user-review-reviewTextWrapper">{html.escape(comment)}</div></div>'
+        '<div class="user-review-footer"><div class="user-review-left">'
+        f"<span>{html.escape(rng.choice(NAMES))}</span><span>{date}</span></div>"
+        '<div class="user-review-right"><button class="user-review-like">12</button></div></div>'
+        "</div>"
+    )
+
+
+def review_page(no_of_reviews: int, seed: int = 0, title: str = PRODUCT_TITLE) -> str:
+    rng = random.Random(seed)
+    reviews = "".join(review(rng) for _ in range(no_of_reviews))
+    return (f"<!DOCTYPE html><html><head><title>{html.escape(title)}</title></head><body>"
+            f'<div class="detailed-reviews-userReviewsContainer">{reviews}</div>'
+            f"</body></html>")
+
+
+def site_pages(search: str, no_of_products: int, reviews_per_product: int) -> dict:
+    """
+    {path: HTML} of a small Myntra-like site for one search: a results page
+    with `no_of_products` products (and an empty second page, where paging
+    stops), their product pages and their fully scrolled review pages.
+    """
+    search_path = search.replace(" ", "-")
+    pages = {
+        f"/{search_path}?rawQuery={search_path}": search_page(no_of_products, 1),
+        f"/{search_path}?rawQuery={search_path}&p=2": search_page(0, 2),
+    }
+    for i in range(no_of_products):
+        product_id = f"1{i:04d}"
+        title = f"Buy Leotude Men Typography Printed T Shirt {product_id} | Myntra"
+        pages[f"/tshirts/leotude/{product_id}/buy"] = product_page(product_id, title=title)
+        pages[f"/reviews/{product_id}"] = review_page(reviews_per_product, seed=i, title=title)
+    return pages
+
+
+class FixtureServer:
+    """
+    Serves fixture pages from memory on a local HTTP server, so the scraper
+    runs against real sockets without touching myntra.com.
+
+        with FixtureServer(site_pages("men tshirt", 5, 100)) as server:
+            ScrapeReviews("men tshirt", 5, base_url=server.url, ...)
+    """
+
+    def __init__(self, pages: dict):
+        self.pages = {path: page.encode("utf-8") for path, page in pages.items()}
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        pages = self.pages
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; without this each response waits ~40 ms
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                body = pages.get(self.path)
+                self.send_response(200 if body is not None else 404)
+                body = body if body is not None else b"Not found"
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
@@ -3,80 +3,83 @@ import pandas as pd
 import plotly.express as px
 
 from src.cloud_io import MongoIO
+from src.constants import PREVIEW_ROWS, REVIEW_SEARCH_PAGE_SIZE, TOP_TERMS
 from src.constants import SESSION_PRODUCT_KEY  # key used by the scraper page
+from src.analytics import get_analytics
+from src.text_index import top_terms
 
 st.set_page_config("Myntra Analysis")
 st.title("Myntra Review Analysis")
 
+
 # 1) Try to get the most recent scrape from session_state
 product_name = st.session_state.get(SESSION_PRODUCT_KEY, "")
 analysis_data = st.session_state.get("scraped_reviews_df", pd.DataFrame())
+stats = None
+preview = None
+summaries = pd.DataFrame()
+terms = {}
+terms_missing = 0
 
-# 2) If session has no data, try MongoDB (get_reviews returns a DataFrame)
+# 2) If session has no data, summarize the reviews in MongoDB on the server;
+#    only a few raw rows are read, for the preview
 if analysis_data.empty and product_name:
     st.info(f"No recent scraped data in session. Trying MongoDB for '{product_name}'…")
     try:
         mongo_con = MongoIO()
-        db_df = mongo_con.get_reviews(product_name=product_name)  # DataFrame
-        if isinstance(db_df, pd.DataFrame) and not db_df.empty:
-            analysis_data = db_df.copy()
-            st.success(f"Loaded {len(analysis_data)} reviews for '{product_name}' from MongoDB.")
+        # One summary document per product; the reviews are only aggregated
+        # when the summaries do not cover every stored review, e.g. for data
+        # stored before summaries existed
+        summaries = mongo_con.get_product_summaries(product_name=product_name)
+        if not summaries.empty:
+            stats = mongo_con.get_summary_stats(product_name=product_name)
+        if stats is None or stats["total"] != mongo_con.count_reviews(product_name=product_name):
+            if not summaries.empty:
+                st.caption("Product summaries are out of date; the statistics are computed from the "
+                           "reviews. Run `python -m src.cloud_io.rebuild_summaries` to refresh them.")
+                summaries = pd.DataFrame()
+            stats = mongo_con.get_review_stats(product_name=product_name)
+        if stats["total"]:
+            preview = mongo_con.get_reviews(product_name=product_name, limit=PREVIEW_ROWS)
+            # Summed over the term index documents, no comments are read
+            terms = mongo_con.get_top_terms(product_name=product_name)
+            terms_missing = stats["total"] - mongo_con.count_indexed_reviews(product_name=product_name)
+            st.success(f"Loaded {stats['total']} reviews for '{product_name}' from MongoDB.")
         else:
+            stats = None
             st.warning(f"No reviews found for '{product_name}' in MongoDB.")
     except Exception as e:
         st.error(f"Error fetching data from MongoDB: {e}")
-        analysis_data = pd.DataFrame()
+        stats = None
+elif not analysis_data.empty:
+    # Computed once per scraped frame and reused on reruns (see src/analytics.py)
+    analytics = get_analytics(analysis_data)
+    stats = analytics.review_stats
+    preview = analytics.data.head(PREVIEW_ROWS)
+    terms = top_terms(analytics.term_counts, TOP_TERMS)
 
 # 3) Proceed only if we have data
-if not analysis_data.empty:
+if stats is not None:
     st.subheader(f"Analysis for: {product_name or 'Unknown Product'}")
-    st.write(f"Total reviews: **{len(analysis_data)}**")
+    st.write(f"Total reviews: **{stats['total']}**")
 
     # Show a peek of the data
     with st.expander("Preview data", expanded=False):
-        st.dataframe(analysis_data.head())
-
-    # ---------- Clean/prepare columns ----------
-    # Rating: may be like "4.5 out of 5" or "No rating Given"
-    if "Rating" in analysis_data.columns:
-        analysis_data["Rating_Numeric"] = pd.to_numeric(
-            analysis_data["Rating"].astype(str).str.extract(r"([\d.]+)")[0],
-            errors="coerce"
-        )
-    else:
-        analysis_data["Rating_Numeric"] = pd.NA
-
-    # Price: strip ₹ and commas if present
-    if "Price" in analysis_data.columns:
-        analysis_data["Price_Numeric"] = pd.to_numeric(
-            analysis_data["Price"].astype(str).str.replace("₹", "", regex=False).str.replace(",", "", regex=False),
-            errors="coerce"
-        )
+        st.dataframe(preview)
 
     # ---------- Bar: rating distribution ----------
     st.subheader("Rating Distribution (Bar)")
-    valid_ratings = analysis_data["Rating_Numeric"].dropna()
-    if not valid_ratings.empty:
-        rating_counts = valid_ratings.value_counts().sort_index()
-        st.bar_chart(rating_counts)
+    rating_histogram = stats["rating_histogram"]
+    if not rating_histogram.empty:
+        st.bar_chart(rating_histogram.set_index("Rating")["Count"])
     else:
         st.info("No numeric ratings available for bar chart.")
 
     # ---------- PIE 1: Rating buckets ----------
     st.subheader("Ratings Breakdown (Pie)")
-    if not valid_ratings.empty:
-        def bucketize(x: float) -> str:
-            if x >= 4.0:
-                return "Positive (≥4)"
-            elif x >= 3.0:
-                return "Neutral (3–3.9)"
-            else:
-                return "Negative (<3)"
-
-        buckets = valid_ratings.apply(bucketize)
-        pie_df = buckets.value_counts().rename_axis("Bucket").reset_index(name="Count")
+    if not stats["rating_buckets"].empty:
         fig_pie_buckets = px.pie(
-            pie_df,
+            stats["rating_buckets"],
             names="Bucket",
             values="Count",
             title="Ratings Breakdown"
@@ -87,14 +90,8 @@ if not analysis_data.empty:
 
     # ---------- PIE 2: Reviews per product ----------
     st.subheader("Reviews per Product (Pie)")
-    if "Product Name" in analysis_data.columns:
-        product_counts = (
-            analysis_data["Product Name"]
-            .fillna("Unknown Product")
-            .value_counts()
-            .rename_axis("Product Name")
-            .reset_index(name="Reviews")
-        )
+    product_counts = stats["product_counts"]
+    if not product_counts.empty:
         if len(product_counts) > 1:
             fig_pie_products = px.pie(
                 product_counts,
@@ -110,10 +107,42 @@ if not analysis_data.empty:
     else:
         st.info("No 'Product Name' column found for product share pie chart.")
 
+    # ---------- Per-product summaries ----------
+    if not summaries.empty:
+        st.subheader("Product Summaries")
+        columns = {"name": "Product Name", "review_count": "Reviews",
+                   "average_rating": "Average Rating", "price_min": "Min Price",
+                   "price_max": "Max Price", "price_latest": "Latest Price",
+                   "first_review_date": "First Review", "last_review_date": "Last Review"}
+        st.dataframe(summaries.reindex(columns=list(columns)).rename(columns=columns),
+                     hide_index=True)
+
+    # ---------- Top complaints and praise ----------
+    if terms:
+        st.subheader("What Reviewers Mention")
+        if terms_missing > 0:
+            # Reviews stored before the term index existed are added when their
+            # product is stored again, or all at once by the rebuild
+            st.warning(f"{terms_missing} stored reviews are not in the term index yet. Run "
+                       "`python -m src.cloud_io.rebuild_summaries` to add them.")
+        complaints, praise = st.columns(2)
+        for column, bucket, title in ((complaints, "negative", "Top complaints (rating < 3)"),
+                                      (praise, "positive", "Top praise (rating ≥ 4)")):
+            with column:
+                st.markdown(f"**{title}**")
+                if terms[bucket].empty:
+                    st.info("No comments in this rating range.")
+                else:
+                    st.dataframe(terms[bucket].rename(columns={"term": "Term", "reviews": "Reviews",
+                                                               "share": "Share of Reviews"}),
+                                 hide_index=True,
+                                 column_config={"Share of Reviews": st.column_config.ProgressColumn(
+                                     format="%.2f", min_value=0.0, max_value=1.0)})
+
     # ---------- Price information ----------
     st.subheader("Product Price Information")
-    if "Price_Numeric" in analysis_data.columns and analysis_data["Price_Numeric"].notna().any():
-        unique_prices = analysis_data["Price"].dropna().unique().tolist()
+    if stats["prices"]:
+        unique_prices = [f"₹{price:,.0f}" for price in stats["prices"]]
         if len(unique_prices) == 1:
             st.write(f"The product price is: **{unique_prices[0]}**")
         else:
@@ -122,5 +151,45 @@ if not analysis_data.empty:
     else:
         st.info("No usable price data found.")
 
+    # ---------- Review search ----------
+    st.subheader("Search Reviews")
+    search_text = st.text_input("Words or \"phrases\" in the comments (-word to exclude)",
+                                placeholder="e.g. shrink size")
+    filter_products, filter_ratings, filter_dates = st.columns(3)
+    with filter_products:
+        search_products = st.multiselect("Products", stats["product_counts"]["Product Name"].tolist())
+    with filter_ratings:
+        min_rating, max_rating = st.slider("Rating", 1.0, 5.0, (1.0, 5.0), step=0.5)
+    with filter_dates:
+        date_range = st.date_input("Reviewed between", value=())
+    search_page = st.number_input("Page", min_value=1, value=1, step=1)
+
+    if search_text.strip():
+        try:
+            matches = MongoIO().search_reviews(
+                search_text,
+                product_name=product_name or None,
+                products=search_products or None,
+                # The full range also keeps unrated reviews
+                min_rating=min_rating if min_rating > 1.0 else None,
+                max_rating=max_rating if max_rating < 5.0 else None,
+                since=date_range[0] if len(date_range) > 0 else None,
+                # The end date includes the whole day
+                until=pd.Timestamp(date_range[1]) + pd.Timedelta(days=1, microseconds=-1)
+                      if len(date_range) > 1 else None,
+                page=int(search_page) - 1,
+            )
+            if matches["reviews"].empty:
+                st.info("No reviews match the search.")
+            else:
+                first = (int(search_page) - 1) * REVIEW_SEARCH_PAGE_SIZE + 1
+                last = first + len(matches["reviews"]) - 1
+                st.caption(f"Matches {first}–{last}, best first"
+                           + (" (more on the next page)" if matches["has_more"] else ""))
+                st.dataframe(matches["reviews"][["Product Name", "Rating", "Date", "Name", "Comment"]],
+                             hide_index=True)
+        except Exception as e:
+            st.error(f"Error searching the reviews in MongoDB: {e}")
+
 else:
     st.warning("No data available for analysis. Please run the scraper first from the main page.")
@@ -6,5 +6,8 @@ setup(
     author='saikb',
     author_email='saibharadwajkinthali060305@gmail.com',
     packages=find_packages(),
-    install_requires=[]
+    install_requires=[],
+    entry_points={
+        "console_scripts": ["myntra-crawl=src.crawl:main"],
+    },
 )
\ No newline at end of file
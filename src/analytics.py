@@ -0,0 +1,173 @@
+"""
+Review statistics for the dashboards, computed column-wise.
+
+Per-product statistics come from a single pass over the product category
+codes (NumPy bincount) instead of filtering the frame once per product,
+and ratings are binned with pd.cut. `get_analytics` keeps the results of
+recently used frames, so Streamlit reruns on the same data reuse them.
+
+    analytics = get_analytics(reviews)
+    analytics.product_stats        # one row per product
+    analytics.top_reviews("positive")[product_name]
+"""
+import threading
+import weakref
+from collections import OrderedDict
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from src.constants import (ANALYTICS_CACHE_SIZE, DASHBOARD_TOP_REVIEWS, NEGATIVE_REVIEW_MAX_RATING,
+                           POSITIVE_REVIEW_MIN_RATING, RATING_BUCKET_BOUNDS, RATING_BUCKET_LABELS)
+from src.schema import type_reviews
+from src.text_index import term_counts
+
+# Columns of the per-star review counts in ReviewAnalytics.product_stats
+STAR_COLUMNS = {1: "1 star", 2: "2 stars", 3: "3 stars", 4: "4 stars", 5: "5 stars"}
+
+
+class ReviewAnalytics:
+    """Statistics of one review frame, each computed on first use."""
+
+    def __init__(self, data: pd.DataFrame):
+        # Typed once (numeric ratings and price, categorical product names)
+        self.data = type_reviews(data)
+        names = self.data["Product Name"]
+        self.products = names.cat.categories
+        # Category code per row, -1 for reviews without a product name
+        self._codes = names.cat.codes.to_numpy()
+        self._top_reviews = {}
+
+    def _count(self, mask: np.ndarray, slot: np.ndarray = None, slots: int = 1) -> np.ndarray:
+        """Rows per product (and per `slot` in 0..slots-1) where `mask` holds."""
+        mask = mask & (self._codes >= 0)
+        index = self._codes[mask].astype(np.int64) * slots
+        if slot is not None:
+            index += slot[mask]
+        counts = np.bincount(index, minlength=len(self.products) * slots)
+        return counts.reshape(len(self.products), slots) if slots > 1 else counts
+
+    def _mean(self, column: str) -> np.ndarray:
+        values = self.data[column].to_numpy(dtype=np.float64)
+        known = ~np.isnan(values) & (self._codes >= 0)
+        sums = np.bincount(self._codes[known], weights=values[known], minlength=len(self.products))
+        counts = np.bincount(self._codes[known], minlength=len(self.products))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, sums / counts, np.nan)
+
+    @cached_property
+    def rating_buckets(self) -> pd.Series:
+        """RATING_BUCKET_LABELS category of every review rating (NaN when unrated)."""
+        return pd.cut(self.data["Rating"], RATING_BUCKET_BOUNDS, right=False,
+                      labels=RATING_BUCKET_LABELS)
+
+    @cached_property
+    def product_stats(self) -> pd.DataFrame:
+        """
+        One row per product (indexed by name, in category order): number of
+        reviews, average price, overall rating and review rating, reviews
+        per star ("1 star" … "5 stars", ratings rounded) and per rating
+        bucket.
+        """
+        every_row = np.ones(len(self._codes), dtype=bool)
+        ratings = self.data["Rating"].to_numpy(dtype=np.float64)
+        rated = ~np.isnan(ratings)
+        stars = np.clip(np.rint(np.nan_to_num(ratings, nan=1)), 1, 5).astype(np.int64) - 1
+        buckets = self.rating_buckets.cat.codes.to_numpy().astype(np.int64)
+
+        stats = pd.DataFrame({
+            "reviews": self._count(every_row),
+            "average_price": self._mean("Price"),
+            "average_over_all_rating": self._mean("Over_All_Rating"),
+            "average_rating": self._mean("Rating"),
+        }, index=pd.Index(self.products, name="Product Name"))
+        star_counts = self._count(rated, stars, len(STAR_COLUMNS))
+        for star, column in STAR_COLUMNS.items():
+            stats[column] = star_counts[:, star - 1]
+        bucket_counts = self._count(buckets >= 0, np.maximum(buckets, 0), len(RATING_BUCKET_LABELS))
+        for i, label in enumerate(RATING_BUCKET_LABELS):
+            stats[label] = bucket_counts[:, i]
+        # Categories without reviews, e.g. left over from a filtered frame
+        return stats[stats["reviews"] > 0]
+
+    def star_counts(self, product_name: str) -> pd.Series:
+        """Reviews per star of one product, most stars first, stars without reviews left out."""
+        row = self.product_stats.loc[product_name]
+        counts = pd.Series({star: int(row[column]) for star, column
+                            in reversed(STAR_COLUMNS.items())})
+        return counts[counts > 0]
+
+    def top_reviews(self, kind: str, limit: int = DASHBOARD_TOP_REVIEWS) -> dict:
+        """
+        {product name: reviews} of the best rated ("positive", rating >=
+        POSITIVE_REVIEW_MIN_RATING) or worst rated ("negative", <=
+        NEGATIVE_REVIEW_MAX_RATING) `limit` reviews of every product, in
+        the order of nlargest/nsmallest.
+        """
+        key = (kind, limit)
+        if key not in self._top_reviews:
+            ratings = self.data["Rating"]
+            if kind == "positive":
+                selected = self.data[ratings >= POSITIVE_REVIEW_MIN_RATING]
+            elif kind == "negative":
+                selected = self.data[ratings <= NEGATIVE_REVIEW_MAX_RATING]
+            else:
+                raise ValueError(f"Unknown kind of reviews: {kind}")
+            # A stable sort keeps ties in row order, like nlargest(keep="first")
+            top = (selected.sort_values("Rating", ascending=kind == "negative", kind="stable")
+                           .groupby("Product Name", observed=True, sort=False)
+                           .head(limit))
+            self._top_reviews[key] = {name: rows for name, rows
+                                      in top.groupby("Product Name", observed=True, sort=False)}
+        return self._top_reviews[key]
+
+    @cached_property
+    def term_counts(self) -> pd.DataFrame:
+        """Sparse term counts per product and rating bucket (src/text_index.py)."""
+        return term_counts(self.data)
+
+    @cached_property
+    def review_stats(self) -> dict:
+        """The summaries of MongoIO.get_review_stats, computed from the frame."""
+        data = self.data
+        ratings = data["Rating"].dropna()
+        bucket_counts = self.rating_buckets.value_counts(sort=False)
+        return {
+            "total": len(data),
+            "rating_histogram": ratings.value_counts().sort_index()
+                                       .rename_axis("Rating").reset_index(name="Count"),
+            "rating_buckets": bucket_counts[bucket_counts > 0]
+                                           .rename_axis("Bucket").reset_index(name="Count"),
+            "product_counts": data["Product Name"].astype(object).fillna("Unknown Product")
+                                                  .value_counts()
+                                                  .rename_axis("Product Name").reset_index(name="Reviews"),
+            "prices": sorted(data["Price"].dropna().unique().tolist()),
+        }
+
+
+# Recently used frames: id -> (weak reference to the frame, its analytics)
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_analytics(data: pd.DataFrame) -> ReviewAnalytics:
+    """
+    The ReviewAnalytics of a frame, reused while the same frame object is
+    alive (e.g. kept in the Streamlit session). Frames are treated as
+    immutable: change one in place and its cached statistics go stale.
+    """
+    key = id(data)
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0]() is data:
+            _cache.move_to_end(key)
+            return entry[1]
+
+    analytics = ReviewAnalytics(data)
+    with _cache_lock:
+        _cache[key] = (weakref.ref(data), analytics)
+        _cache.move_to_end(key)
+        while len(_cache) > ANALYTICS_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return analytics
@@ -1,17 +1,89 @@
 import pandas as pd
+import pymongo
+from datetime import datetime
+from pymongo import UpdateOne
 from src.database_connect import mongo_operation as mongo # Correct import
 import os, sys
 from src.constants import *
 from src.exceptions import CustomException
+from src.fingerprint import review_fingerprints
+from src.metrics import get_metrics
+from src.schema import REVIEW_COLUMNS, empty_reviews, parse_review_date, product_id, type_reviews
+from src.text_index import UNRATED, term_updates
 from dotenv import load_dotenv
 load_dotenv()
 
 
+# Normalized document fields -> column names of the scraped review DataFrames
+PRODUCT_FIELDS = {"name": "Product Name", "over_all_rating": "Over_All_Rating", "price": "Price"}
+REVIEW_FIELDS = {"date": "Date", "rating": "Rating", "name": "Name", "comment": "Comment"}
+
+
+def search_key(product_name: str) -> str:
+    """Searches are stored lower-cased with single spaces, e.g. "men  Tshirt" -> "men tshirt"."""
+    return " ".join(str(product_name).lower().split())
+
+
+def bson_values(column: pd.Series) -> pd.Series:
+    """Column of a typed frame as BSON-encodable Python values, with None for nulls."""
+    if pd.api.types.is_float_dtype(column):
+        column = column.astype("float64")
+    return column.astype(object).where(column.notna(), None)
+
+
+def summary_updates(reviews: pd.DataFrame, new: pd.Series, queries: list,
+                    scope: str = None) -> list:
+    """
+    Upserts that fold a typed review frame into the product summaries.
+
+    Every product in `reviews` gets its name, latest price and searches set;
+    counts, rating sums, per-star counts and the review date range only grow
+    by the rows flagged in `new` (the reviews that were actually inserted),
+    so storing the same reviews twice does not count them twice. `scope` is
+    the collection of the per-query layout, where the same product is
+    stored, and summarized, once per search.
+    """
+    data = reviews.assign(product_id=[product_id(title) for title in reviews["Product Name"]],
+                          new=list(new))
+    updated_at = datetime.utcnow()
+    updates = []
+
+    for pid, group in data.groupby("product_id", sort=False):
+        added = group[group["new"]]
+        ratings = added["Rating"].dropna()
+        prices = group["Price"].dropna()
+        dates = added["Date"].dropna()
+        latest = group.iloc[-1]
+
+        update = {
+            "$set": {"product_id": pid, "scope": scope, "name": str(latest["Product Name"]),
+                     "over_all_rating": None if pd.isna(latest["Over_All_Rating"])
+                                        else float(latest["Over_All_Rating"]),
+                     "updated_at": updated_at},
+            "$addToSet": {"queries": {"$each": list(queries)}},
+            "$inc": {"review_count": len(added),
+                     "rating_count": len(ratings),
+                     "rating_sum": float(ratings.sum()),
+                     **{f"stars.{star}": int(count)
+                        for star, count in ratings.round().astype(int).value_counts().items()}},
+        }
+        if not prices.empty:
+            update["$set"]["price_latest"] = float(prices.iloc[-1])
+            update["$min"] = {"price_min": float(prices.min())}
+            update["$max"] = {"price_max": float(prices.max())}
+        if not dates.empty:
+            update.setdefault("$min", {})["first_review_date"] = dates.min().to_pydatetime()
+            update.setdefault("$max", {})["last_review_date"] = dates.max().to_pydatetime()
+
+        summary_id = pid if scope is None else f"{scope}/{pid}"
+        updates.append(UpdateOne({"_id": summary_id}, update, upsert=True))
+    return updates
+
 
 class MongoIO:
     mongo_ins = None
 
-    def __init__(self):
+    def __init__(self, storage_mode: str = MONGO_STORAGE_MODE):
         if MongoIO.mongo_ins is None:
             mongo_db_url = os.getenv("MONGO_DB_URL")
             if mongo_db_url is None:
@@ -19,30 +91,712 @@ class MongoIO:
             MongoIO.mongo_ins = mongo(client_url=mongo_db_url,
                                       database_name=MONGO_DATABASE_NAME)
         self.mongo_ins = MongoIO.mongo_ins
+        if storage_mode not in ("normalized", "per_query"):
+            raise ValueError(f"Unknown storage mode: {storage_mode}")
+        self.storage_mode = storage_mode
+
+    @property
+    def normalized(self) -> bool:
+        return self.storage_mode == "normalized"
+
+    def ensure_indexes(self):
+        """
+        Indexes of the normalized layout: reviews by id, by product and date
+        or rating, and by the words of their comments.
+        """
+        self.mongo_ins.ensure_unique_index(REVIEWS_COLLECTION, REVIEW_ID_FIELD)
+        self.mongo_ins.ensure_index(
+            REVIEWS_COLLECTION,
+            [("product_id", pymongo.ASCENDING), ("date", pymongo.DESCENDING)],
+            name="product_id_date",
+        )
+        # Covers the rating aggregations of get_review_stats
+        self.mongo_ins.ensure_index(
+            REVIEWS_COLLECTION,
+            [("product_id", pymongo.ASCENDING), ("rating", pymongo.ASCENDING)],
+            name="product_id_rating",
+        )
+        self.mongo_ins.ensure_index(PRODUCTS_COLLECTION, [("queries", pymongo.ASCENDING)],
+                                    name="queries")
+        # Full-text search of the comments (search_reviews)
+        self.mongo_ins.ensure_index(REVIEWS_COLLECTION, [("comment", pymongo.TEXT)],
+                                    name="review_text", default_language=REVIEW_TEXT_LANGUAGE)
 
     def store_reviews(self, product_name: str, reviews: pd.DataFrame): # Explicitly type-hint reviews as DataFrame
         try:
             if reviews.empty:
                raise ValueError("No reviews to store.")
 
-            collection_name = product_name.replace(" ", "_")
-            # --- PREVIOUSLY: review_docs = reviews.to_dict(orient="records") ---
-            # --- CORRECTED LINE: Pass the DataFrame directly as the 'dataframe' argument ---
-            self.mongo_ins.bulk_insert(collection_name=collection_name, dataframe=reviews)
-            print("Stored Data into mongodb") # Debug statement
+            metrics = get_metrics()
+            with metrics.timer("mongo_store_seconds", storage_mode=self.storage_mode):
+                # Stored with the typed schema: numbers, dates and nulls instead of strings
+                reviews = type_reviews(reviews).reset_index(drop=True)
+                review_ids = review_fingerprints(reviews)
+                # Upserts keyed on the review fingerprint make re-scrapes idempotent
+                if self.normalized:
+                    report = self._store_normalized(product_name, reviews, review_ids)
+                else:
+                    documents = reviews.apply(bson_values)
+                    documents[REVIEW_ID_FIELD] = review_ids
+                    report = self.mongo_ins.bulk_upsert(
+                        collection_name=product_name.replace(" ", "_"),
+                        dataframe=documents,
+                        key_field=REVIEW_ID_FIELD,
+                    )
+
+                # Only reviews this call inserted are added to the product summaries
+                new = review_ids.isin(set(report["inserted_keys"])) & ~review_ids.duplicated()
+                scope = None if self.normalized else product_name.replace(" ", "_")
+                queries = [search_key(product_name)]
+                product_ids = pd.Series([product_id(title) for title in reviews["Product Name"]],
+                                        index=reviews.index)
+                prefix = "" if scope is None else f"{scope}/"
+                seeded = self._seed_missing(
+                    PRODUCT_SUMMARIES_COLLECTION, self._update_summaries,
+                    {pid: [f"{prefix}{pid}"] for pid in product_ids.unique()},
+                    reviews, new, queries, scope)
+                rows = ~product_ids.isin(seeded)
+                self._update_summaries(reviews[rows], new[rows], queries, scope=scope)
+                seeded = self._seed_missing(
+                    REVIEW_TERMS_COLLECTION, self._update_terms,
+                    {pid: [f"{prefix}{pid}/{bucket}" for bucket in [*RATING_BUCKET_KEYS, UNRATED]]
+                     for pid in product_ids.unique()},
+                    reviews, new, queries, scope)
+                rows = ~product_ids.isin(seeded)
+                self._update_terms(reviews[rows], new[rows], queries, scope=scope)
+            metrics.inc("mongo_reviews_inserted_total", report["inserted"])
+            metrics.log("store_reviews", search=product_name,
+                        **{key: report[key] for key in ("inserted", "matched", "duplicates",
+                                                        "batches", "batch_latencies_ms")})
+            return report
 
         except Exception as e:
            raise CustomException(e, sys)
 
+    def _store_normalized(self, product_name: str, reviews: pd.DataFrame,
+                          review_ids: pd.Series) -> dict:
+        """
+        Upserts one document per product (tagged with the search that found
+        it) and one compact document per review of a typed frame that refers
+        to its product by id instead of repeating the product fields.
+        """
+        self.ensure_indexes()
+        query = search_key(product_name)
+        updated_at = datetime.utcnow()
+
+        products = reviews.drop_duplicates(subset=["Product Name"], keep="last")
+        with get_metrics().timer("mongo_batch_seconds", collection=PRODUCTS_COLLECTION):
+            self.mongo_ins.get_collection(PRODUCTS_COLLECTION).bulk_write([
+                UpdateOne(
+                    {"_id": product_id(name)},
+                    {"$set": {"name": name, "over_all_rating": rating, "price": price,
+                              "updated_at": updated_at},
+                     "$addToSet": {"queries": query}},
+                    upsert=True,
+                )
+                for name, rating, price in zip(bson_values(products["Product Name"]),
+                                               bson_values(products["Over_All_Rating"]),
+                                               bson_values(products["Price"]))
+            ], ordered=False)
+        get_metrics().inc("mongo_batch_documents_total", len(products),
+                          collection=PRODUCTS_COLLECTION)
+
+        documents = pd.DataFrame({
+            REVIEW_ID_FIELD: review_ids,
+            "product_id": [product_id(title) for title in reviews["Product Name"]],
+            **{field: bson_values(reviews[column]) for field, column in REVIEW_FIELDS.items()},
+        })
+        return self.mongo_ins.bulk_upsert(collection_name=REVIEWS_COLLECTION,
+                                          dataframe=documents,
+                                          key_field=REVIEW_ID_FIELD)
+
+    def _update_summaries(self, reviews: pd.DataFrame, new: pd.Series, queries: list,
+                          scope: str = None) -> int:
+        updates = summary_updates(reviews, new, queries, scope)
+        if updates:
+            self.mongo_ins.ensure_index(PRODUCT_SUMMARIES_COLLECTION,
+                                        [("queries", pymongo.ASCENDING)], name="queries")
+            with get_metrics().timer("mongo_batch_seconds", collection=PRODUCT_SUMMARIES_COLLECTION):
+                self.mongo_ins.get_collection(PRODUCT_SUMMARIES_COLLECTION).bulk_write(
+                    updates, ordered=False)
+            get_metrics().inc("mongo_batch_documents_total", len(updates),
+                              collection=PRODUCT_SUMMARIES_COLLECTION)
+        return len(updates)
+
+    def _update_terms(self, reviews: pd.DataFrame, new: pd.Series, queries: list,
+                      scope: str = None) -> int:
+        """Adds the comments of the new reviews to the term index (src/text_index.py)."""
+        updates = term_updates(reviews, new, queries, scope)
+        if updates:
+            self.mongo_ins.ensure_index(REVIEW_TERMS_COLLECTION,
+                                        [("queries", pymongo.ASCENDING)], name="queries")
+            with get_metrics().timer("mongo_batch_seconds", collection=REVIEW_TERMS_COLLECTION):
+                self.mongo_ins.get_collection(REVIEW_TERMS_COLLECTION).bulk_write(
+                    updates, ordered=False)
+            get_metrics().inc("mongo_batch_documents_total", len(updates),
+                              collection=REVIEW_TERMS_COLLECTION)
+        return len(updates)
+
+    def _stored_product_reviews(self, name: str, scope: str = None) -> tuple:
+        """(typed stored reviews, searches that found it) of one product."""
+        if scope is None:
+            product = self.mongo_ins.get_collection(PRODUCTS_COLLECTION).find_one(
+                {"_id": product_id(name)}) or {}
+            reviews = self.mongo_ins.find(
+                collection_name=REVIEWS_COLLECTION,
+                query={"product_id": product_id(name)},
+                projection={"_id": 0, **{field: 1 for field in REVIEW_FIELDS}},
+            )
+            reviews = reviews.rename(columns=REVIEW_FIELDS).assign(
+                **{column: product.get(field, name if field == "name" else None)
+                   for field, column in PRODUCT_FIELDS.items()})
+            return type_reviews(reviews), product.get("queries") or []
+        reviews = self.mongo_ins.find(
+            collection_name=scope,
+            query={"Product Name": name},
+            projection={"_id": 0, **{column: 1 for column in REVIEW_COLUMNS}},
+        )
+        return type_reviews(reviews), [search_key(scope.replace("_", " "))]
+
+    def _stored_review_counts(self, names: dict, scope: str = None) -> dict:
+        """{product id: number of stored reviews} of the products in `names` ({product id: name})."""
+        if scope is None:
+            rows = self.mongo_ins.aggregate(REVIEWS_COLLECTION, [
+                {"$match": {"product_id": {"$in": list(names)}}},
+                {"$group": {"_id": "$product_id", "count": {"$sum": 1}}},
+            ])
+            return {row["_id"]: row["count"] for row in rows}
+        rows = self.mongo_ins.aggregate(scope, [
+            {"$match": {"Product Name": {"$in": list(names.values())}}},
+            {"$group": {"_id": "$Product Name", "count": {"$sum": 1}}},
+        ])
+        return {product_id(row["_id"]): row["count"] for row in rows}
+
+    def _seed_missing(self, collection_name: str, update, document_ids: dict,
+                      reviews: pd.DataFrame, new: pd.Series, queries: list,
+                      scope: str = None) -> set:
+        """
+        Builds the documents of `collection_name` (summaries or term counts)
+        of products that had reviews stored before their documents existed,
+        e.g. written by an older version or after the documents were
+        dropped, from all their stored reviews instead of only the new ones.
+
+        `document_ids` are the documents of every product in `reviews`
+        ({product id: [document ids]}); a product is seeded when none of
+        them exists and more of its reviews are stored than this call
+        inserted. `update` is _update_summaries or _update_terms. Returns
+        the seeded product ids, which the incremental update leaves out.
+        """
+        present = {document["_id"] for document in self.mongo_ins.get_collection(collection_name).find(
+            {"_id": {"$in": [i for ids in document_ids.values() for i in ids]}}, {"_id": 1})}
+        missing = [pid for pid, ids in document_ids.items() if present.isdisjoint(ids)]
+        if not missing:
+            return set()
+
+        frame = reviews.assign(product_id=[product_id(title) for title in reviews["Product Name"]],
+                               new=list(new))
+        frame = frame[frame["product_id"].isin(missing)]
+        names = {pid: str(rows["Product Name"].iloc[-1])
+                 for pid, rows in frame.groupby("product_id", sort=False)}
+        inserted = frame.groupby("product_id", sort=False)["new"].sum()
+        stored = self._stored_review_counts(names, scope)
+
+        seeded = set()
+        for pid, name in names.items():
+            if stored.get(pid, 0) <= inserted.get(pid, 0):
+                # Only this call's reviews are stored: the incremental update is exact
+                continue
+            stored_reviews, searches = self._stored_product_reviews(name, scope)
+            # The stored reviews already include this call's; its rows only set
+            # the latest name and price
+            current = frame[frame["product_id"] == pid][REVIEW_COLUMNS]
+            update(type_reviews(pd.concat([stored_reviews, current], ignore_index=True)),
+                   [True] * len(stored_reviews) + [False] * len(current),
+                   sorted(set(queries) | set(searches)), scope=scope)
+            seeded.add(pid)
+        return seeded
+
+    def _stored_review_batches(self):
+        """
+        Yields (typed reviews, new flags, queries, scope) for every stored
+        product (normalized layout) or search collection (per-query layout),
+        as the summary and term index rebuilds fold them in.
+        """
+        if self.normalized:
+            products = self.mongo_ins.find(
+                collection_name=PRODUCTS_COLLECTION,
+                projection={"_id": 0, "queries": 1, **{field: 1 for field in PRODUCT_FIELDS}},
+            )
+            for product in products.to_dict("records"):
+                reviews = self.mongo_ins.find(
+                    collection_name=REVIEWS_COLLECTION,
+                    query={"product_id": product_id(product["name"])},
+                    projection={"_id": 0, **{field: 1 for field in REVIEW_FIELDS}},
+                )
+                reviews = reviews.rename(columns=REVIEW_FIELDS).assign(
+                    **{column: product.get(field) for field, column in PRODUCT_FIELDS.items()})
+                if reviews.empty:
+                    # Keep the product listed, without reviews
+                    reviews = pd.DataFrame([{column: product.get(field)
+                                             for field, column in PRODUCT_FIELDS.items()}])
+                    new = [False]
+                else:
+                    new = [True] * len(reviews)
+                yield type_reviews(reviews), new, product.get("queries") or [], None
+            return
+
+        for collection_name in self.legacy_collections():
+            reviews = self.mongo_ins.find(
+                collection_name=collection_name,
+                projection={"_id": 0, **{column: 1 for column in REVIEW_COLUMNS}},
+            )
+            if reviews.empty:
+                continue
+            yield (type_reviews(reviews), [True] * len(reviews),
+                   [search_key(collection_name.replace("_", " "))], collection_name)
+
+    def rebuild_product_summaries(self) -> int:
+        """
+        Recomputes every product summary from the stored reviews, e.g. for
+        data written before summaries existed. Returns the number of
+        summaries written.
+        """
+        try:
+            self.mongo_ins.get_collection(PRODUCT_SUMMARIES_COLLECTION).delete_many(self._summary_scope())
+            return sum(self._update_summaries(reviews, new, queries, scope=scope)
+                       for reviews, new, queries, scope in self._stored_review_batches())
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def rebuild_review_terms(self) -> int:
+        """
+        Recomputes the term index from the stored review comments, e.g. for
+        data written before the index existed. Returns the number of term
+        documents written (one per product and rating bucket).
+        """
+        try:
+            self.mongo_ins.get_collection(REVIEW_TERMS_COLLECTION).delete_many(self._summary_scope())
+            return sum(self._update_terms(reviews, new, queries, scope=scope)
+                       for reviews, new, queries, scope in self._stored_review_batches())
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def legacy_collections(self) -> list:
+        """Collections of the per-query layout, i.e. every collection of flat review rows."""
+        database = self.mongo_ins.get_database()
+        return [
+            name for name in database.list_collection_names()
+            if name not in (PRODUCTS_COLLECTION, REVIEWS_COLLECTION, PRODUCT_SUMMARIES_COLLECTION,
+                            REVIEW_TERMS_COLLECTION)
+            and not name.startswith("system.")
+            and database[name].find_one({"Product Name": {"$exists": True}}) is not None
+        ]
+
+    def _summary_scope(self, product_name: str = None) -> dict:
+        """Filter for the summaries of this storage mode, optionally of one search."""
+        if self.normalized:
+            query = {"scope": None}
+            if product_name is not None:
+                query["queries"] = search_key(product_name)
+            return query
+        if product_name is None:
+            return {"scope": {"$ne": None}}
+        return {"scope": product_name.replace(" ", "_")}
+
+    def get_product_summaries(self, product_name: str = None) -> pd.DataFrame:
+        """
+        Summary documents of the products found by a search (all products
+        when `product_name` is None), with the mean rating filled in.
+        """
+        try:
+            query = self._summary_scope(product_name)
+            summaries = self.mongo_ins.find(collection_name=PRODUCT_SUMMARIES_COLLECTION,
+                                            query=query)
+            if not summaries.empty:
+                summaries["average_rating"] = (summaries["rating_sum"]
+                                               / summaries["rating_count"].where(summaries["rating_count"] > 0))
+            return summaries
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_summary_stats(self, product_name: str) -> dict:
+        """
+        The summaries of get_review_stats, read from the product summary
+        documents (one per product) instead of the reviews. Per-star counts
+        are integer ratings, as myntra.com shows them.
+        """
+        try:
+            summaries = self.get_product_summaries(product_name)
+            if summaries.empty:
+                return self._review_stats({}, [])
+
+            stars = pd.Series(dtype=int)
+            if "stars" in summaries:
+                stars = pd.DataFrame(list(summaries["stars"].dropna())).sum()
+            histogram = [{"_id": float(star), "count": int(count)}
+                         for star, count in sorted(stars.items(), key=lambda item: int(item[0])) if count]
+            bounds = pd.cut([row["_id"] for row in histogram], RATING_BUCKET_BOUNDS,
+                            right=False, labels=RATING_BUCKET_BOUNDS[:-1])
+            buckets = {}
+            for bound, row in zip(bounds, histogram):
+                buckets[bound] = buckets.get(bound, 0) + row["count"]
+
+            products = summaries.sort_values("review_count", ascending=False)
+            facets = {
+                "total": [{"count": int(summaries["review_count"].sum())}],
+                "histogram": histogram,
+                "buckets": [{"_id": bound, "count": count} for bound, count in buckets.items()],
+                "products": [{"_id": name, "count": int(count)}
+                             for name, count in zip(products["name"], products["review_count"])],
+            }
+            prices = summaries["price_latest"].dropna().unique().tolist() if "price_latest" in summaries else []
+            return self._review_stats(facets, prices)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_top_terms(self, product_name: str = None, limit: int = TOP_TERMS,
+                      buckets: list = None) -> dict:
+        """
+        Most mentioned terms and bigrams in the comments of each rating
+        bucket (complaints in "negative", praise in "positive") of the
+        products found by a search, or of all products, summed over the
+        term index documents on the server. Returns {bucket: DataFrame of
+        term, reviews mentioning it and share of the bucket's reviews}.
+        """
+        try:
+            buckets = buckets or RATING_BUCKET_KEYS
+            pipeline = [
+                {"$match": self._summary_scope(product_name)},
+                {"$facet": {
+                    "totals": [{"$group": {"_id": "$bucket", "reviews": {"$sum": "$reviews"}}}],
+                    **{bucket: [
+                        {"$match": {"bucket": bucket}},
+                        {"$project": {"terms": {"$objectToArray": "$terms"}}},
+                        {"$unwind": "$terms"},
+                        {"$group": {"_id": "$terms.k", "count": {"$sum": "$terms.v"}}},
+                        {"$sort": {"count": -1, "_id": 1}},
+                        {"$limit": limit},
+                    ] for bucket in buckets},
+                }},
+            ]
+            facets = self.mongo_ins.aggregate(REVIEW_TERMS_COLLECTION, pipeline)[0]
+            totals = {row["_id"]: row["reviews"] for row in facets["totals"]}
+            result = {}
+            for bucket in buckets:
+                rows = facets[bucket]
+                total = totals.get(bucket, 0)
+                result[bucket] = pd.DataFrame({
+                    "term": [row["_id"] for row in rows],
+                    "reviews": [int(row["count"]) for row in rows],
+                    "share": [row["count"] / total if total else 0.0 for row in rows],
+                })
+            return result
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def count_indexed_reviews(self, product_name: str = None) -> int:
+        """Number of reviews of a search (or of all searches) whose comments are in the term index."""
+        try:
+            rows = self.mongo_ins.aggregate(REVIEW_TERMS_COLLECTION, [
+                {"$match": self._summary_scope(product_name)},
+                {"$group": {"_id": None, "reviews": {"$sum": "$reviews"}}},
+            ])
+            return int(rows[0]["reviews"]) if rows else 0
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_searches(self) -> list:
+        """Product searches that have reviews stored, read from the product summaries."""
+        try:
+            summaries = self.mongo_ins.get_collection(PRODUCT_SUMMARIES_COLLECTION)
+            if self.normalized:
+                return sorted(summaries.distinct("queries", self._summary_scope()))
+            return sorted(scope.replace("_", " ")
+                          for scope in summaries.distinct("scope", self._summary_scope()))
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _find_products(self, product_name: str) -> pd.DataFrame:
+        products = self.mongo_ins.find(
+            collection_name=PRODUCTS_COLLECTION,
+            query={"queries": search_key(product_name)},
+            projection={"_id": 0, **{field: 1 for field in PRODUCT_FIELDS}},
+        )
+        if not products.empty:
+            products["product_id"] = [product_id(name) for name in products["name"]]
+        return products
 
     def get_reviews(self,
-                    product_name: str):
+                    product_name: str,
+                    limit: int = 0):
+        """
+        Stored reviews of a search as a typed frame. With a `limit`, only
+        that many of the newest reviews are read (e.g. for a preview).
+        """
         try:
-            data = self.mongo_ins.find(
-                collection_name=product_name.replace(" ", "_")
+            if not self.normalized:
+                data = self.mongo_ins.find(
+                    collection_name=product_name.replace(" ", "_"),
+                    projection={"_id": 0, **{column: 1 for column in REVIEW_COLUMNS}},
+                    sort=[("Date", pymongo.DESCENDING)] if limit else None,
+                    limit=limit,
+                )
+                # Rows stored before the typed schema are parsed here, once
+                return empty_reviews() if data.empty else type_reviews(data)
+
+            products = self._find_products(product_name)
+            if products.empty:
+                return empty_reviews()
+            reviews = self.mongo_ins.find(
+                collection_name=REVIEWS_COLLECTION,
+                query={"product_id": {"$in": list(products["product_id"])}},
+                projection={"_id": 0, "product_id": 1, **{field: 1 for field in REVIEW_FIELDS}},
+                sort=[("date", pymongo.DESCENDING)] if limit else None,
+                limit=limit,
             )
+            if reviews.empty:
+                return empty_reviews()
+            return self._join_products(reviews, products)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def _join_products(reviews: pd.DataFrame, products: pd.DataFrame) -> pd.DataFrame:
+        """Review documents with the product fields joined back on, in the layout the scraper produces."""
+        reviews = reviews.reindex(columns=["product_id", *REVIEW_FIELDS]).rename(columns=REVIEW_FIELDS)
+        products = products.rename(columns=PRODUCT_FIELDS)
+        data = reviews.merge(products, on="product_id", how="left")
+        return type_reviews(data)
+
+    def search_reviews(self, text: str, product_name: str = None, products: list = None,
+                       min_rating: float = None, max_rating: float = None,
+                       since=None, until=None, page: int = 0,
+                       page_size: int = REVIEW_SEARCH_PAGE_SIZE) -> dict:
+        """
+        Reviews whose comment matches `text`, best matches first, from a
+        MongoDB text index on the comments. Words are stemmed ("shrink"
+        also finds "shrinks"), "quoted phrases" must appear as written and
+        -word leaves out comments with that word.
+
+        Optional filters: the search that found the products
+        (`product_name`, required in the per-query layout), product names,
+        a rating range and a review date range, all inclusive. Returns
+        {"reviews": typed frame with a Score column, "page", "page_size",
+        "has_more": whether a next page exists}.
+        """
+        try:
+            if not str(text).strip():
+                raise ValueError("No search text.")
+            result = {"reviews": empty_reviews().assign(Score=pd.Series(dtype="float64")),
+                      "page": page, "page_size": page_size, "has_more": False}
+
+            if self.normalized:
+                collection_name = REVIEWS_COLLECTION
+                fields = {column: field for field, column in REVIEW_FIELDS.items()}
+                projection = {"_id": 0, "product_id": 1, **{field: 1 for field in REVIEW_FIELDS}}
+                query = {}
+                product_ids = None
+                if product_name:
+                    found = self._find_products(product_name)
+                    product_ids = set(found["product_id"]) if not found.empty else set()
+                if products:
+                    named = {product_id(name) for name in products}
+                    product_ids = named if product_ids is None else product_ids & named
+                if product_ids is not None:
+                    if not product_ids:
+                        return result
+                    query["product_id"] = {"$in": sorted(product_ids)}
+            else:
+                if not product_name:
+                    raise ValueError("The per-query layout can only be searched within a search.")
+                collection_name = product_name.replace(" ", "_")
+                fields = {column: column for column in REVIEW_COLUMNS}
+                projection = {"_id": 0, **{column: 1 for column in REVIEW_COLUMNS}}
+                query = {"Product Name": {"$in": list(products)}} if products else {}
+
+            ratings = {key: float(value) for key, value in (("$gte", min_rating), ("$lte", max_rating))
+                       if value is not None}
+            if ratings:
+                query[fields["Rating"]] = ratings
+            dates = {key: pd.Timestamp(value).to_pydatetime()
+                     for key, value in (("$gte", since), ("$lte", until)) if value is not None}
+            if dates:
+                query[fields["Date"]] = dates
+
+            self.mongo_ins.ensure_index(collection_name, [(fields["Comment"], pymongo.TEXT)],
+                                        name="review_text", default_language=REVIEW_TEXT_LANGUAGE)
+            # One extra document tells whether there is a next page, without counting all matches
+            with get_metrics().timer("mongo_search_seconds", storage_mode=self.storage_mode):
+                documents = list(
+                    self.mongo_ins.get_collection(collection_name)
+                        .find({"$text": {"$search": text}, **query},
+                              {**projection, "score": {"$meta": "textScore"}})
+                        .sort([("score", {"$meta": "textScore"}), (fields["Date"], pymongo.DESCENDING)])
+                        .skip(page * page_size)
+                        .limit(page_size + 1)
+                        .max_time_ms(REVIEW_SEARCH_MAX_TIME_MS)
+                )
+            result["has_more"] = len(documents) > page_size
+            documents = documents[:page_size]
+            if not documents:
+                return result
+
+            matches = pd.DataFrame(documents)
+            if self.normalized:
+                found = self.mongo_ins.find(
+                    collection_name=PRODUCTS_COLLECTION,
+                    query={"_id": {"$in": list(matches["product_id"].unique())}},
+                    projection={"_id": 0, **{field: 1 for field in PRODUCT_FIELDS}},
+                )
+                # Reviews whose product document is gone keep empty product fields
+                found = found.reindex(columns=list(PRODUCT_FIELDS))
+                found["product_id"] = [product_id(name) for name in found["name"]]
+                reviews = self._join_products(matches, found)
+            else:
+                reviews = type_reviews(matches)
+            result["reviews"] = reviews.assign(Score=matches["score"].to_numpy())
+            return result
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def count_reviews(self, product_name: str) -> int:
+        """Number of stored reviews of a search, counted on the server."""
+        try:
+            if not self.normalized:
+                return self.mongo_ins.get_collection(product_name.replace(" ", "_")).count_documents({})
+            products = self._find_products(product_name)
+            if products.empty:
+                return 0
+            return self.mongo_ins.get_collection(REVIEWS_COLLECTION).count_documents(
+                {"product_id": {"$in": list(products["product_id"])}})
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def get_review_stats(self, product_name: str) -> dict:
+        """
+        Summaries of the stored reviews of a search, computed by one
+        aggregation on the server instead of loading every review:
+
+        - "total": number of reviews
+        - "rating_histogram": frame of Rating, Count
+        - "rating_buckets": frame of Bucket, Count (see RATING_BUCKET_LABELS)
+        - "product_counts": frame of Product Name, Reviews
+        - "prices": distinct product prices
+        """
+        try:
+            if self.normalized:
+                products = self._find_products(product_name)
+                if products.empty:
+                    return self._review_stats({}, [])
+                collection_name = REVIEWS_COLLECTION
+                match = {"product_id": {"$in": list(products["product_id"])}}
+                rating, product = "$rating", "$product_id"
+            else:
+                collection_name = product_name.replace(" ", "_")
+                match = {}
+                rating, product = "$Rating", "$Product Name"
+
+            pipeline = [
+                {"$match": match},
+                {"$facet": {
+                    "total": [{"$count": "count"}],
+                    "histogram": [
+                        # Only typed ratings; placeholders are stored as null
+                        {"$match": {rating[1:]: {"$type": "number"}}},
+                        {"$group": {"_id": rating, "count": {"$sum": 1}}},
+                        {"$sort": {"_id": 1}},
+                    ],
+                    "buckets": [
+                        {"$match": {rating[1:]: {"$type": "number"}}},
+                        {"$bucket": {"groupBy": rating, "boundaries": RATING_BUCKET_BOUNDS,
+                                     "default": "other", "output": {"count": {"$sum": 1}}}},
+                    ],
+                    "products": [{"$group": {"_id": product, "count": {"$sum": 1}}},
+                                 {"$sort": {"count": -1}}],
+                    **({} if self.normalized else {"prices": [{"$group": {"_id": "$Price"}}]}),
+                }},
+            ]
+            (facets,) = self.mongo_ins.aggregate(collection_name, pipeline)
+
+            if self.normalized:
+                names = dict(zip(products["product_id"], products["name"]))
+                for row in facets["products"]:
+                    row["_id"] = names.get(row["_id"])
+                prices = products["price"].dropna().unique().tolist() if "price" in products else []
+            else:
+                prices = [row["_id"] for row in facets["prices"] if row["_id"] is not None]
+            return self._review_stats(facets, prices)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @staticmethod
+    def _review_stats(facets: dict, prices: list) -> dict:
+        bucket_labels = dict(zip(RATING_BUCKET_BOUNDS, RATING_BUCKET_LABELS))
+        buckets = {row["_id"]: row["count"] for row in facets.get("buckets", [])}
+        return {
+            "total": facets["total"][0]["count"] if facets.get("total") else 0,
+            "rating_histogram": pd.DataFrame(
+                [(row["_id"], row["count"]) for row in facets.get("histogram", [])],
+                columns=["Rating", "Count"]),
+            "rating_buckets": pd.DataFrame(
+                [(label, buckets[bound]) for bound, label in bucket_labels.items() if bound in buckets],
+                columns=["Bucket", "Count"]),
+            "product_counts": pd.DataFrame(
+                [(row["_id"], row["count"]) for row in facets.get("products", [])],
+                columns=["Product Name", "Reviews"]),
+            "prices": sorted(prices),
+        }
+
+    def get_review_watermark(self, product_name: str, product_title: str) -> dict:
+        """
+        Newest review date and fingerprints of the reviews already stored for
+        one product of a search, used by incremental scraping.
+        """
+        try:
+            if self.normalized:
+                stored = self.mongo_ins.find(
+                    collection_name=REVIEWS_COLLECTION,
+                    query={"product_id": product_id(product_title)},
+                    projection={"_id": 0, REVIEW_ID_FIELD: 1, "date": 1},
+                )
+                if stored.empty:
+                    return {"latest_date": None, "fingerprints": set()}
+                dates = stored["date"].dropna() if "date" in stored.columns else []
+                return {
+                    "latest_date": parse_review_date(max(dates)) if len(dates) else None,
+                    "fingerprints": set(stored[REVIEW_ID_FIELD]),
+                }
+
+            stored = self.mongo_ins.find(
+                collection_name=product_name.replace(" ", "_"),
+                query={"Product Name": product_title},
+                projection={"_id": 0, REVIEW_ID_FIELD: 1, "Product Name": 1,
+                            "Name": 1, "Date": 1, "Comment": 1},
+            )
+            if stored.empty:
+                return {"latest_date": None, "fingerprints": set()}
+
+            fingerprints = review_fingerprints(stored)
+            if REVIEW_ID_FIELD in stored.columns:
+                # Documents written before review ids existed fall back to the computed one
+                fingerprints = stored[REVIEW_ID_FIELD].fillna(fingerprints)
 
-            return data
+            dates = [date for date in map(parse_review_date, stored["Date"]) if date]
+            return {
+                "latest_date": max(dates) if dates else None,
+                "fingerprints": set(fingerprints),
+            }
 
         except Exception as e:
-            raise CustomException(e, sys)
\ No newline at end of file
+            raise CustomException(e, sys)
@@ -0,0 +1,68 @@
+"""
+Moves reviews from the legacy layout (one collection of flat rows per
+search) into the normalized products and reviews collections.
+
+    python -m src.cloud_io.migrate           # copy, keep the old collections
+    python -m src.cloud_io.migrate --drop    # drop each collection once copied
+
+Reviews are upserted by fingerprint, so the migration can be rerun safely.
+"""
+import argparse
+import sys
+
+import pandas as pd
+
+from src.cloud_io import MongoIO
+from src.constants import (MONGO_WRITE_BATCH_SIZE, PRODUCT_SUMMARIES_COLLECTION,
+                           REVIEW_TERMS_COLLECTION)
+from src.schema import REVIEW_COLUMNS
+
+
+def migrate(drop: bool = False, batch_size: int = MONGO_WRITE_BATCH_SIZE) -> dict:
+    """Copies every legacy collection; returns {collection: (inserted, already stored)}."""
+    mongo_io = MongoIO(storage_mode="normalized")
+    database = mongo_io.mongo_ins.get_database()
+    results = {}
+
+    for name in mongo_io.legacy_collections():
+        product_name = name.replace("_", " ")
+        inserted = matched = 0
+        batch = []
+        cursor = database[name].find({}, {"_id": 0, **{column: 1 for column in REVIEW_COLUMNS}})
+
+        for document in cursor.batch_size(batch_size):
+            batch.append(document)
+            if len(batch) == batch_size:
+                report = mongo_io.store_reviews(product_name, pd.DataFrame(batch, columns=REVIEW_COLUMNS))
+                inserted, matched = inserted + report["inserted"], matched + report["matched"]
+                batch = []
+        if batch:
+            report = mongo_io.store_reviews(product_name, pd.DataFrame(batch, columns=REVIEW_COLUMNS))
+            inserted, matched = inserted + report["inserted"], matched + report["matched"]
+
+        if drop:
+            database.drop_collection(name)
+            database[PRODUCT_SUMMARIES_COLLECTION].delete_many({"scope": name})
+            database[REVIEW_TERMS_COLLECTION].delete_many({"scope": name})
+        results[name] = (inserted, matched)
+    return results
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--drop", action="store_true",
+                            help="drop each legacy collection after copying it")
+    arg_parser.add_argument("--batch-size", type=int, default=MONGO_WRITE_BATCH_SIZE)
+    args = arg_parser.parse_args(argv)
+
+    results = migrate(drop=args.drop, batch_size=args.batch_size)
+    if not results:
+        print("No legacy review collections found.")
+    for name, (inserted, matched) in results.items():
+        print(f"{name}: {inserted} reviews migrated, {matched} already stored"
+              f"{', dropped' if args.drop else ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
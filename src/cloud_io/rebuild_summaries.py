@@ -0,0 +1,32 @@
+"""
+Recomputes the product summary and review term documents from the stored reviews.
+
+    python -m src.cloud_io.rebuild_summaries                      # MONGO_STORAGE_MODE layout
+    python -m src.cloud_io.rebuild_summaries --storage-mode per_query
+
+Summaries and term counts are kept up to date by every store; a rebuild is
+only needed for reviews written before they existed or written by other tools.
+"""
+import argparse
+import sys
+
+from src.cloud_io import MongoIO
+from src.constants import MONGO_STORAGE_MODE
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--storage-mode", choices=["normalized", "per_query"],
+                            default=MONGO_STORAGE_MODE)
+    args = arg_parser.parse_args(argv)
+
+    mongo_io = MongoIO(storage_mode=args.storage_mode)
+    written = mongo_io.rebuild_product_summaries()
+    print(f"Rebuilt {written} product summaries ({args.storage_mode} layout).")
+    written = mongo_io.rebuild_review_terms()
+    print(f"Rebuilt {written} review term documents ({args.storage_mode} layout).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
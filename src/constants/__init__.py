@@ -1,4 +1,148 @@
+import os
+
 MONGODB_URL_KEY: str="MONGO_DB_URL"
 MONGO_DATABASE_NAME: str = "myntra-reviews"
 
-SESSION_PRODUCT_KEY: str="product_name"
\ No newline at end of file
+SESSION_PRODUCT_KEY: str="product_name"
+SESSION_JOB_KEY: str = "scrape_job_id"
+
+# Number of parallel browser sessions used by ScrapeReviews.get_review_data
+SCRAPE_WORKERS: int = 3
+
+
+# Page fetching: "http" loads pages through a pooled HTTP client and only falls
+# back to Selenium when the page needs JavaScript, "selenium" always uses Chrome
+FETCH_MODE: str = os.getenv("FETCH_MODE", "http")
+# Point this at a local server with saved Myntra HTML to scrape offline
+MYNTRA_BASE_URL: str = os.getenv("MYNTRA_BASE_URL", "https://www.myntra.com").rstrip("/")
+HTTP_POOL_SIZE: int = 20
+HTTP_TIMEOUT_SECONDS: float = 15
+HTTP_HEADERS: dict = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# HTML parser backend for scraped pages: "lxml" (fast) or "bs4" (BeautifulSoup html.parser)
+HTML_PARSER: str = os.getenv("HTML_PARSER", "lxml")
+
+# How review pages are read once scrolled: "script" extracts the review records
+# inside the browser and returns them as JSON, "page_source" transfers the whole
+# DOM and parses it with HTML_PARSER
+REVIEW_EXTRACTION: str = os.getenv("REVIEW_EXTRACTION", "script")
+
+# Review page scrolling (see ScrapeReviews.scroll_to_load_reviews)
+SCROLL_MAX_REVIEWS: int = None  # None scrolls until no more reviews load
+SCROLL_TIME_BUDGET_SECONDS: float = 180
+SCROLL_WAIT_MIN_SECONDS: float = 0.5
+SCROLL_WAIT_MAX_SECONDS: float = 4
+SCROLL_POLL_SECONDS: float = 0.2
+SCROLL_IDLE_ROUNDS: int = 3
+
+# Chrome launch profile: "scrape" runs headless with an eager page-load strategy
+# and blocks images, media, fonts and third-party trackers; "default" is a plain
+# visible Chrome
+BROWSER_PROFILE: str = os.getenv("BROWSER_PROFILE", "scrape")
+# Base directory for reusable Chrome profiles (one sub-directory per browser)
+BROWSER_USER_DATA_DIR: str = os.getenv("BROWSER_USER_DATA_DIR")
+# Idle browsers kept alive between scrapes in the same process
+BROWSER_WARM_MAX: int = SCRAPE_WORKERS
+# Seconds to wait for JavaScript-rendered content after an eager page load
+PAGE_RENDER_TIMEOUT_SECONDS: float = 10
+BROWSER_BLOCKED_URLS: list = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*facebook.net*", "*facebook.com*",
+    "*hotjar.com*", "*clevertap*", "*branch.io*", "*sentry.io*",
+]
+
+# Search result paging (see ScrapeReviews.iter_product_urls)
+SEARCH_PAGE_PARAM: str = "p"
+SEARCH_MAX_PAGES: int = 50
+
+# Per-product checkpoints that let a failed scrape resume (None disables them)
+CHECKPOINT_PATH: str = os.getenv("SCRAPE_CHECKPOINT_PATH", os.path.join("artifacts", "checkpoints.sqlite"))
+# Checkpoints older than this are ignored and dropped, so an abandoned run
+# never feeds stale reviews to a later scrape
+CHECKPOINT_MAX_AGE_SECONDS: float = float(os.getenv("SCRAPE_CHECKPOINT_MAX_AGE_SECONDS", 24 * 60 * 60))
+# Local Parquet store every scraped product is appended to (empty to disable)
+REVIEW_STORE_DIR: str = os.getenv("REVIEW_STORE_DIR", os.path.join("artifacts", "reviews"))
+
+# Background scrape jobs (see src/jobs): state store, per-job results and
+# how many crawls run at the same time
+JOB_DB_PATH: str = os.getenv("SCRAPE_JOB_DB_PATH", os.path.join("artifacts", "jobs.sqlite"))
+JOB_RESULTS_DIR: str = os.getenv("SCRAPE_JOB_RESULTS_DIR", os.path.join("artifacts", "jobs"))
+JOB_WORKERS: int = int(os.getenv("SCRAPE_JOB_WORKERS", 2))
+JOB_POLL_SECONDS: float = 2
+
+# On-disk page cache: "on" reuses pages younger than PAGE_CACHE_TTL_SECONDS,
+# "replay" serves pages only from the cache (no browser, no network), "off"
+# disables it. Opt-in, so app scrapes and jobs always see the live site
+PAGE_CACHE_MODE: str = os.getenv("PAGE_CACHE_MODE", "off")
+PAGE_CACHE_DIR: str = os.getenv("PAGE_CACHE_DIR", os.path.join("artifacts", "page_cache"))
+PAGE_CACHE_TTL_SECONDS: float = 6 * 60 * 60
+PAGE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+
+# Appended to the review page URL in incremental mode to list the newest reviews first
+INCREMENTAL_REVIEW_SORT_QUERY: str = "sort=recent"
+
+# Shared MongoClient settings (see src/database_connect.py)
+MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", 50))
+MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", 0))
+MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+MONGO_CONNECT_TIMEOUT_MS: int = 5000
+MONGO_SOCKET_TIMEOUT_MS: int = 30000
+# Wire compression, e.g. "zstd,snappy,zlib" when those libraries are installed
+MONGO_COMPRESSORS: str = os.getenv("MONGO_COMPRESSORS", "zlib")
+# Documents per bulk_write call when storing reviews
+MONGO_WRITE_BATCH_SIZE: int = int(os.getenv("MONGO_WRITE_BATCH_SIZE", 1000))
+# Stable review fingerprint stored with every review (unique per collection)
+REVIEW_ID_FIELD: str = "review_id"
+# "normalized": one products and one reviews collection shared by all searches;
+# "per_query": the legacy layout with one collection of flat rows per search
+MONGO_STORAGE_MODE: str = os.getenv("MONGO_STORAGE_MODE", "normalized")
+PRODUCTS_COLLECTION: str = "products"
+REVIEWS_COLLECTION: str = "reviews"
+# Rating buckets of the analysis page: lower bounds (inclusive) and labels
+RATING_BUCKET_BOUNDS: list = [0, 3, 4, 6]
+RATING_BUCKET_LABELS: list = ["Negative (<3)", "Neutral (3–3.9)", "Positive (≥4)"]
+# Keys of the same buckets in stored documents (src/text_index.py)
+RATING_BUCKET_KEYS: list = ["negative", "neutral", "positive"]
+# Raw reviews shown in the analysis page preview
+PREVIEW_ROWS: int = 5
+# One summary document per product, updated by every MongoIO.store_reviews
+PRODUCT_SUMMARIES_COLLECTION: str = "product_summaries"
+# Batch crawl CLI (src/crawl.py) defaults
+CRAWL_RATE_PER_SECOND: float = float(os.getenv("CRAWL_RATE_PER_SECOND", 2))
+CRAWL_BURST: int = 5
+CRAWL_MAX_PER_HOST: int = 4
+CRAWL_CONCURRENCY: int = 2
+CRAWL_RETRIES: int = 3
+CRAWL_BACKOFF_SECONDS: float = 5
+
+# Pipeline metrics (src/metrics.py): JSON log lines of every observation go to
+# this file ("-" for stderr, empty to disable)
+METRICS_LOG_PATH: str = os.getenv("METRICS_LOG_PATH", "")
+# Metrics snapshot of a background job, next to its results
+JOB_METRICS_FILE: str = "_metrics.json"
+
+# Dashboards (src/analytics.py): reviews listed per product and their rating limits
+DASHBOARD_TOP_REVIEWS: int = 5
+POSITIVE_REVIEW_MIN_RATING: float = 4.5
+NEGATIVE_REVIEW_MAX_RATING: float = 2
+# Review frames whose statistics are kept in memory
+ANALYTICS_CACHE_SIZE: int = 8
+
+# Review term index (src/text_index.py): one document of term counts per
+# product and rating bucket, updated by every MongoIO.store_reviews
+REVIEW_TERMS_COLLECTION: str = "review_terms"
+TOP_TERMS: int = 15
+
+# Full-text review search (MongoIO.search_reviews): matches per page, server
+# time limit of one query and the stemming language of the text index
+REVIEW_SEARCH_PAGE_SIZE: int = 20
+REVIEW_SEARCH_MAX_TIME_MS: int = 2000
+REVIEW_TEXT_LANGUAGE: str = "english"
@@ -0,0 +1,186 @@
+"""
+Batch crawl of many searches without the Streamlit app, e.g. for nightly refreshes.
+
+    myntra-crawl queries.csv                       # or: python -m src.crawl queries.csv
+    myntra-crawl queries.csv --output mongo files --rate 1 --concurrency 3
+
+The queries file has one search per line, optionally followed by the number
+of products to scrape (``men tshirt,20``); blank lines and lines starting
+with "#" are skipped. All searches share one rate limiter. A failed search
+is retried with jittered exponential backoff and resumes from its scrape
+checkpoints; a crawl that was interrupted resumes when it is started again
+with the run id it printed (``--run-id``). The run ends with a throughput
+summary.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from src.constants import (CRAWL_BACKOFF_SECONDS, CRAWL_BURST, CRAWL_CONCURRENCY,
+                           CRAWL_MAX_PER_HOST, CRAWL_RATE_PER_SECOND, CRAWL_RETRIES,
+                           REVIEW_STORE_DIR, SCRAPE_WORKERS)
+from src.metrics import get_metrics
+from src.scrapper.rate_limit import RateLimiter
+
+
+def read_queries(path: str, default_products: int) -> list:
+    """[(search, number of products)] from a queries file."""
+    queries = []
+    with open(path, encoding="utf-8") as queries_file:
+        for line_no, line in enumerate(queries_file, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            search, separator, count = line.replace("\t", ",").rpartition(",")
+            if not separator:
+                search, count = count, ""
+            search, count = search.strip(), count.strip()
+            if count and not count.isdigit():
+                if not queries:
+                    # A header line such as "query,products"
+                    continue
+                raise ValueError(f"{path}:{line_no}: product count is not a number: {count!r}")
+            queries.append((search, int(count) if count else default_products))
+    return queries
+
+
+def backoff_delay(attempt: int, base: float) -> float:
+    """Exponential backoff with full jitter around the nominal delay."""
+    return base * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+def crawl_query(search: str, no_of_products: int, args, limiter: RateLimiter) -> dict:
+    """Scrapes one search, retrying failures; returns its result record."""
+    # Imported here so `--help` works without the browser dependencies
+    from src.scrapper.scrape import ScrapeReviews
+
+    mongoio = None
+    result = {"query": search, "products": 0, "reviews": 0, "stored": 0,
+              "attempts": 0, "error": None, "seconds": 0.0}
+    started = time.perf_counter()
+    for attempt in range(args.retries + 1):
+        result["attempts"] = attempt + 1
+        # Counted per attempt: a retry yields the checkpointed products again
+        products = reviews = stored = 0
+        try:
+            # Connected inside the attempt, so an unreachable MongoDB fails only this search
+            if mongoio is None and "mongo" in args.output:
+                from src.cloud_io import MongoIO
+                mongoio = MongoIO()
+            scrapper = ScrapeReviews(product_name=search, no_of_products=no_of_products,
+                                     workers=args.workers, rate_limiter=limiter,
+                                     run_id=args.run_id,
+                                     store_dir=args.out_dir if "files" in args.output else "")
+            for batch in scrapper.iter_review_data():
+                products += 1
+                reviews += len(batch)
+                if mongoio is not None and not batch.empty:
+                    stored += mongoio.store_reviews(product_name=search, reviews=batch)["inserted"]
+            result.update(products=products, reviews=reviews, stored=stored, error=None)
+            break
+        except Exception as e:
+            result.update(products=products, reviews=reviews, stored=stored, error=str(e))
+            if attempt < args.retries:
+                get_metrics().inc("crawl_retries_total")
+                delay = backoff_delay(attempt, args.backoff)
+                print(f"[{search}] attempt {attempt + 1} failed ({e}); retrying in {delay:.1f}s",
+                      file=sys.stderr)
+                time.sleep(delay)
+    result["seconds"] = round(time.perf_counter() - started, 2)
+    return result
+
+
+def pages_loaded() -> int:
+    """Pages loaded from the site so far in this process (scrape_pages_total)."""
+    return int(sum(counter["value"] for counter in get_metrics().snapshot()["counters"]
+                   if counter["name"] == "scrape_pages_total"))
+
+
+def summarize(results: list, pages: int, seconds: float) -> dict:
+    failures = [result for result in results if result["error"]]
+    reviews = sum(result["reviews"] for result in results)
+    return {
+        "queries": len(results),
+        "failures": len(failures),
+        "products": sum(result["products"] for result in results),
+        "reviews": reviews,
+        "stored": sum(result["stored"] for result in results),
+        "pages": pages,
+        "seconds": round(seconds, 2),
+        "pages_per_second": round(pages / seconds, 3) if seconds else 0.0,
+        "reviews_per_second": round(reviews / seconds, 3) if seconds else 0.0,
+        "failed_queries": [{"query": result["query"], "error": result["error"]}
+                           for result in failures],
+    }
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("queries", help="file with one search (and product count) per line")
+    arg_parser.add_argument("--products", type=int, default=10,
+                            help="products per search when the file gives none")
+    arg_parser.add_argument("--output", nargs="+", choices=["mongo", "files"], default=["mongo"],
+                            help="store reviews in MongoDB and/or the local Parquet store")
+    arg_parser.add_argument("--out-dir", default=REVIEW_STORE_DIR,
+                            help="local Parquet store for --output files")
+    arg_parser.add_argument("--concurrency", type=int, default=CRAWL_CONCURRENCY,
+                            help="searches crawled at the same time")
+    arg_parser.add_argument("--workers", type=int, default=SCRAPE_WORKERS,
+                            help="browser sessions per search")
+    arg_parser.add_argument("--rate", type=float, default=CRAWL_RATE_PER_SECOND,
+                            help="page requests per second, shared by all searches")
+    arg_parser.add_argument("--burst", type=int, default=CRAWL_BURST)
+    arg_parser.add_argument("--max-per-host", type=int, default=CRAWL_MAX_PER_HOST,
+                            help="page requests in flight per host")
+    arg_parser.add_argument("--retries", type=int, default=CRAWL_RETRIES)
+    arg_parser.add_argument("--backoff", type=float, default=CRAWL_BACKOFF_SECONDS,
+                            help="base delay of the jittered exponential backoff")
+    arg_parser.add_argument("--run-id", default=uuid.uuid4().hex,
+                            help="id of an interrupted crawl to resume from its checkpoints")
+    arg_parser.add_argument("--summary-json", help="also write the summary to this file")
+    arg_parser.add_argument("--metrics-file",
+                            help="write the pipeline metrics in Prometheus text format to this file "
+                                 "(e.g. for the node_exporter textfile collector)")
+    args = arg_parser.parse_args(argv)
+
+    queries = read_queries(args.queries, args.products)
+    print(f"Crawl run id: {args.run_id} (pass --run-id {args.run_id} to resume it)")
+    limiter = RateLimiter(args.rate, burst=args.burst, max_per_host=args.max_per_host)
+
+    started, pages_before = time.perf_counter(), pages_loaded()
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+        futures = [executor.submit(crawl_query, search, count, args, limiter)
+                   for search, count in queries]
+        results = []
+        for future in futures:
+            result = future.result()
+            results.append(result)
+            status = f"failed: {result['error']}" if result["error"] else "ok"
+            print(f"[{result['query']}] {result['products']} products, {result['reviews']} reviews "
+                  f"in {result['seconds']}s ({status})")
+    summary = summarize(results, pages_loaded() - pages_before, time.perf_counter() - started)
+
+    stored = f" ({summary['stored']} new in MongoDB)" if "mongo" in args.output else ""
+    print(f"\n{summary['queries']} searches, {summary['failures']} failed, "
+          f"{summary['products']} products, {summary['reviews']} reviews{stored}")
+    print(f"{summary['pages']} pages in {summary['seconds']}s: "
+          f"{summary['pages_per_second']} pages/s, {summary['reviews_per_second']} reviews/s")
+    for failure in summary["failed_queries"]:
+        print(f"  failed: {failure['query']}: {failure['error']}")
+    if args.summary_json:
+        with open(args.summary_json, "w", encoding="utf-8") as summary_file:
+            json.dump({"summary": summary, "queries": results,
+                       "metrics": get_metrics().snapshot()}, summary_file, indent=2)
+    if args.metrics_file:
+        with open(args.metrics_file, "w", encoding="utf-8") as metrics_file:
+            metrics_file.write(get_metrics().to_prometheus())
+
+    return 1 if summary["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
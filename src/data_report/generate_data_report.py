@@ -5,70 +5,61 @@ import plotly.graph_objects as go
 
 import os,sys
 from src.exceptions import CustomException
+from src.analytics import get_analytics
 
 class DashboardGenerator:
     def __init__(self,data):
-        self.data=data
-    
+        # Statistics of the frame are computed once and cached (see src/analytics.py)
+        self.analytics=get_analytics(data)
+        self.data=self.analytics.data
+
     def display_general_info(self):
         st.header('General information')
 
-        self.data['Over_All_Rating']=pd.to_numeric(self.date['Over_All_Rating'],errors='coerce')
-        self.data['Price']=pd.to_numeric(
-            self.data['Price'].apply(lambda x:x.replace("₹","")),
-            errors='coerce')
-        
-        self.data["Rating"]=pd.to_numeric(self.data['Rating'],errors='coerce')
-
-        product_ratings=self.data.groupby('Product Name', as_index=False)['Over_All_Rating'].mean().dropna()
+        product_stats=self.analytics.product_stats.reset_index()
 
-        fig_pie=px.pie(product_ratings,values='Over_All_Rating',names='Product Name',
+        product_ratings=product_stats[['Product Name','average_over_all_rating']].dropna()
+        fig_pie=px.pie(product_ratings,values='average_over_all_rating',names='Product Name',
                        title='Average Ratings by Product')
         st.plotly_chart(fig_pie)
 
-        avg_prices=self.data.groupby('Product Name',as_index=False)['Price'].mean().dropna()
-        fig_bar=px.bar(avg_prices,x='Product Name',y='Price', color='Product Name' ,
+        avg_prices=product_stats[['Product Name','average_price']].dropna()
+        fig_bar=px.bar(avg_prices,x='Product Name',y='average_price', color='Product Name' ,
                        title='Average Price Comparison Between Products',
                        color_discrete_sequence=px.colors.qualitative.Bold)
-        
+
         fig_bar.update_xaxes(title='Product Name')
         fig_bar.update_yaxes(title='Average Price')
         st.plotly_chart(fig_bar)
 
     def display_product_sections(self):
         st.header('Product Sections')
-        product_names=self.data['Product Name'].unique()
-        columns=st.columns(len(product_names))
-
-        for i, product_name in enumerate(product_names):
-            product_data=self.data[self.data['Product Name']==product_name]
+        product_stats=self.analytics.product_stats
+        positive=self.analytics.top_reviews('positive')
+        negative=self.analytics.top_reviews('negative')
+        columns=st.columns(len(product_stats))
 
+        for i, (product_name, stats) in enumerate(product_stats.iterrows()):
             with columns[i]:
                 st.subheader(f'{product_name}')
 
-                avg_price=product_data['Price'].mean()
-                st.markdown(f"Average Price: ₹{avg_price:.2f}")
-
-                avg_rating=product_data['Over_All_Rating'].mean()
-                st.markdown(f"Average Rating:{avg_rating:.2f}")
+                st.markdown(f"Average Price: ₹{stats['average_price']:.2f}")
+                st.markdown(f"Average Rating:{stats['average_over_all_rating']:.2f}")
 
-                positive_reviews=product_data[product_data['Rating']>=4.5].nlargest(5,'Rating')
                 st.subheader('Positive Reviews')
-                for index, row in positive_reviews.iterrows():
-                    st.markdown(f" Rating:{row['Rating']}-{row['Comment']}")
+                self._display_reviews(positive.get(product_name))
 
-                negative_reviews=product_data[product_data['Rating']<=2].nsmallest(5,'Rating')
                 st.subheader('Negative Reviews')
-                for index, row in negative_reviews.iterrows():
-                    st.markdown(f"Rating:{row['Rating']}- {row['Comment']}")
-
-                    st.subheader('Rating Counts')
-
-                    rating_counts=product_data['Rating'].value_counts().sort_index(ascending=False)
-                    for rating, count in rating_counts.items():
-                        st.write(f"* Rating{rating} count:{count}")
-                        
-
-
-
-            
\ No newline at end of file
+                self._display_reviews(negative.get(product_name))
+
+                st.subheader('Rating Counts')
+                for rating, count in self.analytics.star_counts(product_name).items():
+                    st.write(f"* Rating{rating} count:{count}")
+
+    @staticmethod
+    def _display_reviews(reviews):
+        if reviews is None:
+            return
+        # One markdown block per product instead of a widget per review row
+        st.markdown("\n".join(f"- Rating:{rating}-{comment}"
+                               for rating, comment in zip(reviews['Rating'], reviews['Comment'])))
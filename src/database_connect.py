@@ -1,74 +1,167 @@
 # In src/database_connect.py
 
+import atexit
+import os
+import threading
+import time
+
 import pymongo
+from pymongo import UpdateOne, monitoring
+from pymongo.errors import BulkWriteError
 import pandas as pd
 
-class mongo_operation:
-    def __init__(self, client_url: str, database_name: str):
-        self.client_url = client_url
-        self.database_name = database_name
+from src.metrics import get_metrics
+from src.constants import (MONGO_COMPRESSORS, MONGO_CONNECT_TIMEOUT_MS, MONGO_MAX_POOL_SIZE,
+                           MONGO_MIN_POOL_SIZE, MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                           MONGO_SOCKET_TIMEOUT_MS, MONGO_WRITE_BATCH_SIZE)
 
-    def get_client(self):
-        """Creates a client connection to MongoDB."""
-        return pymongo.MongoClient(self.client_url)
+DUPLICATE_KEY_ERROR = 11000
 
-    def get_database(self):
-        """Gets the database from the client."""
-        client = self.get_client()
-        return client[self.database_name]
 
-    def get_collection(self, collection_name: str):
-        """Gets a collection from the database."""
-        db = self.get_database()
-        return db[collection_name]
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    """Counts connection pool events of one MongoClient."""
 
-    def bulk_insert(self, collection_name: str, dataframe: pd.DataFrame):
-        """
-        Inserts a pandas DataFrame into the specified collection.
-        """
-        if not isinstance(dataframe, pd.DataFrame):
-            raise TypeError("The 'dataframe' argument must be a pandas DataFrame.")
-            
-        collection = self.get_collection(collection_name)
-        # Convert dataframe to a list of dictionaries (records)
-        records = dataframe.to_dict('records')
-        
-        if records:
-            collection.insert_many(records)
-            print(f"Successfully inserted {len(records)} records into '{collection_name}'.")
-        else:
-            print("DataFrame is empty, nothing to insert.")
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {"pools_created": 0, "connections_created": 0, "connections_closed": 0,
+                       "checked_out": 0, "checked_in": 0, "checkout_failed": 0}
 
-    def find(self, collection_name: str, query: dict = None):
-        """
-        Finds documents in a collection and returns them as a pandas DataFrame.
-        """
-        if query is None:
-            query = {} # Find all documents if no query is provided
-            
-        collection = self.get_collection(collection_name)
-        cursor = collection.find(query)
-        df = pd.DataFrame(list(cursor))
-        
-        # MongoDB adds an '_id' column by default, you may want to remove it
-        if '_id' in df.columns:
-            df = df.drop(columns=['_id'])
-            
-        return df
+    def _count(self, key: str):
+        with self._lock:
+            self.counts[key] += 1
 
-# In src/database_connect.py
+    def pool_created(self, event):
+        self._count("pools_created")
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._count("connections_created")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._count("connections_closed")
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._count("checkout_failed")
+
+    def connection_checked_out(self, event):
+        self._count("checked_out")
+
+    def connection_checked_in(self, event):
+        self._count("checked_in")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = dict(self.counts)
+        stats["open_connections"] = stats["connections_created"] - stats["connections_closed"]
+        stats["in_use"] = stats["checked_out"] - stats["checked_in"]
+        return stats
+
+
+class CommandFailureListener(monitoring.CommandListener):
+    """
+    Counts failed commands in the process metrics. pymongo retries
+    retryable reads and writes once, so these include the retried ones.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        get_metrics().inc("mongo_command_failures_total", command=event.command_name)
+
+
+# One pooled client per (process, url, options); Streamlit reruns reuse it
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _new_client(client_url: str, listener: PoolStatsListener, **options):
+    """Opens a MongoClient whose pool events are counted by `listener`."""
+    return pymongo.MongoClient(
+        client_url, event_listeners=[listener, CommandFailureListener()], **options)
+
+
+def get_shared_client(client_url: str, **options):
+    """
+    Returns the process-wide MongoClient for `client_url`, creating it on
+    first use.
+    """
+    key = (os.getpid(), client_url, tuple(sorted(options.items())))
+    with _clients_lock:
+        if key not in _clients:
+            listener = PoolStatsListener()
+            _clients[key] = (_new_client(client_url, listener, **options), listener)
+        return _clients[key]
+
+
+def close_clients():
+    """Closes every pooled client of this process."""
+    with _clients_lock:
+        clients = [client for (pid, _, _), (client, _) in _clients.items() if pid == os.getpid()]
+        _clients.clear()
+    for client in clients:
+        client.close()
+
+
+atexit.register(close_clients)
 
-import pymongo
-import pandas as pd
 
 class mongo_operation:
-    def __init__(self, client_url: str, database_name: str):
+    def __init__(self, client_url: str, database_name: str,
+                 max_pool_size: int = MONGO_MAX_POOL_SIZE,
+                 min_pool_size: int = MONGO_MIN_POOL_SIZE,
+                 server_selection_timeout_ms: int = MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                 connect_timeout_ms: int = MONGO_CONNECT_TIMEOUT_MS,
+                 socket_timeout_ms: int = MONGO_SOCKET_TIMEOUT_MS,
+                 compressors: str = MONGO_COMPRESSORS):
         self.client_url = client_url
         self.database_name = database_name
+        self.client_options = {
+            "maxPoolSize": max_pool_size,
+            "minPoolSize": min_pool_size,
+            "serverSelectionTimeoutMS": server_selection_timeout_ms,
+            "connectTimeoutMS": connect_timeout_ms,
+            "socketTimeoutMS": socket_timeout_ms,
+        }
+        if compressors:
+            self.client_options["compressors"] = compressors
+        # (collection, index name) pairs already ensured by this process
+        self._indexed = set()
 
     def get_client(self):
-        """Creates a client connection to MongoDB."""
-        return pymongo.MongoClient(self.client_url)
+        """Returns the shared, pooled client connection to MongoDB."""
+        client, _ = get_shared_client(self.client_url, **self.client_options)
+        return client
+
+    def pool_stats(self) -> dict:
+        """Connection pool counters of the shared client."""
+        _, listener = get_shared_client(self.client_url, **self.client_options)
+        return listener.snapshot()
+
+    def close(self):
+        """Closes the shared client; the next call opens a new one."""
+        key = (os.getpid(), self.client_url, tuple(sorted(self.client_options.items())))
+        with _clients_lock:
+            entry = _clients.pop(key, None)
+        if entry is not None:
+            entry[0].close()
 
     def get_database(self):
         """Gets the database from the client."""
@@ -80,36 +173,106 @@ class mongo_operation:
         db = self.get_database()
         return db[collection_name]
 
-    def bulk_insert(self, collection_name: str, dataframe: pd.DataFrame):
+    def ensure_index(self, collection_name: str, keys: list, name: str, **options):
+        """Creates an index once per collection and process (create_index is idempotent)."""
+        if (collection_name, name) in self._indexed:
+            return
+        self.get_collection(collection_name).create_index(keys, name=name, **options)
+        self._indexed.add((collection_name, name))
+
+    def ensure_unique_index(self, collection_name: str, key_field: str):
+        """Creates the unique index on `key_field` once per collection and process."""
+        self.ensure_index(
+            collection_name,
+            [(key_field, pymongo.ASCENDING)],
+            name=f"unique_{key_field}",
+            unique=True,
+            # Documents written before the key existed are left out of the index
+            partialFilterExpression={key_field: {"$exists": True}},
+        )
+
+    def bulk_upsert(self, collection_name: str, dataframe: pd.DataFrame, key_field: str,
+                    batch_size: int = MONGO_WRITE_BATCH_SIZE) -> dict:
         """
-        Inserts a pandas DataFrame into the specified collection.
+        Idempotently writes a DataFrame: each row is inserted unless a
+        document with the same `key_field` already exists. Rows are sent in
+        unordered bulk_write batches of `batch_size`, backed by a unique index.
+
+        Returns the number of inserted documents, rows matching an existing
+        document, duplicates (repeated in the DataFrame or lost to a
+        concurrent writer) and the latency of every batch.
         """
         if not isinstance(dataframe, pd.DataFrame):
             raise TypeError("The 'dataframe' argument must be a pandas DataFrame.")
-            
+
+        report = {"inserted": 0, "matched": 0, "duplicates": 0, "batches": 0,
+                  "batch_latencies_ms": [], "inserted_keys": []}
+        if dataframe.empty:
+            return report
+
+        self.ensure_unique_index(collection_name, key_field)
         collection = self.get_collection(collection_name)
-        # Convert dataframe to a list of dictionaries (records)
-        records = dataframe.to_dict('records')
-        
-        if records:
-            collection.insert_many(records)
-            print(f"Successfully inserted {len(records)} records into '{collection_name}'.")
-        else:
-            print("DataFrame is empty, nothing to insert.")
 
-    def find(self, collection_name: str, query: dict = None):
+        unique_rows = dataframe.drop_duplicates(subset=[key_field])
+        report["duplicates"] += len(dataframe) - len(unique_rows)
+        records = unique_rows.to_dict('records')
+
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
+            operations = [
+                UpdateOne({key_field: record[key_field]},
+                          {"$setOnInsert": {k: v for k, v in record.items() if k != key_field}},
+                          upsert=True)
+                for record in batch
+            ]
+
+            metrics = get_metrics()
+            started = time.perf_counter()
+            try:
+                result = collection.bulk_write(operations, ordered=False)
+                upserted = result.upserted_ids
+                matched = result.matched_count
+            except BulkWriteError as e:
+                errors = e.details.get("writeErrors", [])
+                if any(error.get("code") != DUPLICATE_KEY_ERROR for error in errors):
+                    raise
+                # Upsert races with another writer end in duplicate key errors
+                upserted = {item["index"]: item["_id"] for item in e.details.get("upserted", [])}
+                matched = e.details.get("nMatched", 0)
+                report["duplicates"] += len(errors)
+                metrics.inc("mongo_write_conflicts_total", len(errors), collection=collection_name)
+
+            latency = time.perf_counter() - started
+            metrics.observe("mongo_batch_seconds", latency, collection=collection_name)
+            metrics.inc("mongo_batch_documents_total", len(batch), collection=collection_name)
+            report["batch_latencies_ms"].append(round(latency * 1000, 2))
+            report["batches"] += 1
+            report["inserted"] += len(upserted)
+            report["matched"] += matched
+            report["inserted_keys"].extend(batch[index][key_field] for index in upserted)
+
+        return report
+
+    def find(self, collection_name: str, query: dict = None, projection: dict = None,
+             sort: list = None, limit: int = 0):
         """
         Finds documents in a collection and returns them as a pandas DataFrame.
+        `projection` limits the fields that are sent back, `sort` and `limit`
+        the documents.
         """
         if query is None:
             query = {} # Find all documents if no query is provided
             
         collection = self.get_collection(collection_name)
-        cursor = collection.find(query)
+        cursor = collection.find(query, projection, sort=sort, limit=limit)
         df = pd.DataFrame(list(cursor))
         
         # MongoDB adds an '_id' column by default, you may want to remove it
         if '_id' in df.columns:
             df = df.drop(columns=['_id'])
             
-        return df
\ No newline at end of file
+        return df
+
+    def aggregate(self, collection_name: str, pipeline: list) -> list:
+        """Runs an aggregation pipeline on the server and returns the result documents."""
+        return list(self.get_collection(collection_name).aggregate(pipeline))
@@ -0,0 +1,36 @@
+import hashlib
+
+import pandas as pd
+
+from src.schema import PLACEHOLDERS, parse_review_date, parse_text
+
+
+def review_fingerprint(product_name, name, date, comment) -> str:
+    """
+    Stable id of one review: product, reviewer, date and a hash of the
+    comment. Whitespace and case of the comment, and whether the date is a
+    string or a datetime, and whether a missing value is null or the
+    scraper's placeholder text, do not change the fingerprint.
+    """
+    if parse_text(name) is None:
+        name = PLACEHOLDERS["Name"]
+    if parse_text(comment) is None:
+        comment = PLACEHOLDERS["Comment"]
+    if parse_text(date) is None:
+        date = PLACEHOLDERS["Date"]
+    parsed_date = parse_review_date(date)
+    date_key = parsed_date.strftime("%Y-%m-%d") if parsed_date else str(date).strip()
+    comment_key = " ".join(str(comment).split()).lower()
+    comment_hash = hashlib.sha1(comment_key.encode("utf-8")).hexdigest()
+    key = "\x1f".join([str(product_name).strip(), str(name).strip(), date_key, comment_hash])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def review_fingerprints(reviews: pd.DataFrame) -> pd.Series:
+    """Fingerprint of every row of a reviews DataFrame."""
+    return pd.Series(
+        [review_fingerprint(*row) for row in zip(reviews["Product Name"], reviews["Name"],
+                                                 reviews["Date"], reviews["Comment"])],
+        index=reviews.index,
+        dtype="object",
+    )
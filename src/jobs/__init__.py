@@ -0,0 +1,244 @@
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from src.constants import JOB_DB_PATH, JOB_METRICS_FILE, JOB_RESULTS_DIR, JOB_WORKERS
+from src.exceptions import CustomException
+from src.jobs.store import JobStore
+from src.local_store import ReviewStore
+from src.metrics import get_metrics, write_snapshot
+from src.schema import empty_reviews
+
+
+def _pid_alive(pid) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except OSError:
+        return False
+    return True
+
+
+def run_job(db_path: str, results_dir: str, job_id: str) -> str:
+    """
+    Runs one scrape job in a worker process and returns its final status.
+
+    Every product is appended to the job's own Parquet store (the job
+    result) and, unless disabled in the job options, stored in MongoDB;
+    when storing fails the scrape goes on and the job ends with the error.
+    Progress is written to the job store after every product, which is
+    also when a cancellation takes effect, together with the job's metrics
+    snapshot (see JobQueue.metrics).
+    """
+    # Imported here so the app process does not load Selenium for the queue
+    from src.scrapper.scrape import ScrapeReviews, from_checkpoint
+
+    store = JobStore(db_path)
+    if not store.start(job_id):
+        return store.get(job_id)["status"]
+    # A worker process runs one job at a time, so its metrics are this job's
+    get_metrics().reset()
+    metrics_path = os.path.join(results_dir, job_id, JOB_METRICS_FILE)
+    job = store.get(job_id)
+    options = dict(job["options"])
+    store_mongo = options.pop("store_mongo", True)
+    incremental = options.pop("incremental", False)
+
+    products_done = reviews = stored = 0
+    store_error = None
+    try:
+        mongoio = None
+        if store_mongo or incremental:
+            from src.cloud_io import MongoIO
+            try:
+                mongoio = MongoIO()
+            except Exception as e:
+                if incremental:
+                    raise
+                # The scrape is still worth having without MongoDB; see JobQueue.results
+                store_error = e
+        if incremental:
+            options["seen_reviews"] = lambda title: mongoio.get_review_watermark(
+                job["product_name"], title)
+
+        # The metrics file is skipped by the Parquet reader (leading underscore)
+        results = ReviewStore(os.path.join(results_dir, job_id))
+        # Checkpoints keyed by the job id: a resumed job picks up its own, and
+        # jobs for the same search do not share them
+        scrapper = ScrapeReviews(product_name=job["product_name"],
+                                 no_of_products=job["no_of_products"], run_id=job_id, **options)
+        batches = scrapper.iter_review_data()
+        try:
+            for batch in batches:
+                # A resumed job already wrote the products restored from its checkpoints
+                if not from_checkpoint(batch):
+                    results.write(job["product_name"], batch)
+                if store_mongo and store_error is None and not batch.empty:
+                    try:
+                        stored += mongoio.store_reviews(product_name=job["product_name"],
+                                                        reviews=batch)["inserted"]
+                    except Exception as e:
+                        store_error = e
+                products_done += 1
+                reviews += len(batch)
+                store.progress(job_id, products_done, reviews, stored)
+                write_snapshot(metrics_path)
+                if store.cancel_requested(job_id):
+                    # A cancelled job is never resumed
+                    scrapper.clear_checkpoints()
+                    store.finish(job_id, JobStore.CANCELLED,
+                                 error=None if store_error is None else f"MongoDB: {store_error}")
+                    return JobStore.CANCELLED
+        finally:
+            batches.close()
+
+        # A finished job with an error could scrape but not store its reviews
+        store.finish(job_id, JobStore.DONE,
+                     error=None if store_error is None else f"MongoDB: {store_error}")
+        return JobStore.DONE
+    except Exception as e:
+        store.finish(job_id, JobStore.FAILED, error=f"{e}\n{traceback.format_exc()}")
+        return JobStore.FAILED
+    finally:
+        if os.path.isdir(os.path.dirname(metrics_path)):
+            write_snapshot(metrics_path)
+
+
+class JobQueue:
+    """
+    Background scrape jobs, run by a bounded pool of worker processes.
+
+    Jobs outlive the Streamlit script run (and browser session) that
+    submitted them: their state is in the JobStore, and the UI polls
+    `status`. At most `workers` crawls, each with its own browsers, run at
+    the same time; further jobs wait in the queue. Jobs left queued or
+    running by a previous app process are resumed, picking up their
+    scrape checkpoints.
+    """
+
+    def __init__(self, db_path: str = JOB_DB_PATH, results_dir: str = JOB_RESULTS_DIR,
+                 workers: int = JOB_WORKERS):
+        self.db_path = db_path
+        self.results_dir = results_dir
+        self.store = JobStore(db_path)
+        self.workers = max(1, int(workers))
+        self.executor = self._new_executor()
+        self._futures = {}
+        for job in self.store.unfinished():
+            if job["status"] == JobStore.RUNNING and _pid_alive(job["worker_pid"]):
+                continue
+            self.store.requeue(job["id"])
+            self._enqueue(job["id"])
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # Spawned workers do not inherit the app's threads, event loop or browsers
+        return ProcessPoolExecutor(max_workers=self.workers,
+                                   mp_context=multiprocessing.get_context("spawn"))
+
+    def _enqueue(self, job_id: str):
+        try:
+            future = self.executor.submit(run_job, self.db_path, self.results_dir, job_id)
+        except BrokenProcessPool:
+            # A worker process died (e.g. killed for using too much memory), which
+            # breaks the whole pool; its jobs fail in `status`, new ones get a new pool
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = self._new_executor()
+            future = self.executor.submit(run_job, self.db_path, self.results_dir, job_id)
+        self._futures[job_id] = future
+
+    def _check_future(self, job: dict) -> dict:
+        """Marks an unfinished job failed when its worker is gone, e.g. a broken pool."""
+        future = self._futures.get(job["id"])
+        if (job["status"] in JobStore.FINISHED or future is None
+                or not future.done() or future.cancelled()):
+            return job
+        error = future.exception()
+        if error is None:
+            return job
+        self.store.finish(job["id"], JobStore.FAILED, error=f"Worker process failed: {error!r}")
+        return self.store.get(job["id"])
+
+    def submit(self, product_name: str, no_of_products: int, **options) -> str:
+        """
+        Queues a scrape and returns its job id. `options` are ScrapeReviews
+        keyword arguments (JSON values only), plus `incremental` and
+        `store_mongo` (default True).
+        """
+        try:
+            job_id = self.store.create(product_name, no_of_products, options)
+            self._enqueue(job_id)
+            return job_id
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def status(self, job_id: str):
+        """
+        The job record plus `eta_seconds` (from the time per finished
+        product so far) and `queue_position` for queued jobs; None for an
+        unknown id. A job whose worker process died is marked failed here.
+        """
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        job = self._check_future(job)
+        job["eta_seconds"] = None
+        job["queue_position"] = None
+        if job["status"] == JobStore.RUNNING and job["products_done"]:
+            elapsed = time.time() - job["started_at"]
+            remaining = max(0, job["no_of_products"] - job["products_done"])
+            job["eta_seconds"] = elapsed / job["products_done"] * remaining
+        elif job["status"] == JobStore.QUEUED:
+            queued = [other["id"] for other in self.store.unfinished()
+                      if other["status"] == JobStore.QUEUED]
+            job["queue_position"] = queued.index(job_id) + 1 if job_id in queued else None
+        return job
+
+    def list(self, limit: int = 20) -> list:
+        return self.store.list(limit)
+
+    def cancel(self, job_id: str):
+        self.store.request_cancel(job_id)
+        future = self._futures.get(job_id)
+        if future is not None:
+            future.cancel()
+
+    def results(self, job_id: str) -> pd.DataFrame:
+        """Typed reviews scraped by a job so far (complete once it is done)."""
+        directory = os.path.join(self.results_dir, job_id)
+        if not os.path.isdir(directory):
+            return empty_reviews()
+        return ReviewStore(directory).read_reviews()
+
+    def metrics(self, job_id: str):
+        """Metrics snapshot of a job (src/metrics.py), None before its first product."""
+        path = os.path.join(self.results_dir, job_id, JOB_METRICS_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as metrics_file:
+            return json.load(metrics_file)
+
+    def delete_results(self, job_id: str):
+        shutil.rmtree(os.path.join(self.results_dir, job_id), ignore_errors=True)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """One job queue (and worker pool) per app process."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
@@ -0,0 +1,134 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+
+class JobStore:
+    """
+    State of background scrape jobs in a local SQLite file, shared by the
+    app and the worker processes.
+
+    A job moves from queued to running and ends as done, failed or
+    cancelled. Workers record their progress (products done, reviews so
+    far) after every product, and check `cancel_requested` in between.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    FINISHED = (DONE, FAILED, CANCELLED)
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                   id TEXT PRIMARY KEY,
+                   product_name TEXT NOT NULL,
+                   no_of_products INTEGER NOT NULL,
+                   options TEXT NOT NULL,
+                   status TEXT NOT NULL,
+                   cancel_requested INTEGER NOT NULL DEFAULT 0,
+                   products_done INTEGER NOT NULL DEFAULT 0,
+                   reviews INTEGER NOT NULL DEFAULT 0,
+                   stored INTEGER NOT NULL DEFAULT 0,
+                   worker_pid INTEGER,
+                   error TEXT,
+                   submitted_at REAL NOT NULL,
+                   started_at REAL,
+                   updated_at REAL NOT NULL,
+                   finished_at REAL)"""
+        )
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            con = sqlite3.connect(self.path, timeout=30)
+            con.row_factory = sqlite3.Row
+            try:
+                with con:
+                    return con.execute(sql, params).fetchall()
+            finally:
+                con.close()
+
+    def create(self, product_name: str, no_of_products: int, options: dict = None) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        self._execute(
+            """INSERT INTO jobs (id, product_name, no_of_products, options, status,
+                                 submitted_at, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (job_id, product_name, int(no_of_products), json.dumps(options or {}),
+             self.QUEUED, now, now),
+        )
+        return job_id
+
+    def get(self, job_id: str):
+        """The job as a dict (options decoded), or None."""
+        rows = self._execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        if not rows:
+            return None
+        job = dict(rows[0])
+        job["options"] = json.loads(job["options"])
+        return job
+
+    def list(self, limit: int = 20) -> list:
+        rows = self._execute("SELECT id FROM jobs ORDER BY submitted_at DESC LIMIT ?", (limit,))
+        return [self.get(row["id"]) for row in rows]
+
+    def unfinished(self) -> list:
+        rows = self._execute("SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY submitted_at",
+                             (self.QUEUED, self.RUNNING))
+        return [self.get(row["id"]) for row in rows]
+
+    def start(self, job_id: str) -> bool:
+        """Marks a queued job as running in this process; False if it was cancelled."""
+        now = time.time()
+        self._execute(
+            """UPDATE jobs SET status = ?, worker_pid = ?, started_at = ?, updated_at = ?
+               WHERE id = ? AND status = ? AND cancel_requested = 0""",
+            (self.RUNNING, os.getpid(), now, now, job_id, self.QUEUED),
+        )
+        job = self.get(job_id)
+        return job is not None and job["status"] == self.RUNNING and job["worker_pid"] == os.getpid()
+
+    def progress(self, job_id: str, products_done: int, reviews: int, stored: int):
+        self._execute(
+            "UPDATE jobs SET products_done = ?, reviews = ?, stored = ?, updated_at = ? WHERE id = ?",
+            (products_done, reviews, stored, time.time(), job_id),
+        )
+
+    def finish(self, job_id: str, status: str, error: str = None):
+        now = time.time()
+        self._execute(
+            "UPDATE jobs SET status = ?, error = ?, updated_at = ?, finished_at = ? WHERE id = ?",
+            (status, error, now, now, job_id),
+        )
+
+    def requeue(self, job_id: str):
+        """Puts a job whose worker died back in the queue."""
+        self._execute(
+            "UPDATE jobs SET status = ?, worker_pid = NULL, updated_at = ? WHERE id = ?",
+            (self.QUEUED, time.time(), job_id),
+        )
+
+    def request_cancel(self, job_id: str):
+        """Cancels a queued job at once; a running one stops after its current product."""
+        now = time.time()
+        self._execute("UPDATE jobs SET cancel_requested = 1, updated_at = ? WHERE id = ?",
+                      (now, job_id))
+        self._execute(
+            "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?",
+            (self.CANCELLED, now, job_id, self.QUEUED),
+        )
+
+    def cancel_requested(self, job_id: str) -> bool:
+        rows = self._execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,))
+        return bool(rows and rows[0]["cancel_requested"])
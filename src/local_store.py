@@ -0,0 +1,132 @@
+import os
+import uuid
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.fingerprint import review_fingerprints
+from src.schema import REVIEW_COLUMNS, REVIEW_DTYPES, product_id, type_reviews
+
+
+class ReviewStore:
+    """
+    Local columnar store of scraped reviews.
+
+    Reviews are written as Parquet files partitioned by product and scrape
+    date (``product=<product id>/scrape_date=YYYY-MM-DD/part-<uuid>.parquet``).
+    Every write adds a new file, so concurrent scrapes never overwrite each
+    other and earlier runs are kept. `read` selects columns and prunes
+    partitions and row groups with the given filters.
+    """
+
+    PARTITIONING = ds.partitioning(
+        pa.schema([("product", pa.string()), ("scrape_date", pa.string())]),
+        flavor="hive",
+    )
+    SCHEMA = pa.schema([
+        ("search", pa.string()),
+        ("review_id", pa.string()),
+        ("Product Name", pa.string()),
+        ("Over_All_Rating", pa.float64()),
+        ("Price", pa.float64()),
+        ("Date", pa.timestamp("us")),
+        ("Rating", pa.float32()),
+        ("Name", pa.string()),
+        ("Comment", pa.string()),
+        ("scraped_at", pa.timestamp("us")),
+    ])
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, search: str, reviews: pd.DataFrame) -> list:
+        """Appends the reviews of one scrape; returns the files written."""
+        if reviews.empty:
+            return []
+        reviews = type_reviews(reviews).reset_index(drop=True)
+        scraped_at = datetime.now()
+        data = reviews.assign(
+            search=search,
+            review_id=review_fingerprints(reviews),
+            scraped_at=scraped_at,
+        )
+        data["Product Name"] = data["Product Name"].astype(object)
+        data["product"] = [product_id(title) for title in data["Product Name"]]
+
+        paths = []
+        for product, rows in data.groupby("product", sort=False):
+            directory = os.path.join(self.directory, f"product={product}",
+                                     f"scrape_date={scraped_at.date().isoformat()}")
+            os.makedirs(directory, exist_ok=True)
+            name = f"part-{uuid.uuid4().hex}.parquet"
+            path = os.path.join(directory, name)
+            tmp_path = os.path.join(directory, f".{name}.tmp")
+            table = pa.Table.from_pandas(rows[self.SCHEMA.names], schema=self.SCHEMA,
+                                         preserve_index=False)
+            # Write then rename, so readers (which skip dot files) never see half a file
+            pq.write_table(table, tmp_path, compression="zstd")
+            os.replace(tmp_path, path)
+            paths.append(path)
+        return paths
+
+    def read(self, columns: list = None, products: list = None, search: str = None,
+             since=None, until=None, filter=None) -> pd.DataFrame:
+        """
+        Reviews in the store as a DataFrame.
+
+        `columns` selects columns (all by default). `products` (product
+        titles) and `since`/`until` (scrape dates, as dates or a number of
+        days back) only open the matching partitions; `search` and `filter`
+        (a pyarrow.dataset expression, e.g. ``ds.field("Rating") <= 2``)
+        are pushed down to the Parquet reader.
+        """
+        if not any(name.startswith("product=") for name in os.listdir(self.directory)):
+            return pd.DataFrame(columns=columns or self._dataset_schema().names)
+
+        dataset = ds.dataset(self.directory, format="parquet", schema=self._dataset_schema(),
+                             partitioning=self.PARTITIONING)
+        expression = filter
+        if products is not None:
+            expression = self._and(expression, ds.field("product").isin(
+                [product_id(title) for title in products]))
+        if search is not None:
+            expression = self._and(expression, ds.field("search") == search)
+        if since is not None:
+            expression = self._and(expression, ds.field("scrape_date") >= self._day(since))
+        if until is not None:
+            expression = self._and(expression, ds.field("scrape_date") <= self._day(until))
+
+        data = dataset.to_table(columns=columns, filter=expression).to_pandas()
+        if "Product Name" in data.columns:
+            data["Product Name"] = data["Product Name"].astype(REVIEW_DTYPES["Product Name"])
+        if "Date" in data.columns:
+            data["Date"] = data["Date"].astype(REVIEW_DTYPES["Date"])
+        return data
+
+    def read_reviews(self, **filters) -> pd.DataFrame:
+        """
+        Typed review frame (the scraper's columns) of the matching reviews,
+        each review once even when several scrapes stored it.
+        """
+        data = self.read(columns=["review_id", *REVIEW_COLUMNS], **filters)
+        data = data.drop_duplicates(subset=["review_id"], keep="last")
+        return type_reviews(data).reset_index(drop=True)
+
+    def _dataset_schema(self) -> pa.Schema:
+        return pa.schema(list(self.SCHEMA) + list(self.PARTITIONING.schema))
+
+    @staticmethod
+    def _and(expression, condition):
+        return condition if expression is None else expression & condition
+
+    @staticmethod
+    def _day(value) -> str:
+        if isinstance(value, (int, float)):
+            value = date.today() - timedelta(days=value)
+        if isinstance(value, datetime):
+            value = value.date()
+        return value.isoformat() if isinstance(value, date) else str(value)
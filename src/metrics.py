@@ -0,0 +1,185 @@
+"""
+Timers and counters of the scrape and storage pipeline.
+
+One registry per process (`get_metrics()`) collects counters and summaries
+(count, sum and max of observed values such as page-load seconds), keyed by
+metric name and labels. It exports in the Prometheus text format and, when
+METRICS_LOG_PATH is set, also writes every observation as a JSON log line.
+
+    with get_metrics().timer("scrape_page_load_seconds", page="product"):
+        driver.get(url)
+    get_metrics().inc("scrape_browser_fallbacks_total")
+"""
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from src.constants import METRICS_LOG_PATH
+
+DESCRIPTIONS = {
+    "scrape_pages_total": "Pages loaded from the site (not the page cache), by page type.",
+    "scrape_page_load_seconds": "Time to load a page, by page type and source (http, browser).",
+    "scrape_page_bytes": "Size of the loaded page HTML in bytes, by page type.",
+    "scrape_cache_requests_total": "Page cache lookups, by result (hit, miss).",
+    "scrape_browser_fallbacks_total": "Pages the HTTP fetcher could not render, loaded in Chrome instead.",
+    "scrape_parse_seconds": "Time to parse a page, by page type.",
+    "scrape_scroll_iterations_total": "Scroll steps on review pages.",
+    "scrape_scroll_wait_seconds": "Time spent waiting for reviews to load after scrolling.",
+    "scrape_scroll_stops_total": "Review pages by the reason scrolling stopped.",
+    "scrape_product_seconds": "Time to scrape one product (product and review page).",
+    "scrape_reviews_per_product": "Reviews scraped per product.",
+    "scrape_product_failures_total": "Products skipped because scraping them failed.",
+    "mongo_batch_seconds": "Latency of one bulk_write batch, by collection.",
+    "mongo_batch_documents_total": "Documents sent in bulk_write batches, by collection.",
+    "mongo_write_conflicts_total": "Upserts lost to a concurrent writer (duplicate key errors).",
+    "mongo_command_failures_total": "Failed MongoDB commands (retried when retryable), by command.",
+    "mongo_store_seconds": "Time of one MongoIO.store_reviews call.",
+    "mongo_reviews_inserted_total": "Reviews newly inserted by store_reviews.",
+    "mongo_search_seconds": "Time of one MongoIO.search_reviews query.",
+    "crawl_retries_total": "Searches retried by the batch crawl after a failure.",
+}
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Metrics:
+    """Thread-safe counters and summaries; see the module docstring."""
+
+    def __init__(self, log_path: str = METRICS_LOG_PATH):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._summaries = {}
+        self._logger = None
+        if log_path:
+            self._logger = logging.getLogger(f"{__name__}.{id(self)}")
+            self._logger.propagate = False
+            self._logger.setLevel(logging.INFO)
+            handler = (logging.StreamHandler(sys.stderr) if log_path == "-"
+                       else logging.FileHandler(log_path, encoding="utf-8"))
+            self._logger.addHandler(handler)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            summary = self._summaries.setdefault(key, [0, 0.0, value])
+            summary[0] += 1
+            summary[1] += value
+            summary[2] = max(summary[2], value)
+        self.log(name, value=value, **labels)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observes the seconds spent in the block, also when it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def log(self, event: str, **fields):
+        """Writes one JSON log line (when logging is enabled)."""
+        if self._logger is not None:
+            self._logger.info(json.dumps({"ts": round(time.time(), 3), "pid": os.getpid(),
+                                          "event": event, **fields}, default=str))
+
+    def snapshot(self) -> dict:
+        """All values as JSON-serializable lists of counters and summaries."""
+        with self._lock:
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self._counters.items())]
+            summaries = [{"name": name, "labels": dict(labels), "count": count,
+                          "sum": total, "max": maximum}
+                         for (name, labels), (count, total, maximum)
+                         in sorted(self._summaries.items())]
+        return {"counters": counters, "summaries": summaries}
+
+    def to_prometheus(self) -> str:
+        return prometheus_text(self.snapshot())
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def prometheus_text(snapshot: dict) -> str:
+    """A `Metrics.snapshot()` in the Prometheus text exposition format."""
+    lines = []
+    described = set()
+
+    def header(name: str, kind: str):
+        if name in described:
+            return
+        described.add(name)
+        if name in DESCRIPTIONS:
+            lines.append(f"# HELP {name} {DESCRIPTIONS[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    for counter in snapshot["counters"]:
+        header(counter["name"], "counter")
+        lines.append(f"{counter['name']}{_labels(counter['labels'])} {counter['value']}")
+    for summary in snapshot["summaries"]:
+        name = summary["name"]
+        header(name, "summary")
+        lines.append(f"{name}_count{_labels(summary['labels'])} {summary['count']}")
+        lines.append(f"{name}_sum{_labels(summary['labels'])} {summary['sum']}")
+    # Summaries have no max, so it is a gauge of its own
+    for summary in snapshot["summaries"]:
+        name = f"{summary['name']}_max"
+        header(name, "gauge")
+        lines.append(f"{name}{_labels(summary['labels'])} {summary['max']}")
+    return "\n".join(lines) + "\n"
+
+
+def summary_table(snapshot: dict) -> list:
+    """Summaries as rows with their mean; timers first, largest total (where time goes) first."""
+    rows = [{"metric": summary["name"],
+             "labels": ", ".join(f"{key}={value}" for key, value in summary["labels"].items()),
+             "count": summary["count"], "sum": round(summary["sum"], 4),
+             "mean": round(summary["sum"] / summary["count"], 4) if summary["count"] else None,
+             "max": round(summary["max"], 4)}
+            for summary in snapshot["summaries"]]
+    return sorted(rows, key=lambda row: (not row["metric"].endswith("_seconds"), -row["sum"]))
+
+
+def write_snapshot(path: str, snapshot: dict = None):
+    """Writes a snapshot (of this process by default) as JSON, atomically."""
+    snapshot = get_metrics().snapshot() if snapshot is None else snapshot
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as snapshot_file:
+        json.dump(snapshot, snapshot_file)
+    os.replace(tmp_path, path)
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> Metrics:
+    """One metrics registry per process."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+        return _metrics
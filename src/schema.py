@@ -0,0 +1,148 @@
+import hashlib
+import re
+from datetime import datetime
+
+import pandas as pd
+
+
+# Columns of the review DataFrames produced by the scraper
+REVIEW_COLUMNS = [
+    "Product Name",
+    "Over_All_Rating",
+    "Price",
+    "Date",
+    "Rating",
+    "Name",
+    "Comment",
+]
+
+REVIEW_DATE_FORMAT: str = "%d %b %Y"  # e.g. "2 Oct 2025" as shown on myntra.com
+
+# Text the scraper puts in place of a missing value; typed frames hold nulls instead
+PLACEHOLDERS = {
+    "Date": "No Date given",
+    "Rating": "No rating Given",
+    "Name": "No Name given",
+    "Comment": "No comment Given",
+}
+
+# Column types of a typed review frame (see `type_reviews`)
+REVIEW_DTYPES = {
+    "Product Name": "category",
+    "Over_All_Rating": "float64",
+    "Price": "float64",
+    "Date": "datetime64[ns]",
+    "Rating": "float32",
+    "Name": "object",
+    "Comment": "object",
+}
+
+_number = re.compile(r"[\d.]+")
+
+
+def _missing(value) -> bool:
+    return value is None or (not isinstance(value, str) and pd.isna(value))
+
+
+def parse_review_date(date):
+    """Review date as a datetime, or None when it is missing or not a date."""
+    if _missing(date):
+        return None
+    if hasattr(date, "to_pydatetime"):
+        return date.to_pydatetime()
+    if isinstance(date, datetime):
+        return date
+    date = str(date).strip()
+    try:
+        return datetime.strptime(date, REVIEW_DATE_FORMAT)
+    except ValueError:
+        pass
+    try:
+        # ISO dates, as written by typed frames to CSV and JSON
+        return datetime.fromisoformat(date)
+    except ValueError:
+        return None
+
+
+def parse_rating(rating):
+    """Rating such as "4.3" or "5" as a float; placeholders like "No rating Given" become None."""
+    if _missing(rating):
+        return None
+    if isinstance(rating, (int, float)):
+        return float(rating)
+    match = _number.search(str(rating))
+    return float(match.group()) if match else None
+
+
+def parse_price(price):
+    """Price such as "₹1,299" as 1299.0; None when there is no price."""
+    if _missing(price):
+        return None
+    if isinstance(price, (int, float)):
+        return float(price)
+    digits = str(price).replace("₹", "").replace(",", "").strip()
+    match = _number.search(digits)
+    return float(match.group()) if match else None
+
+
+def parse_text(text, placeholder: str = None):
+    """Stripped text, or None for a missing value or the scraper's placeholder."""
+    if _missing(text):
+        return None
+    text = str(text)
+    return None if placeholder is not None and text == placeholder else text
+
+
+def product_id(product_title: str) -> str:
+    """Stable id of a product, derived from its page title."""
+    return hashlib.sha1(str(product_title).strip().encode("utf-8")).hexdigest()[:16]
+
+
+def _typed_column(column: pd.Series, name: str) -> pd.Series:
+    if name == "Product Name":
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            return column
+        return column.astype("category")
+
+    if name == "Date":
+        if pd.api.types.is_datetime64_any_dtype(column):
+            return column.astype(REVIEW_DTYPES[name])
+        dates = pd.to_datetime(column, format=REVIEW_DATE_FORMAT, errors="coerce")
+        # Anything else that is not null (e.g. ISO dates) is parsed one by one
+        retry = dates.isna() & column.notna() & (column != PLACEHOLDERS["Date"])
+        if retry.any():
+            dates[retry] = pd.to_datetime(
+                pd.Series([parse_review_date(d) for d in column[retry]], index=column[retry].index,
+                          dtype=object))
+        return dates.astype(REVIEW_DTYPES[name])
+
+    if name in ("Over_All_Rating", "Rating", "Price"):
+        if pd.api.types.is_numeric_dtype(column):
+            return column.astype(REVIEW_DTYPES[name])
+        parse = parse_price if name == "Price" else parse_rating
+        values = [parse(value) for value in column]
+        return pd.Series([float("nan") if value is None else value for value in values],
+                         index=column.index, dtype=REVIEW_DTYPES[name])
+
+    # Text: nulls instead of the placeholder
+    keep = column.notna()
+    if name in PLACEHOLDERS:
+        keep &= column != PLACEHOLDERS[name]
+    return column.astype(object).where(keep, None)
+
+
+def type_reviews(reviews: pd.DataFrame) -> pd.DataFrame:
+    """
+    Review frame with the REVIEW_DTYPES column types: numeric ratings and
+    price, datetime dates, categorical product names and nulls instead of
+    placeholder text. Columns that already have their type are kept as they
+    are, so typing an already typed frame is cheap.
+    """
+    reviews = reviews.reindex(columns=REVIEW_COLUMNS)
+    return pd.DataFrame({name: _typed_column(reviews[name], name) for name in REVIEW_COLUMNS},
+                        index=reviews.index)
+
+
+def empty_reviews() -> pd.DataFrame:
+    """Typed review frame without rows."""
+    return pd.DataFrame({name: pd.Series(dtype=dtype) for name, dtype in REVIEW_DTYPES.items()})
@@ -0,0 +1,130 @@
+import atexit
+import os
+import threading
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from src.constants import (BROWSER_BLOCKED_URLS, BROWSER_PROFILE,
+                           BROWSER_USER_DATA_DIR, BROWSER_WARM_MAX)
+
+
+# Idle, still running browsers that the next scrape can reuse
+_warm_drivers = []
+# user-data-dir slots in use; two running Chromes can not share a profile directory
+_used_slots = set()
+_lock = threading.Lock()
+
+
+def chrome_options(profile: str = BROWSER_PROFILE, user_data_dir: str = None) -> Options:
+    options = Options()
+    if profile == "scrape":
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--mute-audio")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+        # driver.get returns at DOMContentLoaded instead of waiting for every resource
+        options.page_load_strategy = "eager"
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+    return options
+
+
+def launch_driver(profile: str = BROWSER_PROFILE, user_data_dir: str = None):
+    driver = webdriver.Chrome(options=chrome_options(profile, user_data_dir))
+    if profile == "scrape":
+        # Requests are dropped before they leave the browser
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BROWSER_BLOCKED_URLS})
+    return driver
+
+
+def _is_alive(driver) -> bool:
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    with _lock:
+        _used_slots.discard(getattr(driver, "_user_data_slot", None))
+
+
+def acquire_driver(profile: str = BROWSER_PROFILE, user_data_dir: str = BROWSER_USER_DATA_DIR):
+    """Returns a warm browser of `profile` when one is idle, otherwise launches one."""
+    while True:
+        with _lock:
+            candidates = [d for d in _warm_drivers
+                          if getattr(d, "_scrape_profile", None) == profile]
+            driver = candidates[0] if candidates else None
+            if driver is not None:
+                _warm_drivers.remove(driver)
+        if driver is None:
+            break
+        if _is_alive(driver):
+            return driver
+        _quit(driver)
+
+    slot = None
+    profile_dir = None
+    if user_data_dir:
+        with _lock:
+            slot = min(set(range(len(_used_slots) + 1)) - _used_slots)
+            _used_slots.add(slot)
+        profile_dir = os.path.join(user_data_dir, f"worker-{slot}")
+
+    try:
+        driver = launch_driver(profile, profile_dir)
+    except Exception:
+        with _lock:
+            _used_slots.discard(slot)
+        raise
+    driver._scrape_profile = profile
+    driver._user_data_slot = slot
+    return driver
+
+
+def release_driver(driver):
+    """
+    Keeps a healthy browser from acquire_driver warm for the next scrape.
+    Unhealthy browsers, and those launched elsewhere, are quit.
+    """
+    if getattr(driver, "_scrape_profile", None) is None:
+        _quit(driver)
+        return
+    try:
+        driver.get("about:blank")
+        healthy = True
+    except Exception:
+        healthy = False
+
+    with _lock:
+        keep = healthy and len(_warm_drivers) < BROWSER_WARM_MAX
+        if keep:
+            _warm_drivers.append(driver)
+    if not keep:
+        _quit(driver)
+
+
+def shutdown_browsers():
+    with _lock:
+        drivers = list(_warm_drivers)
+        _warm_drivers.clear()
+    for driver in drivers:
+        _quit(driver)
+
+
+atexit.register(shutdown_browsers)
@@ -0,0 +1,53 @@
+"""
+JavaScript executed inside the review page through `driver.execute_script`.
+
+EXTRACT_REVIEWS_JS mirrors `src.scrapper.parser`: it reads the last reviews
+container, collects rating, comment and user nodes in one document-order
+query, pairs them by position and uses the same placeholder text. Only
+reviews from index `arguments[0]` onwards are returned, each as a compact
+[date, rating, name, comment] array, so the scroll loop can pick up new
+reviews after every step without re-sending the ones it already has.
+"""
+
+EXTRACT_REVIEWS_JS = """
+var start = arguments[0] || 0;
+var containers = document.querySelectorAll('div.detailed-reviews-userReviewsContainer');
+if (!containers.length) { return []; }
+var container = containers[containers.length - 1];
+var parts = container.querySelectorAll(
+    'div[class="user-review-main user-review-showRating"],' +
+    ' div.user-review-reviewTextWrapper, div.user-review-left');
+var ratings = [], comments = [], users = [];
+for (var i = 0; i < parts.length; i++) {
+    var node = parts[i];
+    if (node.getAttribute('class') === 'user-review-main user-review-showRating') {
+        ratings.push(node);
+    } else if (node.classList.contains('user-review-reviewTextWrapper')) {
+        comments.push(node);
+    } else {
+        users.push(node);
+    }
+}
+var records = [];
+for (var j = start; j < ratings.length; j++) {
+    var star = ratings[j].querySelector('span.user-review-starRating');
+    var spans = j < users.length ? users[j].querySelectorAll('span') : [];
+    records.push([
+        spans.length > 1 ? spans[1].textContent : 'No Date given',
+        star ? star.textContent.trim() : 'No rating Given',
+        spans.length > 0 ? spans[0].textContent : 'No Name given',
+        j < comments.length ? comments[j].textContent : 'No comment Given'
+    ]);
+}
+return records;
+"""
+
+REVIEW_RECORD_FIELDS = ("Date", "Rating", "Name", "Comment")
+
+# [rendered reviews, page height] - used to detect when a scroll loaded more reviews
+PAGE_PROGRESS_JS = """
+return [
+    document.querySelectorAll('div.detailed-reviews-userReviewsContainer div.user-review-main').length,
+    document.body.scrollHeight
+];
+"""
@@ -0,0 +1,120 @@
+import hashlib
+import os
+import struct
+import threading
+import time
+import zlib
+
+from src.constants import PAGE_CACHE_MAX_BYTES, PAGE_CACHE_TTL_SECONDS
+
+
+class CacheMissError(LookupError):
+    """Raised in replay mode when a page was never cached."""
+
+
+class PageCache:
+    """
+    Compressed on-disk cache of fetched pages.
+
+    Entries are stored under the SHA-256 of their key (the page URL) as
+    zlib-compressed files that start with the time they were written. An
+    entry expires `ttl` seconds after it was written; the file modification
+    time records the last read, and once the cache grows beyond `max_bytes`
+    the least recently used entries are deleted.
+    """
+
+    _header = struct.Struct("<d")
+
+    def __init__(self, directory: str, ttl: float = PAGE_CACHE_TTL_SECONDS,
+                 max_bytes: int = PAGE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(os.path.getsize(path) for path in self._entries())
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest[:2], digest + ".z")
+
+    def _entries(self):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".z"):
+                    yield os.path.join(root, name)
+
+    def get(self, key: str, max_age: float = -1):
+        """
+        Returns the cached text for `key`, or None. `max_age` overrides the
+        cache TTL; pass None to accept an entry of any age (replay).
+        """
+        max_age = self.ttl if max_age == -1 else max_age
+        path = self._path(key)
+        try:
+            with open(path, "rb") as entry:
+                data = entry.read()
+        except FileNotFoundError:
+            return None
+
+        (stored_at,) = self._header.unpack_from(data)
+        if max_age is not None and time.time() - stored_at > max_age:
+            return None
+        try:
+            # Mark as recently used for the LRU eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return zlib.decompress(data[self._header.size:]).decode("utf-8")
+
+    def put(self, key: str, text: str):
+        path = self._path(key)
+        data = self._header.pack(time.time()) + zlib.compress(text.encode("utf-8"), 6)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with self._lock:
+            try:
+                self._size -= os.path.getsize(path)
+            except OSError:
+                pass
+            # Write then rename, so readers never see half an entry
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as entry:
+                entry.write(data)
+            os.replace(tmp_path, path)
+            self._size += len(data)
+
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = []
+        for path in self._entries():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        self._size = sum(size for _, size, _ in entries)
+        # Least recently used first, down to 90% of the limit
+        for _, size, path in sorted(entries):
+            if self._size <= self.max_bytes * 0.9:
+                break
+            try:
+                os.remove(path)
+                self._size -= size
+            except OSError:
+                pass
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_page_cache(directory: str) -> PageCache:
+    """One PageCache per directory and process, so size accounting is shared."""
+    with _caches_lock:
+        if directory not in _caches:
+            _caches[directory] = PageCache(directory)
+        return _caches[directory]
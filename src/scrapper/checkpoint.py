@@ -0,0 +1,85 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from src.constants import CHECKPOINT_MAX_AGE_SECONDS
+
+
+class CheckpointStore:
+    """
+    Per-product scrape checkpoints in a local SQLite file.
+
+    Every finished product is recorded under (key, product_url) together
+    with its reviews, or as having no reviews; the key identifies one run
+    of a query (see ScrapeReviews.checkpoint_key). A rerun with the same
+    key reads those products back instead of scraping them again, so a
+    failed crawl resumes at the product that failed. Checkpoints older
+    than `max_age` seconds are never read and are dropped when the store
+    is opened.
+    """
+
+    DONE = "done"
+    NO_REVIEWS = "no_reviews"
+
+    def __init__(self, path: str, max_age: float = CHECKPOINT_MAX_AGE_SECONDS):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._execute(
+            """CREATE TABLE IF NOT EXISTS products (
+                   query TEXT NOT NULL,
+                   product_url TEXT NOT NULL,
+                   status TEXT NOT NULL,
+                   reviews TEXT,
+                   updated_at REAL NOT NULL,
+                   PRIMARY KEY (query, product_url))"""
+        )
+        self.purge_expired()
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        with self._lock:
+            con = sqlite3.connect(self.path, timeout=30)
+            try:
+                with con:
+                    return con.execute(sql, params).fetchall()
+            finally:
+                con.close()
+
+    def load(self, query: str, product_url: str, columns: list):
+        """
+        Returns (found, reviews): reviews is a DataFrame, or None when the
+        product was checkpointed without reviews.
+        """
+        rows = self._execute(
+            "SELECT status, reviews FROM products "
+            "WHERE query = ? AND product_url = ? AND updated_at >= ?",
+            (query, product_url, time.time() - self.max_age),
+        )
+        if not rows:
+            return False, None
+        status, reviews = rows[0]
+        if status == self.NO_REVIEWS:
+            return True, None
+        return True, pd.DataFrame(json.loads(reviews), columns=columns)
+
+    def save(self, query: str, product_url: str, reviews: pd.DataFrame = None):
+        status = self.NO_REVIEWS if reviews is None else self.DONE
+        payload = None if reviews is None else json.dumps(reviews.to_dict("records"), default=str)
+        self._execute(
+            "INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?)",
+            (query, product_url, status, payload, time.time()),
+        )
+
+    def clear(self, query: str):
+        self._execute("DELETE FROM products WHERE query = ?", (query,))
+
+    def purge_expired(self):
+        """Drops the checkpoints older than `max_age`, e.g. of runs that never finished."""
+        self._execute("DELETE FROM products WHERE updated_at < ?", (time.time() - self.max_age,))
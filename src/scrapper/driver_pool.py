@@ -0,0 +1,72 @@
+import queue
+import threading
+
+
+class DriverPool:
+    """
+    A bounded set of webdriver sessions shared by the scrape workers.
+
+    Drivers are created lazily through ``factory`` up to ``size`` and handed
+    out one per worker. ``close`` hands every driver the pool ever created to
+    ``dispose`` (``driver.quit()`` by default), so a failing worker never
+    leaks a Chrome process.
+    """
+
+    def __init__(self, size: int, factory, drivers: list = None, dispose=None):
+        self.size = max(1, int(size))
+        self.factory = factory
+        self.dispose = dispose or (lambda driver: driver.quit())
+        self._idle = queue.Queue()
+        self._drivers = []
+        self._created = 0
+        self._lock = threading.Lock()
+
+        for driver in (drivers or [])[: self.size]:
+            self._drivers.append(driver)
+            self._idle.put(driver)
+        self._created = len(self._drivers)
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        # Reserve a slot under the lock, launch the browser outside of it
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+
+        if not can_create:
+            return self._idle.get()
+
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+
+    def release(self, driver):
+        self._idle.put(driver)
+
+    def close(self):
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+
+        for driver in drivers:
+            try:
+                self.dispose(driver)
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
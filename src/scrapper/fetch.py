@@ -0,0 +1,86 @@
+import asyncio
+import atexit
+import threading
+
+import aiohttp
+
+from src.constants import HTTP_HEADERS, HTTP_POOL_SIZE, HTTP_TIMEOUT_SECONDS
+
+
+class HttpFetcher:
+    """
+    Browserless page fetcher backed by a pooled, keep-alive aiohttp session.
+
+    The session lives on its own event loop in a daemon thread, so the
+    blocking `fetch` / `fetch_many` calls can be made from any scrape worker
+    while every request shares the same connection pool.
+    """
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE,
+                 timeout: float = HTTP_TIMEOUT_SECONDS,
+                 headers: dict = None):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.headers = dict(HTTP_HEADERS if headers is None else headers)
+        self._session = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name="http-fetcher",
+                                        daemon=True)
+        self._thread.start()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.pool_size,
+                                             keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def _get(self, url: str):
+        session = await self._get_session()
+        try:
+            async with session.get(url) as response:
+                if response.status != 200:
+                    return None
+                return await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+
+    async def _get_many(self, urls: list) -> list:
+        return await asyncio.gather(*(self._get(url) for url in urls))
+
+    def fetch(self, url: str):
+        """Returns the page HTML, or None if the request failed."""
+        return asyncio.run_coroutine_threadsafe(self._get(url), self._loop).result()
+
+    def fetch_many(self, urls: list) -> list:
+        """Fetches all urls concurrently; results keep the order of `urls`."""
+        return asyncio.run_coroutine_threadsafe(self._get_many(list(urls)), self._loop).result()
+
+    def close(self):
+        if self._loop.is_closed():
+            return
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), self._loop).result()
+            self._session = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+_shared_fetcher = None
+_shared_lock = threading.Lock()
+
+
+def get_http_fetcher() -> HttpFetcher:
+    """Process-wide HttpFetcher, so Streamlit reruns reuse the same connections."""
+    global _shared_fetcher
+    with _shared_lock:
+        if _shared_fetcher is None:
+            _shared_fetcher = HttpFetcher()
+            atexit.register(_shared_fetcher.close)
+        return _shared_fetcher
@@ -0,0 +1,216 @@
+from bs4 import BeautifulSoup as bs
+
+from src.constants import HTML_PARSER
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml is optional, BeautifulSoup is always available
+    lxml = None
+
+
+RATING_CLASS = "user-review-main user-review-showRating"
+COMMENT_CLASS = "user-review-reviewTextWrapper"
+USER_CLASS = "user-review-left"
+
+
+def _build_reviews(ratings: list, comments: list, users: list, text, first, nth) -> list:
+    """
+    Turns the rating/comment/user nodes of a reviews container into records.
+
+    Fields are paired by position, exactly like the original three-scan
+    implementation did, and missing fields get the same placeholder text.
+    `text`, `first` and `nth` adapt the node API of the parser backend.
+    """
+    reviews = []
+    for i in range(len(ratings)):
+        star = first(ratings[i], "span", "user-review-starRating")
+        rating = text(star).strip() if star is not None else "No rating Given"
+        comment = text(comments[i]) if i < len(comments) else "No comment Given"
+
+        name, date = "No Name given", "No Date given"
+        if i < len(users):
+            name_span = nth(users[i], "span", 0)
+            date_span = nth(users[i], "span", 1)
+            if name_span is not None:
+                name = text(name_span)
+            if date_span is not None:
+                date = text(date_span)
+
+        reviews.append({"Date": date, "Rating": rating, "Name": name, "Comment": comment})
+    return reviews
+
+
+class BsParser:
+    """BeautifulSoup + html.parser backend (the original implementation)."""
+
+    name = "bs4"
+
+    def parse(self, page: str):
+        return bs(page, "html.parser")
+
+    def product_urls(self, page: str) -> list:
+        html = self.parse(page)
+        product_urls = []
+        for results in html.findAll("ul", {"class": "results-base"}):
+            for link in results.find_all("a", href=True):
+                product_urls.append(link["href"])
+        return product_urls
+
+    def product_details(self, page: str) -> dict:
+        html = self.parse(page)
+        details = {"title": html.findAll("title")[0].text,
+                   "rating": None,
+                   "price": None,
+                   "reviews_href": None}
+
+        for rating in html.findAll("div", {"class": "index-overallRating"}):
+            inner = rating.find("div")
+            details["rating"] = inner.text if inner is not None else None
+        for price in html.findAll("span", {"class": "pdp-price"}):
+            details["price"] = price.text
+        all_reviews = html.find("a", {"class": "detailed-reviews-allReviews"})
+        if all_reviews:
+            details["reviews_href"] = all_reviews["href"]
+        return details
+
+    @staticmethod
+    def _review_kind(tag):
+        """Mirrors BeautifulSoup's class matching: the rating needs the exact class string."""
+        classes = tag.get("class")
+        if tag.name != "div" or not classes:
+            return None
+        if " ".join(classes) == RATING_CLASS:
+            return RATING_CLASS
+        if COMMENT_CLASS in classes:
+            return COMMENT_CLASS
+        if USER_CLASS in classes:
+            return USER_CLASS
+        return None
+
+    def reviews(self, page: str) -> list:
+        html = self.parse(page)
+        ratings, comments, users = [], [], []
+        # Only the last container counts, as in the original implementation
+        for container in html.findAll("div", {"class": "detailed-reviews-userReviewsContainer"}):
+            ratings, comments, users = [], [], []
+            # One traversal of the container collects all three kinds of node
+            for node in container.find_all(lambda tag: self._review_kind(tag) is not None):
+                kind = self._review_kind(node)
+                if kind == RATING_CLASS:
+                    ratings.append(node)
+                elif kind == COMMENT_CLASS:
+                    comments.append(node)
+                else:
+                    users.append(node)
+
+        def nth(node, tag, index):
+            found = node.find_all(tag, limit=index + 1)
+            return found[index] if len(found) > index else None
+
+        return _build_reviews(ratings, comments, users,
+                              text=lambda node: node.text,
+                              first=lambda node, tag, cls: node.find(tag, class_=cls),
+                              nth=nth)
+
+
+def _has_class(cls: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+class LxmlParser:
+    """lxml backend: C-level parsing and compiled XPath queries."""
+
+    name = "lxml"
+
+    _xpaths = None
+
+    def __init__(self):
+        if lxml is None:
+            raise ImportError("The 'lxml' parser backend requires the lxml package.")
+        if LxmlParser._xpaths is None:
+            LxmlParser._xpaths = {
+                "results_links": etree.XPath(f"//ul[{_has_class('results-base')}]//a[@href]"),
+                "title": etree.XPath("//title"),
+                "overall_rating": etree.XPath(f"//div[{_has_class('index-overallRating')}]"),
+                "price": etree.XPath(f"//span[{_has_class('pdp-price')}]"),
+                "all_reviews": etree.XPath(f"//a[{_has_class('detailed-reviews-allReviews')}]"),
+                "containers": etree.XPath(
+                    f"//div[{_has_class('detailed-reviews-userReviewsContainer')}]"),
+                # One evaluation returns every review part in document order
+                "review_parts": etree.XPath(
+                    f".//div[@class='{RATING_CLASS}' or {_has_class(COMMENT_CLASS)}"
+                    f" or {_has_class(USER_CLASS)}]"),
+            }
+        self.xpath = LxmlParser._xpaths
+
+    def parse(self, page):
+        if isinstance(page, str):
+            page = page.encode("utf-8")
+        return lxml.html.fromstring(page, parser=lxml.html.HTMLParser(encoding="utf-8"))
+
+    def product_urls(self, page: str) -> list:
+        return [link.get("href") for link in self.xpath["results_links"](self.parse(page))]
+
+    def product_details(self, page: str) -> dict:
+        html = self.parse(page)
+        details = {"title": self.xpath["title"](html)[0].text_content(),
+                   "rating": None,
+                   "price": None,
+                   "reviews_href": None}
+
+        for rating in self.xpath["overall_rating"](html):
+            inner = next(rating.iterdescendants("div"), None)
+            details["rating"] = inner.text_content() if inner is not None else None
+        for price in self.xpath["price"](html):
+            details["price"] = price.text_content()
+        all_reviews = self.xpath["all_reviews"](html)
+        if all_reviews:
+            details["reviews_href"] = all_reviews[0].get("href")
+        return details
+
+    def reviews(self, page: str) -> list:
+        html = self.parse(page)
+        ratings, comments, users = [], [], []
+        for container in self.xpath["containers"](html):
+            ratings, comments, users = [], [], []
+            for node in self.xpath["review_parts"](container):
+                kind = node.get("class")
+                if kind == RATING_CLASS:
+                    ratings.append(node)
+                elif COMMENT_CLASS in kind.split():
+                    comments.append(node)
+                else:
+                    users.append(node)
+
+        def first(node, tag, cls):
+            for child in node.iterdescendants(tag):
+                if cls in child.get("class", "").split():
+                    return child
+            return None
+
+        def nth(node, tag, index):
+            for i, child in enumerate(node.iterdescendants(tag)):
+                if i == index:
+                    return child
+            return None
+
+        return _build_reviews(ratings, comments, users,
+                              text=lambda node: node.text_content(),
+                              first=first,
+                              nth=nth)
+
+
+PARSERS = {
+    BsParser.name: BsParser,
+    LxmlParser.name: LxmlParser,
+}
+
+
+def get_parser(name: str = HTML_PARSER):
+    """Returns the named parser backend, falling back to BeautifulSoup without lxml."""
+    if name not in PARSERS:
+        raise ValueError(f"Unknown HTML parser '{name}', expected one of {sorted(PARSERS)}.")
+    if name == LxmlParser.name and lxml is None:
+        return BsParser()
+    return PARSERS[name]()
@@ -0,0 +1,66 @@
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+
+class RateLimiter:
+    """
+    Shared limit on page requests made by any number of scrapes.
+
+    A token bucket allows `rate` requests per second on average with bursts
+    of up to `burst`, and at most `max_per_host` requests to the same host
+    are in flight at once. One limiter passed to several ScrapeReviews
+    instances (and their workers) throttles all of them together.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, max_per_host: int = None):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.max_per_host = max_per_host
+        self.requests = 0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def acquire(self):
+        """Blocks until a request may start."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.requests += 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def _host_slots(self, url: str):
+        if not self.max_per_host:
+            return None
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._hosts[host]
+
+    @contextmanager
+    def request(self, url: str, token: bool = True):
+        """
+        Holds a slot of the url's host and a rate token for one request.
+        With `token=False` only the host slot is taken, e.g. to load in the
+        browser a page whose HTTP request already took its token.
+        """
+        slots = self._host_slots(url)
+        if slots is not None:
+            slots.acquire()
+        try:
+            if token:
+                self.acquire()
+            yield
+        finally:
+            if slots is not None:
+                slots.release()
@@ -2,174 +2,444 @@ from flask import request
 from selenium import webdriver 
 from selenium.webdriver.common.by import By 
 from src.exceptions import CustomException
-from bs4 import BeautifulSoup as bs
 import pandas as pd
 import os, sys
 import time
+import copy
+import contextlib
+import json
+import uuid
 from selenium.webdriver.chrome.options import Options 
 from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+from src.constants import *
+from src.scrapper.browser_scripts import EXTRACT_REVIEWS_JS, PAGE_PROGRESS_JS, REVIEW_RECORD_FIELDS
+from src.scrapper.browser import acquire_driver, release_driver
+from src.scrapper.cache import CacheMissError, get_page_cache
+from src.scrapper.checkpoint import CheckpointStore
+from src.local_store import ReviewStore
+from src.metrics import get_metrics
+from src.fingerprint import review_fingerprint
+from src.schema import REVIEW_COLUMNS, empty_reviews, parse_review_date, type_reviews
+from src.scrapper.driver_pool import DriverPool
+from src.scrapper.fetch import get_http_fetcher
+from src.scrapper.parser import get_parser
+
+# Metric label of a page, by the marker _get_page waits for
+PAGE_TYPES = {"results-base": "search", "pdp-price": "product"}
+# _scrape_product result of a product that failed
+_FAILED = object()
+
+
+def from_checkpoint(reviews: pd.DataFrame) -> bool:
+    """
+    True for a batch of iter_review_data restored from a checkpoint, i.e.
+    one an earlier attempt of the run already yielded (and stored).
+    """
+    return bool(reviews.attrs.get("from_checkpoint"))
 # from selenium.webdriver.chrome.service import Service
 
 
 
 class ScrapeReviews:
-    def __init__(self,product_name:str,no_of_products:int):
-        options = Options()
-        self.driver = webdriver.Chrome(options=options)
+    def __init__(self, product_name: str, no_of_products: int,
+                 workers: int = SCRAPE_WORKERS, driver=None,
+                 driver_factory=None, fetch_mode: str = FETCH_MODE,
+                 fetcher=None, base_url: str = MYNTRA_BASE_URL,
+                 html_parser: str = HTML_PARSER,
+                 review_extraction: str = REVIEW_EXTRACTION,
+                 max_reviews: int = SCROLL_MAX_REVIEWS,
+                 scroll_time_budget: float = SCROLL_TIME_BUDGET_SECONDS,
+                 browser_profile: str = BROWSER_PROFILE,
+                 checkpoint_path: str = CHECKPOINT_PATH,
+                 store_dir: str = REVIEW_STORE_DIR,
+                 cache_mode: str = PAGE_CACHE_MODE,
+                 cache_dir: str = PAGE_CACHE_DIR,
+                 seen_reviews=None, rate_limiter=None, run_id: str = None):
+        self._driver = driver
+        # An injected driver belongs to the caller and is never released here
+        self._owns_driver = False
+        self._driver_factory = driver_factory or self._new_driver
+        self.browser_profile = browser_profile
         self.product_name = product_name
         self.no_of_products = no_of_products
-
-    def scrape_product_urls(self, product_name):
+        self.workers = max(1, int(workers))
+        self.fetch_mode = fetch_mode
+        self.base_url = base_url.rstrip("/")
+        self.cache_mode = cache_mode
+        self.cache = get_page_cache(cache_dir) if cache_mode in ("on", "replay") else None
+        if fetcher is None and fetch_mode == "http" and cache_mode != "replay":
+            fetcher = get_http_fetcher()
+        self.fetcher = fetcher
+        self.html_parser = html_parser
+        self.parser = get_parser(html_parser)
+        self.review_extraction = review_extraction
+        self.max_reviews = max_reviews
+        self.scroll_time_budget = scroll_time_budget
+        # One entry per scrolled review page, see scroll_to_load_reviews
+        self.scroll_stats = []
+        self.checkpoints = CheckpointStore(checkpoint_path) if checkpoint_path else None
+        # Checkpoints belong to one run, so concurrent scrapes of the same query
+        # keep theirs apart; pass the run id of an interrupted run (a job id, or
+        # the id of a batch crawl) to resume it
+        self.run_id = run_id or uuid.uuid4().hex
+        self.store = ReviewStore(store_dir) if store_dir else None
+        # Incremental mode: callable(product_title) -> {"latest_date", "fingerprints"}
+        # of the reviews already stored, e.g. MongoIO.get_review_watermark
+        self.seen_reviews = seen_reviews
+        # Optional RateLimiter shared with other scrapes, applied to every page request
+        self.rate_limiter = rate_limiter
+
+    @property
+    def checkpoint_key(self) -> str:
+        return f"{self.run_id}/{self.product_name}"
+
+    def clear_checkpoints(self):
+        """Drops the checkpoints of this run, e.g. once it was cancelled."""
+        if self.checkpoints is not None:
+            self.checkpoints.clear(self.checkpoint_key)
+
+    def _new_driver(self):
+        # Reuses a warm browser from an earlier scrape in this process when possible
+        return acquire_driver(profile=self.browser_profile)
+
+    @property
+    def driver(self):
+        # Chrome is only launched once a page actually needs the browser
+        if self._driver is None:
+            self._driver = self._driver_factory()
+            self._owns_driver = True
+        return self._driver
+
+    def _cached(self, key: str):
+        """Page cache lookup; in replay mode a miss is an error instead of a fetch."""
+        if self.cache is None:
+            return None
+        if self.cache_mode == "replay":
+            page = self.cache.get(key, max_age=None)
+        else:
+            page = self.cache.get(key)
+        metrics = get_metrics()
+        metrics.inc("scrape_cache_requests_total", result="miss" if page is None else "hit")
+        if page is not None:
+            # A cached page may be hours old, so every hit is logged
+            metrics.log("page_cache_hit", url=key, cache_mode=self.cache_mode)
+        return page
+
+    def _get_page(self, url: str, marker: str = None) -> str:
+        """
+        Returns the HTML of `url`, from the page cache when possible. With an
+        HTTP fetcher the page is loaded without a browser; Selenium is only
+        used when the response does not contain `marker`, i.e. the content
+        is rendered by JavaScript.
+        """
+        page = self._cached(url)
+        if page is not None:
+            return page
+        if self.cache_mode == "replay":
+            raise CacheMissError(f"Page is not cached: {url}")
+
+        page = self._fetch_page(url, marker)
+        if self.cache is not None and (marker is None or marker in page):
+            self.cache.put(url, page)
+        return page
+
+    def _throttle(self, url: str, token: bool = True):
+        if self.rate_limiter is None:
+            return contextlib.nullcontext()
+        return self.rate_limiter.request(url, token=token)
+
+    def _fetch_page(self, url: str, marker: str = None) -> str:
+        metrics = get_metrics()
+        page_type = PAGE_TYPES.get(marker, "other")
+        metrics.inc("scrape_pages_total", page=page_type)
+        token = True
+        if self.fetcher is not None:
+            with self._throttle(url), metrics.timer("scrape_page_load_seconds",
+                                                    page=page_type, source="http"):
+                page = self.fetcher.fetch(url)
+            if page and (marker is None or marker in page):
+                metrics.observe("scrape_page_bytes", len(page), page=page_type)
+                return page
+            metrics.inc("scrape_browser_fallbacks_total", page=page_type)
+            # The page already took its rate token for the HTTP attempt
+            token = False
+
+        # Chrome is launched before the page holds a request slot of its host
+        driver = self.driver
+        with metrics.timer("scrape_page_load_seconds", page=page_type, source="browser"):
+            with self._throttle(url, token=token):
+                driver.get(url)
+            if marker is not None:
+                # With the eager page-load strategy the content may still be rendering
+                try:
+                    WebDriverWait(self.driver, PAGE_RENDER_TIMEOUT_SECONDS).until(
+                        lambda driver: driver.find_elements(By.CLASS_NAME, marker)
+                    )
+                except TimeoutException:
+                    pass
+            page = self.driver.page_source
+        metrics.observe("scrape_page_bytes", len(page), page=page_type)
+        return page
+
+    def _search_url(self, product_name: str, page: int = 1) -> str:
+        search_string = product_name.replace(" ","-")
+        encoded_query = quote(search_string)
+        url = f"{self.base_url}/{search_string}?rawQuery={encoded_query}"
+        if page > 1:
+            url += f"&{SEARCH_PAGE_PARAM}={page}"
+        return url
+
+    def scrape_product_urls(self, product_name, page: int = 1):
+        """Product links of one search results page."""
         try:
-            search_string = product_name.replace(" ","-")
-            # no_of_products = int(self.request.form['prod_no'])
-
-            encoded_query = quote(search_string)
-            # Navigate to the URL
-            self.driver.get(
-                f"https://www.myntra.com/{search_string}?rawQuery={encoded_query}"
-            )
-            myntra_text = self.driver.page_source
-            myntra_html = bs(myntra_text, "html.parser")
-            pclass = myntra_html.findAll("ul", {"class": "results-base"})
-
-            product_urls = []
-            for i in pclass:
-                href = i.find_all("a", href=True)
-
-                for product_no in range(len(href)):
-                    t = href[product_no]["href"]
-                    product_urls.append(t)
+            myntra_text = self._get_page(self._search_url(product_name, page),
+                                         marker="results-base")
+            with get_metrics().timer("scrape_parse_seconds", page="search"):
+                product_urls = self.parser.product_urls(myntra_text)
 
             return product_urls
 
         except Exception as e:
             raise CustomException(e, sys)
 
+    def iter_product_urls(self, product_name, max_pages: int = SEARCH_MAX_PAGES):
+        """
+        Lazily yields unique product links across search result pages.
+
+        The next results page is fetched in the background once half of the
+        links of the current one have been consumed, so a search that fits
+        on one page never loads the next. Paging stops at the first page
+        without new links (or after `max_pages`).
+        """
+        seen = set()
+        prefetch = ThreadPoolExecutor(max_workers=1)
+        try:
+            product_urls = self.scrape_product_urls(product_name, 1)
+            for page in range(1, max_pages + 1):
+                new_urls = [url for url in product_urls if url not in seen]
+                if not new_urls:
+                    break
+
+                next_page = None
+                for i, url in enumerate(new_urls):
+                    # The consumer has asked for link i, so it is still going
+                    if i == len(new_urls) // 2 and page < max_pages:
+                        next_page = prefetch.submit(self.scrape_product_urls, product_name, page + 1)
+                    seen.add(url)
+                    yield url
+                if next_page is None:
+                    break
+                product_urls = next_page.result()
+        finally:
+            # Also reached when the consumer stops early and closes the generator
+            prefetch.shutdown(wait=True, cancel_futures=True)
+
     def extract_reviews(self, product_link):
         try:
-            productLink = "https://www.myntra.com/" + product_link
-            self.driver.get(productLink)
-            prodRes = self.driver.page_source
-            prodRes_html = bs(prodRes, "html.parser")
-            title_h = prodRes_html.findAll("title")
-
-            self.product_title = title_h[0].text
-
-            overallRating = prodRes_html.findAll(
-                "div", {"class": "index-overallRating"}
-            )
-            for i in overallRating:
-                self.product_rating_value = i.find("div").text
-            price = prodRes_html.findAll("span", {"class": "pdp-price"})
-            for i in price:
-                self.product_price = i.text
-            product_reviews = prodRes_html.find(
-                "a", {"class": "detailed-reviews-allReviews"}
-            )
-
-            if not product_reviews:
+            productLink = f"{self.base_url}/{product_link}"
+            prodRes = self._get_page(productLink, marker="pdp-price")
+            with get_metrics().timer("scrape_parse_seconds", page="product"):
+                details = self.parser.product_details(prodRes)
+
+            self.product_title = details["title"]
+            self.product_rating_value = details["rating"]
+            self.product_price = details["price"]
+
+            if not details["reviews_href"]:
                 return None
-            return product_reviews
+            return {"href": details["reviews_href"]}
         except Exception as e:
             raise CustomException(e, sys)
         
-    def scroll_to_load_reviews(self):
+    def _page_progress(self) -> tuple:
+        """(number of rendered reviews, page height) of the current review page."""
+        reviews, height = self.driver.execute_script(PAGE_PROGRESS_JS)
+        return reviews, height
+
+    def scroll_to_load_reviews(self, on_step=None) -> dict:
+        """
+        Scrolls the review page until no more reviews load, `max_reviews`
+        are rendered or `scroll_time_budget` seconds have passed.
+
+        After each scroll it waits only until new review nodes appear (or
+        the page grows), polling every SCROLL_POLL_SECONDS. The wait timeout
+        starts at SCROLL_WAIT_MIN_SECONDS, doubles whenever nothing loads
+        and shrinks again once content arrives; scrolling stops after
+        SCROLL_IDLE_ROUNDS waits in a row without new content. `on_step` is
+        called whenever new reviews loaded; returning True stops scrolling.
+        Returns the iteration count, time spent waiting and the reason it
+        stopped.
+        """
         # Change the window size to load more data
         self.driver.set_window_size(1920, 1080)  # Example window size, adjust as needed
 
-        # Get the initial height of the page
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
-        
-        # Scroll in smaller increments, waiting between scrolls
+        started = time.monotonic()
+        stats = {"iterations": 0, "wait_seconds": 0.0, "reviews": 0, "stop_reason": None}
+        progress = self._page_progress()
+        timeout = SCROLL_WAIT_MIN_SECONDS
+        idle_rounds = 0
+
         while True:
-            # Scroll down by a small amount
-            self.driver.execute_script("window.scrollBy(0, 1000);")
-            time.sleep(3)  # Adjust this delay if needed
-            
-            # Calculate the new height after scrolling
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            
-            # Break the loop if no new content is loaded after scrolling
-            if new_height == last_height:
+            elapsed = time.monotonic() - started
+            if self.max_reviews and progress[0] >= self.max_reviews:
+                stats["stop_reason"] = "max_reviews"
+                break
+            if self.scroll_time_budget and elapsed >= self.scroll_time_budget:
+                stats["stop_reason"] = "time_budget"
                 break
-            
-            # Update the last height for the next iteration
-            last_height = new_height
 
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            stats["iterations"] += 1
 
+            wait_for = timeout
+            if self.scroll_time_budget:
+                wait_for = max(0.0, min(wait_for, self.scroll_time_budget - elapsed))
 
-    def extract_products(self, product_reviews: list):
-        try:
-            t2 = product_reviews["href"]
-            Review_link = "https://www.myntra.com" + t2
-            self.driver.get(Review_link)
-            
+            last_progress = progress
+            wait_started = time.monotonic()
+            try:
+                WebDriverWait(self.driver, wait_for, poll_frequency=SCROLL_POLL_SECONDS).until(
+                    lambda driver: self._page_progress() != last_progress
+                )
+            except TimeoutException:
+                pass
+            stats["wait_seconds"] += time.monotonic() - wait_started
+            progress = self._page_progress()
+
+            if progress != last_progress:
+                idle_rounds = 0
+                timeout = max(SCROLL_WAIT_MIN_SECONDS, timeout / 2)
+                if on_step is not None and on_step():
+                    stats["stop_reason"] = "seen_reviews"
+                    break
+            else:
+                idle_rounds += 1
+                if idle_rounds >= SCROLL_IDLE_ROUNDS:
+                    stats["stop_reason"] = "no_new_reviews"
+                    break
+                # Back off: the next wait gets more time to load
+                timeout = min(SCROLL_WAIT_MAX_SECONDS, timeout * 2)
+
+        stats["reviews"] = progress[0]
+        stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+        self.scroll_stats.append(stats)
+        metrics = get_metrics()
+        metrics.inc("scrape_scroll_iterations_total", stats["iterations"])
+        metrics.observe("scrape_scroll_wait_seconds", stats["wait_seconds"])
+        metrics.inc("scrape_scroll_stops_total", reason=stats["stop_reason"])
+        return stats
+
+    def collect_page_reviews(self, start: int = 0) -> list:
+        """
+        Extracts the reviews rendered on the current page inside the browser,
+        skipping the first `start` ones. Only the review fields cross the
+        webdriver connection instead of the whole page_source.
+        """
+        records = self.driver.execute_script(EXTRACT_REVIEWS_JS, start) or []
+        return [dict(zip(REVIEW_RECORD_FIELDS, record)) for record in records]
+
+    def _is_seen(self, review: dict, watermark: dict) -> bool:
+        """True for reviews already stored, or older than the newest stored one."""
+        fingerprint = review_fingerprint(self.product_title, review["Name"],
+                                         review["Date"], review["Comment"])
+        if fingerprint in watermark["fingerprints"]:
+            return True
+        date = parse_review_date(review["Date"])
+        return bool(watermark["latest_date"] and date and date < watermark["latest_date"])
+
+    def _load_page_reviews(self, review_link: str, watermark: dict = None) -> list:
+        """
+        Review records of the fully scrolled review page. The page cache
+        holds the scrolled HTML (page_source extraction) or the extracted
+        records (script extraction) under the review link.
+
+        With a `watermark` of already stored reviews, script extraction stops
+        scrolling as soon as a scroll step brings in nothing but known reviews.
+        """
+        records_key = review_link + "#records"
+        # Incremental runs want what is new right now, not a cached page
+        if watermark is None or self.cache_mode == "replay":
+            page = self._cached(review_link)
+            if page is not None:
+                with get_metrics().timer("scrape_parse_seconds", page="review"):
+                    return self.parser.reviews(page)
+            records = self._cached(records_key)
+            if records is not None:
+                return json.loads(records)
+        if self.cache_mode == "replay":
+            raise CacheMissError(f"Review page is not cached: {review_link}")
+
+        # Reviews are loaded while scrolling, so this page always needs the browser
+        get_metrics().inc("scrape_pages_total", page="review")
+        driver = self.driver
+        with self._throttle(review_link), get_metrics().timer("scrape_page_load_seconds",
+                                                              page="review", source="browser"):
+            driver.get(review_link)
+
+        if self.review_extraction == "script":
+            # Reviews are picked up in the page after every scroll step
+            page_reviews = []
+
+            def collect():
+                new_reviews = self.collect_page_reviews(len(page_reviews))
+                page_reviews.extend(new_reviews)
+                # Reviews come newest first, so once a step is all known the rest is too
+                return bool(watermark and new_reviews
+                            and all(self._is_seen(review, watermark) for review in new_reviews))
+
+            self.scroll_to_load_reviews(on_step=collect)
+            collect()
+            if self.cache is not None:
+                self.cache.put(records_key, json.dumps(page_reviews))
+        else:
             self.scroll_to_load_reviews()
-            
-            review_page = self.driver.page_source
+            page = self.driver.page_source
+            get_metrics().observe("scrape_page_bytes", len(page), page="review")
+            if self.cache is not None:
+                self.cache.put(review_link, page)
+            with get_metrics().timer("scrape_parse_seconds", page="review"):
+                page_reviews = self.parser.reviews(page)
 
-            review_html = bs(review_page, "html.parser")
-            review = review_html.findAll(
-                "div", {"class": "detailed-reviews-userReviewsContainer"}
-            )
+        return page_reviews
 
-            for i in review:
-                user_rating = i.findAll(
-                    "div", {"class": "user-review-main user-review-showRating"}
-                )
-                user_comment = i.findAll(
-                    "div", {"class": "user-review-reviewTextWrapper"}
-                )
-                user_name = i.findAll("div", {"class": "user-review-left"})
+    def extract_products(self, product_reviews: dict):
+        try:
+            t2 = product_reviews["href"]
+            Review_link = self.base_url + t2
+
+            watermark = None
+            if self.seen_reviews is not None:
+                watermark = self.seen_reviews(self.product_title)
+                # Newest reviews first, so scrolling can stop at the stored ones
+                Review_link += ("&" if "?" in Review_link else "?") + INCREMENTAL_REVIEW_SORT_QUERY
+
+            page_reviews = self._load_page_reviews(Review_link, watermark)
+            if watermark is not None:
+                page_reviews = [
+                    review for review in page_reviews
+                    if review_fingerprint(self.product_title, review["Name"],
+                                          review["Date"], review["Comment"])
+                    not in watermark["fingerprints"]
+                ]
+
+            if self.max_reviews:
+                page_reviews = page_reviews[: self.max_reviews]
 
             reviews = []
-            for i in range(len(user_rating)):
-                try:
-                    rating = (
-                        user_rating[i]
-                        .find("span", class_="user-review-starRating")
-                        .get_text()
-                        .strip()
-                    )
-                except:
-                    rating = "No rating Given"
-                try:
-                    comment = user_comment[i].text
-                except:
-                    comment = "No comment Given"
-                try:
-                    name = user_name[i].find("span").text
-                except:
-                    name = "No Name given"
-                try:
-                    date = user_name[i].find_all("span")[1].text
-                except:
-                    date = "No Date given"
-
+            for review in page_reviews:
                 mydict = {
                     "Product Name": self.product_title,
                     "Over_All_Rating": self.product_rating_value,
                     "Price": self.product_price,
-                    "Date": date,
-                    "Rating": rating,
-                    "Name": name,
-                    "Comment": comment,
+                    **review,
                 }
                 reviews.append(mydict)
 
-            review_data = pd.DataFrame(
-                reviews,
-                columns=[
-                    "Product Name",
-                    "Over_All_Rating",
-                    "Price",
-                    "Date",
-                    "Rating",
-                    "Name",
-                    "Comment",
-                ],
-            )
+            # Parsed and typed once here, so no consumer re-parses the strings
+            review_data = type_reviews(pd.DataFrame(reviews, columns=REVIEW_COLUMNS))
 
             return review_data
 
@@ -177,54 +447,152 @@ class ScrapeReviews:
             raise CustomException(e, sys)
         
     
-    def skip_products(self, search_string, no_of_products, skip_index):
-        product_urls: list = self.scrape_product_urls(search_string, no_of_products + 1)
-
-        product_urls.pop(skip_index)
+    def _scrape_product(self, pool: DriverPool, product_url: str):
+        """
+        Scrapes one product on a pooled driver; returns None when it has no
+        reviews and _FAILED when scraping it failed (which is logged).
+        """
+        if self.checkpoints is not None:
+            # Finished in an earlier, interrupted attempt of the same run
+            found, reviews = self.checkpoints.load(self.checkpoint_key, product_url, REVIEW_COLUMNS)
+            if found:
+                if reviews is None:
+                    return None
+                reviews = type_reviews(reviews)
+                reviews.attrs["from_checkpoint"] = True
+                return reviews
+
+        # A worker instance keeps the per-product state (title, price, ...) off self.
+        # It only takes a driver from the pool once a page needs the browser.
+        worker = copy.copy(self)
+        worker._driver = None
+        worker._driver_factory = pool.acquire
+        worker.workers = 1
+        try:
+            try:
+                with get_metrics().timer("scrape_product_seconds"):
+                    review = worker.extract_reviews(product_url)
+                    reviews = worker.extract_products(review) if review else None
+            except Exception as e:
+                metrics = get_metrics()
+                metrics.inc("scrape_product_failures_total")
+                metrics.log("scrape_product_failed", url=product_url, error=str(e))
+                return _FAILED
+            if reviews is not None:
+                get_metrics().observe("scrape_reviews_per_product", len(reviews))
+            return reviews
+        finally:
+            if worker._driver is not None:
+                pool.release(worker._driver)
+
+    def _iter_products(self, pool: DriverPool, product_urls):
+        """
+        Runs the products through the pool and yields the reviews of the
+        first `no_of_products` that have any, in search-result order, as
+        soon as each one (and every product before it) is done.
+        `product_urls` may be any iterable; it is only advanced when a
+        worker is free.
+
+        A product is checkpointed once the consumer asks for the next one,
+        so the products restored on resume are exactly those an earlier
+        attempt handed out and saw handled. Failed products are skipped and
+        not checkpointed, so the next attempt tries them again.
+        """
+        product_urls = iter(product_urls)
+        results = {}
+        pending = {}
+        scraped = 0
+        next_index = 0
+        done_index = 0
+        exhausted = False
+
+        executor = ThreadPoolExecutor(max_workers=pool.size)
+        try:
+            while scraped < self.no_of_products:
+                # Products finished out of order that already have reviews
+                ahead = sum(1 for _, data in results.values() if isinstance(data, pd.DataFrame))
+
+                while (len(pending) < pool.size
+                       and not exhausted
+                       and scraped + ahead + len(pending) < self.no_of_products):
+                    product_url = next(product_urls, None)
+                    if product_url is None:
+                        exhausted = True
+                        break
+                    future = executor.submit(self._scrape_product, pool, product_url)
+                    pending[future] = (next_index, product_url)
+                    next_index += 1
+
+                if not pending:
+                    break
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index, product_url = pending.pop(future)
+                    results[index] = (product_url, future.result())
+
+                # Consume results strictly in product_urls order so the output is deterministic
+                while done_index in results and scraped < self.no_of_products:
+                    product_url, product_detail = results.pop(done_index)
+                    done_index += 1
+                    if product_detail is _FAILED:
+                        continue
+                    if product_detail is not None:
+                        scraped += 1
+                        yield product_detail
+                    if self.checkpoints is not None:
+                        self.checkpoints.save(self.checkpoint_key, product_url, product_detail)
+        finally:
+            # Also reached when the consumer stops iterating early
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def iter_review_data(self):
+        """
+        Yields one DataFrame of reviews per product as soon as it is scraped,
+        in search-result order. Only the products still being scraped are
+        held in memory, so callers can display or store each batch right away.
+
+        Each product is checkpointed once the caller asks for the next one;
+        if the run fails, the next attempt with the same `run_id` picks those
+        products up from the checkpoint (see `from_checkpoint`) and
+        continues with the one that failed. The checkpoints
+        of a run are dropped once it completes, and those of abandoned runs
+        expire after CHECKPOINT_MAX_AGE_SECONDS.
+        """
+        product_urls = self.iter_product_urls(product_name=self.product_name)
+        try:
+            # On exit the pool returns every driver to the warm set (or quits it)
+            with DriverPool(self.workers, self._driver_factory,
+                            dispose=release_driver) as pool:
+                for product_detail in self._iter_products(pool, product_urls):
+                    yield product_detail
+                    # Appended to the local Parquet store once the caller is done with
+                    # it, just before it is checkpointed; restored products already were
+                    if self.store is not None and not from_checkpoint(product_detail):
+                        self.store.write(self.product_name, product_detail)
+
+            self.clear_checkpoints()
+        except Exception as e:
+            raise CustomException(e, sys)
+        finally:
+            product_urls.close()
+            # Browser this scraper launched for search pages that needed JavaScript
+            if self._driver is not None and self._owns_driver:
+                release_driver(self._driver)
+                self._driver = None
+                self._owns_driver = False
 
     def get_review_data(self) -> pd.DataFrame:
         try:
-            # search_string = self.request.form["content"].replace(" ", "-")
-            # no_of_products = int(self.request.form["prod_no"])
+            product_details = list(self.iter_review_data())
 
-            product_urls = self.scrape_product_urls(product_name=self.product_name)
+            if not product_details:
+                return empty_reviews()
 
-            
+            # Re-typed because concatenating different categories falls back to object
+            data = type_reviews(pd.concat(product_details, axis=0))
 
-            product_details = []
-
-            review_len = 0
-
-
-            while review_len < self.no_of_products:
-                product_url = product_urls[review_len]
-                review = self.extract_reviews(product_url)
-
-                if review:
-                    product_detail = self.extract_products(review)
-                    product_details.append(product_detail)
-
-                    review_len += 1
-                else:
-                    product_urls.pop(review_len)
-
-            self.driver.quit()
-
-            data = pd.concat(product_details, axis=0)
-            
-            data.to_csv("data.csv", index=False)
-            
             return data
-            
-            
-                
-            # columns = data.columns
-
-            # values = [[data.loc[i, col] for col in data.columns ] for i in range(len(data)) ]
-            
-            # return columns, values
-        
-    
 
         except Exception as e:
             raise CustomException(e, sys)
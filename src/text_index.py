@@ -0,0 +1,139 @@
+"""
+Term and bigram counts of review comments, per product and rating bucket.
+
+Comments are tokenized for a whole frame at once (lower-cased words,
+common English stop words dropped; negations such as "not" are kept, so
+"not worth" survives as a bigram). The result is a sparse matrix in
+coordinate form: one row per (product, rating bucket, term) with the
+number of reviews that mention the term. MongoIO folds the counts of
+newly stored reviews into one document per product and bucket, so the
+index is never recomputed from the raw comments on a page load.
+"""
+import numpy as np
+import pandas as pd
+from pymongo import UpdateOne
+
+from src.constants import RATING_BUCKET_BOUNDS, RATING_BUCKET_KEYS
+from src.schema import product_id
+
+# Words, and punctuation that separates phrases
+TOKEN_PATTERN = r"[a-z][a-z']+|[.,;:!?]"
+UNRATED = "unrated"
+
+STOP_WORDS = frozenset("""
+a about above after again all also am an and any are as at be been before being
+below between both but by can could did do does doing down during each few for
+from further had has have having he her here hers herself him himself his how i
+if in into is it it's its itself just me more most my myself of off on once only
+or other our ours out over own same she should so some such than that the their
+theirs them then there these they this those through to too under until up very
+was we were what when where which while who whom why will with would you your
+yours i'm i've product myntra
+""".split())
+# Only kept as the first word of a bigram ("not worth", "no stretch")
+NEGATIONS = frozenset(["not", "no", "never", "don't", "doesn't", "didn't", "isn't", "wasn't"])
+
+
+def rating_bucket_keys(ratings: pd.Series) -> pd.Series:
+    """RATING_BUCKET_KEYS bucket of every rating, UNRATED for missing ratings."""
+    buckets = pd.cut(ratings, RATING_BUCKET_BOUNDS, right=False, labels=RATING_BUCKET_KEYS)
+    return buckets.cat.add_categories([UNRATED]).fillna(UNRATED)
+
+
+def comment_terms(comments: pd.Series) -> pd.DataFrame:
+    """
+    (row, term) pairs of the unigrams and bigrams in each comment, each
+    pair once; `row` is the position of the comment in `comments`. Bigrams
+    are adjacent words, never across punctuation or a dropped stop word.
+    """
+    tokens = (comments.reset_index(drop=True).astype(object).dropna().astype(str)
+                      .str.lower().str.findall(TOKEN_PATTERN).explode().dropna())
+    rows = tokens.index.to_numpy()
+    words = tokens.to_numpy(dtype=object)
+    # Punctuation tokens are single characters and only break bigrams
+    is_word = (tokens.str.len() > 1).to_numpy() & ~tokens.isin(STOP_WORDS).to_numpy()
+
+    unigram = is_word & ~tokens.isin(NEGATIONS).to_numpy()
+    bigram = np.zeros(len(words), dtype=bool)
+    bigram[:-1] = is_word[:-1] & is_word[1:] & (rows[:-1] == rows[1:])
+    bigram_at = np.flatnonzero(bigram)
+
+    terms = pd.DataFrame({
+        "row": np.concatenate([rows[unigram], rows[bigram_at]]),
+        "term": np.concatenate([words[unigram], words[bigram_at] + " " + words[bigram_at + 1]]),
+    })
+    return terms.drop_duplicates()
+
+
+def _review_keys(reviews: pd.DataFrame) -> pd.DataFrame:
+    """product_id and rating bucket of every review."""
+    return pd.DataFrame({
+        "product_id": [product_id(title) for title in reviews["Product Name"]],
+        "bucket": rating_bucket_keys(reviews["Rating"]).astype(str).to_numpy(),
+    })
+
+
+def term_counts(reviews: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sparse term counts of a typed review frame: product_id, bucket, term
+    and count (reviews mentioning the term), plus `reviews`, the number of
+    reviews of the product in the bucket.
+    """
+    columns = ["product_id", "bucket", "term", "count", "reviews"]
+    if reviews.empty:
+        return pd.DataFrame({column: pd.Series(dtype="int64" if column in ("count", "reviews")
+                                               else object) for column in columns})
+    keys = _review_keys(reviews)
+    totals = keys.groupby(["product_id", "bucket"]).size().rename("reviews")
+
+    terms = comment_terms(reviews["Comment"]).join(keys, on="row")
+    counts = terms.groupby(["product_id", "bucket", "term"]).size().rename("count").reset_index()
+    return counts.join(totals, on=["product_id", "bucket"])[columns]
+
+
+def term_updates(reviews: pd.DataFrame, new: pd.Series, queries: list,
+                 scope: str = None) -> list:
+    """
+    Upserts that add the comments of the reviews flagged in `new` (the ones
+    actually inserted) to the term documents, one per product and rating
+    bucket; `scope` as in summary_updates.
+    """
+    added = reviews[list(new)]
+    if added.empty:
+        return []
+    totals = _review_keys(added).groupby(["product_id", "bucket"]).size()
+    counts = term_counts(added)
+    terms = {key: group for key, group in counts.groupby(["product_id", "bucket"], sort=False)}
+
+    updates = []
+    for (pid, bucket), total in totals.items():
+        # Reviews without any term still count towards their bucket
+        increments = {"reviews": int(total)}
+        if (pid, bucket) in terms:
+            group = terms[(pid, bucket)]
+            increments.update({f"terms.{term}": int(count)
+                               for term, count in zip(group["term"], group["count"])})
+        updates.append(UpdateOne(
+            {"_id": f"{pid}/{bucket}" if scope is None else f"{scope}/{pid}/{bucket}"},
+            {"$set": {"product_id": pid, "bucket": bucket, "scope": scope},
+             "$addToSet": {"queries": {"$each": list(queries)}},
+             "$inc": increments},
+            upsert=True,
+        ))
+    return updates
+
+
+def top_terms(counts: pd.DataFrame, limit: int, buckets: list = None) -> dict:
+    """
+    {bucket: DataFrame of term, reviews mentioning it and share of the
+    bucket's reviews}, most mentioned first, from term_counts rows of any
+    number of products.
+    """
+    result = {}
+    for bucket in buckets or RATING_BUCKET_KEYS:
+        rows = counts[counts["bucket"] == bucket]
+        total = rows.drop_duplicates(subset=["product_id"])["reviews"].sum()
+        top = rows.groupby("term")["count"].sum().nlargest(limit)
+        result[bucket] = pd.DataFrame({"term": top.index, "reviews": top.to_numpy(),
+                                       "share": (top / total).to_numpy() if total else 0.0})
+    return result
@@ -6,10 +6,8 @@ import os,sys
 def fetch_product_names_from_cloud():
     try:
         mongo=MongoIO()
-        collection_names=mongo.mongo_ins._mongo_operation_connect_database.list_collection_names()
-        return [collection_names.replace('_',' ')
-                for collection_name in collection_names]
+        return mongo.get_searches()
     
     except  Exception as e:
         raise CustomException(e,sys)
-    
\ No newline at end of file
+    
@@ -0,0 +1,177 @@
+import urllib.error
+import urllib.request
+
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import FixtureServer
+from src import database_connect
+from src.database_connect import close_clients
+from src.scrapper import scrape
+from src.scrapper.browser_scripts import EXTRACT_REVIEWS_JS, PAGE_PROGRESS_JS, REVIEW_RECORD_FIELDS
+from src.scrapper.fetch import HttpFetcher
+from src.scrapper.parser import get_parser
+
+MONGOMOCK_URL = "mongomock://localhost"
+SEARCH = "men tshirt"
+
+
+@pytest.fixture
+def mongo_url(monkeypatch):
+    """
+    An empty in-memory mongomock database for the test, as MONGO_DB_URL:
+    the shared clients are mongomock clients instead of pymongo ones.
+    """
+    import mongomock
+    from src.cloud_io import MongoIO
+
+    monkeypatch.setattr(database_connect, "_new_client",
+                        lambda client_url, listener, **options: mongomock.MongoClient())
+    monkeypatch.setenv("MONGO_DB_URL", MONGOMOCK_URL)
+    close_clients()
+    MongoIO.mongo_ins = None
+    yield MONGOMOCK_URL
+    close_clients()
+    MongoIO.mongo_ins = None
+
+
+def _make_reviews(product: str = "Blue Tshirt", count: int = 30, seed: int = 0,
+                  comment: str = None) -> pd.DataFrame:
+    """Scraped-style review rows of one product with distinct reviewers."""
+    comments = ["fabric quality is good", "shrinks after wash", "not worth the price",
+                "fits perfectly", "colour faded quickly"]
+    return pd.DataFrame({
+        "Product Name": product,
+        "Over_All_Rating": 4.1,
+        "Price": 499.0,
+        "Date": [f"{1 + (seed + i) % 28} Jan 2024" for i in range(count)],
+        "Rating": [1 + (seed + i) % 5 for i in range(count)],
+        "Name": [f"Reviewer {seed}-{i}" for i in range(count)],
+        "Comment": [comment or comments[(seed + i) % len(comments)] for i in range(count)],
+    })
+
+
+@pytest.fixture
+def make_reviews():
+    return _make_reviews
+
+
+class FakeDriver:
+    """
+    Webdriver stand-in for the fixture site. `get` downloads the page over
+    HTTP, or renders `page_source` for every url when one is given. Review
+    pages show `scroll_step` more reviews after every scroll, as myntra.com
+    loads them while scrolling; page_source always holds all of them.
+    """
+
+    def __init__(self, page_source: str = None, scroll_step: int = 10):
+        self.fixed_page = page_source
+        self.page_source = page_source or ""
+        self.scroll_step = scroll_step
+        self.urls = []
+        self.scrolls = 0
+        self.quit_calls = 0
+        self._records = []
+        self._rendered = 0
+
+    def get(self, url: str):
+        self.urls.append(url)
+        if self.fixed_page is None:
+            try:
+                with urllib.request.urlopen(url) as response:
+                    self.page_source = response.read().decode("utf-8")
+            except urllib.error.HTTPError:
+                self.page_source = ""
+        self._records = []
+        if "detailed-reviews-userReviewsContainer" in self.page_source:
+            self._records = get_parser("lxml").reviews(self.page_source)
+        self._rendered = min(self.scroll_step, len(self._records))
+
+    def execute_script(self, script: str, *args):
+        if script == PAGE_PROGRESS_JS:
+            return [self._rendered, self._rendered]
+        if script == EXTRACT_REVIEWS_JS:
+            start = args[0] if args else 0
+            return [[record[field] for field in REVIEW_RECORD_FIELDS]
+                    for record in self._records[start:self._rendered]]
+        if "scrollTo" in script:
+            self.scrolls += 1
+            self._rendered = min(self._rendered + self.scroll_step, len(self._records))
+        return None
+
+    def find_elements(self, by, value):
+        return [value] if value in self.page_source else []
+
+    def set_window_size(self, width: int, height: int):
+        pass
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+class RecordingFetcher(HttpFetcher):
+    """HttpFetcher that records the urls it was asked for."""
+
+    def __init__(self):
+        super().__init__(pool_size=4, timeout=5)
+        self.urls = []
+
+    def fetch(self, url: str):
+        self.urls.append(url)
+        return super().fetch(url)
+
+
+@pytest.fixture
+def serve():
+    """serve(pages) starts a FixtureServer for {path: HTML}; all are stopped after the test."""
+    servers = []
+
+    def start(pages: dict) -> FixtureServer:
+        server = FixtureServer(pages).__enter__()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.__exit__(None, None, None)
+
+
+@pytest.fixture
+def http_fetcher():
+    fetcher = RecordingFetcher()
+    yield fetcher
+    fetcher.close()
+
+
+@pytest.fixture
+def launched_drivers() -> list:
+    """The FakeDrivers that scrapers from make_scrapper launched."""
+    return []
+
+
+@pytest.fixture
+def make_scrapper(http_fetcher, launched_drivers, monkeypatch):
+    """
+    make_scrapper(server, no_of_products=3, **options): a ScrapeReviews for
+    SEARCH on a fixture server, with the HTTP fetcher, FakeDrivers as its
+    browsers, page_source extraction and no checkpoints, local store or
+    page cache unless `options` say otherwise.
+    """
+    # Scrolling waits for reviews that never come once a page is fully shown
+    monkeypatch.setattr(scrape, "SCROLL_WAIT_MIN_SECONDS", 0.01)
+    monkeypatch.setattr(scrape, "SCROLL_WAIT_MAX_SECONDS", 0.02)
+    monkeypatch.setattr(scrape, "SCROLL_POLL_SECONDS", 0.005)
+
+    def launch() -> FakeDriver:
+        driver = FakeDriver()
+        launched_drivers.append(driver)
+        return driver
+
+    def make(server, no_of_products: int = 3, **options) -> scrape.ScrapeReviews:
+        settings = dict(base_url=server.url, fetch_mode="http", fetcher=http_fetcher,
+                        driver_factory=launch, review_extraction="page_source",
+                        checkpoint_path="", store_dir="", cache_mode="off")
+        settings.update(options)
+        return scrape.ScrapeReviews(SEARCH, no_of_products, **settings)
+
+    return make
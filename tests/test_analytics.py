@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from src.analytics import STAR_COLUMNS, ReviewAnalytics
+from src.constants import RATING_BUCKET_LABELS
+
+# Ratings on both sides of the bucket bounds 3.0 and 4.0, unrated reviews and
+# one review without a product name
+REVIEWS = pd.DataFrame({
+    "Product Name": ["Blue Tshirt"] * 6 + ["Red Tshirt"] * 4 + [None],
+    "Over_All_Rating": [4.1] * 6 + [3.8, 3.8, np.nan, 3.8, 4.0],
+    "Price": [499.0, 499.0, 549.0, 499.0, np.nan, 499.0, 299.0, 299.0, 349.0, 299.0, 199.0],
+    "Date": ["2 Jan 2024"] * 11,
+    "Rating": [2.9, 3.0, 3.9, 4.0, np.nan, 5.0, 1.0, 3.0, 4.0, np.nan, 5.0],
+    "Name": [f"Reviewer {i}" for i in range(11)],
+    "Comment": ["fits perfectly"] * 11,
+})
+
+
+def bucket(rating: float):
+    if np.isnan(rating):
+        return None
+    return RATING_BUCKET_LABELS[0] if rating < 3 else (
+        RATING_BUCKET_LABELS[1] if rating < 4 else RATING_BUCKET_LABELS[2])
+
+
+def expected_stats(reviews: pd.DataFrame) -> pd.DataFrame:
+    """The product stats with a plain groupby per statistic."""
+    reviews = reviews.dropna(subset=["Product Name"])
+    groups = reviews.groupby("Product Name")
+    stats = pd.DataFrame({
+        "reviews": groups.size(),
+        "average_price": groups["Price"].mean(),
+        "average_over_all_rating": groups["Over_All_Rating"].mean(),
+        "average_rating": groups["Rating"].mean(),
+    })
+    rated = reviews.dropna(subset=["Rating"])
+    stars = (rated.assign(star=rated["Rating"].round().clip(1, 5).astype(int))
+                  .groupby(["Product Name", "star"]).size().unstack(fill_value=0))
+    for star, column in STAR_COLUMNS.items():
+        stats[column] = stars.get(star, 0)
+    buckets = (rated.assign(bucket=rated["Rating"].map(bucket))
+                    .groupby(["Product Name", "bucket"]).size().unstack(fill_value=0))
+    for label in RATING_BUCKET_LABELS:
+        stats[label] = buckets.get(label, 0)
+    return stats.fillna({column: 0 for column in [*STAR_COLUMNS.values(), *RATING_BUCKET_LABELS]})
+
+
+def test_product_stats_match_a_plain_groupby():
+    stats = ReviewAnalytics(REVIEWS).product_stats
+
+    pd.testing.assert_frame_equal(stats, expected_stats(REVIEWS), check_dtype=False,
+                                  check_index_type=False)
+    # 3.0 and 4.0 open the neutral and positive buckets
+    assert stats.loc["Blue Tshirt", RATING_BUCKET_LABELS].tolist() == [1, 2, 2]
+
+
+def test_rating_buckets_leave_unrated_reviews_out():
+    buckets = ReviewAnalytics(REVIEWS).rating_buckets
+
+    assert buckets.isna().tolist() == REVIEWS["Rating"].isna().tolist()
+    assert buckets.dropna().astype(str).tolist() == \
+        [bucket(rating) for rating in REVIEWS["Rating"].dropna()]
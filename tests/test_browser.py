@@ -0,0 +1,29 @@
+from benchmarks.fixtures import site_pages
+from src.scrapper import browser
+from tests.conftest import SEARCH, FakeDriver
+
+
+def test_only_pooled_browsers_are_kept_warm(monkeypatch):
+    monkeypatch.setattr(browser, "_warm_drivers", [])
+    pooled, foreign = FakeDriver("<html></html>"), FakeDriver("<html></html>")
+    pooled._scrape_profile = "scrape"
+
+    browser.release_driver(pooled)
+    browser.release_driver(foreign)
+
+    assert browser._warm_drivers == [pooled]
+    assert (pooled.quit_calls, foreign.quit_calls) == (0, 1)
+
+
+def test_scrape_quits_factory_drivers_and_leaves_injected_ones(serve, make_scrapper,
+                                                               launched_drivers, monkeypatch):
+    monkeypatch.setattr(browser, "_warm_drivers", [])
+    server = serve(site_pages(SEARCH, no_of_products=3, reviews_per_product=4))
+    injected = FakeDriver()
+    scrapper = make_scrapper(server, driver=injected, fetch_mode="browser")
+
+    assert len(scrapper.get_review_data()) == 12
+
+    assert launched_drivers and all(driver.quit_calls == 1 for driver in launched_drivers)
+    assert injected.quit_calls == 0 and scrapper._driver is injected
+    assert browser._warm_drivers == []
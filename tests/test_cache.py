@@ -0,0 +1,99 @@
+import json
+import os
+import random
+import string
+
+from benchmarks.fixtures import site_pages
+from src.metrics import get_metrics
+from src.scrapper import cache
+from src.scrapper.cache import PageCache
+from tests.conftest import SEARCH
+
+
+def page(seed: int, size: int = 1000) -> str:
+    # Random letters hardly compress, so all entries are about the same size
+    rng = random.Random(seed)
+    return "".join(rng.choice(string.ascii_letters) for _ in range(size))
+
+
+def set_last_used(page_cache: PageCache, key: str, seconds_ago: float):
+    used = os.path.getmtime(page_cache._path(key)) - seconds_ago
+    os.utime(page_cache._path(key), (used, used))
+
+
+def test_entries_expire_after_the_ttl(tmp_path, monkeypatch):
+    page_cache = PageCache(str(tmp_path), ttl=60)
+    page_cache.put("https://example.com/a", "<html>a</html>")
+    now = cache.time.time()
+
+    monkeypatch.setattr(cache.time, "time", lambda: now + 30)
+    assert page_cache.get("https://example.com/a") == "<html>a</html>"
+
+    monkeypatch.setattr(cache.time, "time", lambda: now + 120)
+    assert page_cache.get("https://example.com/a") is None
+    # Replay accepts entries of any age
+    assert page_cache.get("https://example.com/a", max_age=None) == "<html>a</html>"
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    page_cache = PageCache(str(tmp_path))
+    page_cache.put("a", page(1))
+    page_cache.put("b", page(2))
+    # Room for two entries, not three
+    page_cache.max_bytes = int(page_cache._size * 1.2)
+    set_last_used(page_cache, "a", 20)
+    set_last_used(page_cache, "b", 10)
+    # Reading "a" makes "b" the least recently used entry
+    assert page_cache.get("a") == page(1)
+
+    page_cache.put("c", page(3))
+
+    assert page_cache.get("a") == page(1)
+    assert page_cache.get("b") is None
+    assert page_cache.get("c") == page(3)
+    assert page_cache._size <= page_cache.max_bytes
+
+
+def test_script_extraction_caches_review_records(tmp_path, serve, make_scrapper,
+                                                 launched_drivers, http_fetcher):
+    server = serve(site_pages(SEARCH, no_of_products=2, reviews_per_product=3))
+    options = dict(review_extraction="script", cache_dir=str(tmp_path))
+    recorded = make_scrapper(server, no_of_products=2, cache_mode="on", **options).get_review_data()
+    review_link = f"{server.url}/reviews/10000"
+    page_cache = cache.get_page_cache(str(tmp_path))
+
+    assert page_cache.get(review_link) is None
+    assert len(json.loads(page_cache.get(review_link + "#records"))) == 3
+
+    launched_drivers.clear()
+    http_fetcher.urls.clear()
+    replayed = make_scrapper(server, no_of_products=2, cache_mode="replay",
+                             **options).get_review_data()
+
+    assert replayed.equals(recorded)
+    assert launched_drivers == [] and http_fetcher.urls == []
+
+
+def test_replay_skips_uncached_pages_without_a_browser(tmp_path, serve, make_scrapper,
+                                                       launched_drivers, http_fetcher,
+                                                       monkeypatch):
+    server = serve(site_pages(SEARCH, no_of_products=2, reviews_per_product=3))
+    make_scrapper(server, no_of_products=2, cache_mode="on",
+                  cache_dir=str(tmp_path)).get_review_data()
+    page_cache = cache.get_page_cache(str(tmp_path))
+    os.remove(page_cache._path(f"{server.url}/reviews/10001"))
+    events = []
+    monkeypatch.setattr(get_metrics(), "log", lambda event, **fields: events.append((event, fields)))
+
+    launched_drivers.clear()
+    http_fetcher.urls.clear()
+    replayed = make_scrapper(server, no_of_products=2, cache_mode="replay",
+                             cache_dir=str(tmp_path)).get_review_data()
+
+    assert replayed["Product Name"].astype(str).str.contains("10000").all()
+    assert len(replayed) == 3
+    failures = [fields for event, fields in events if event == "scrape_product_failed"]
+    assert len(failures) == 1 and "not cached" in failures[0]["error"]
+    assert sum(event == "page_cache_hit" for event, _ in events) >= 3
+    assert launched_drivers == [] and http_fetcher.urls == []
+
@@ -0,0 +1,124 @@
+import sqlite3
+import time
+
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import site_pages
+from src.local_store import ReviewStore
+from src.schema import REVIEW_COLUMNS
+from src.scrapper.checkpoint import CheckpointStore
+from src.scrapper.scrape import from_checkpoint
+from tests.conftest import SEARCH
+
+REVIEWS = pd.DataFrame([{"Product Name": "Blue Tshirt", "Over_All_Rating": 4.1, "Price": 499.0,
+                         "Date": "2 Jan 2024", "Rating": 5, "Name": "A", "Comment": "good"}],
+                       columns=REVIEW_COLUMNS)
+
+
+def age_rows(path: str, seconds: float):
+    con = sqlite3.connect(path)
+    with con:
+        con.execute("UPDATE products SET updated_at = updated_at - ?", (seconds,))
+    con.close()
+
+
+def test_load_returns_saved_reviews(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.sqlite"))
+    store.save("run/men tshirt", "p/1", REVIEWS)
+    store.save("run/men tshirt", "p/2", None)
+
+    found, reviews = store.load("run/men tshirt", "p/1", REVIEW_COLUMNS)
+    assert found and reviews["Comment"].tolist() == ["good"]
+    assert store.load("run/men tshirt", "p/2", REVIEW_COLUMNS) == (True, None)
+    assert store.load("other/men tshirt", "p/1", REVIEW_COLUMNS) == (False, None)
+
+
+def test_expired_checkpoints_are_ignored_and_dropped(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    store = CheckpointStore(path, max_age=60)
+    store.save("run/men tshirt", "p/1", REVIEWS)
+    age_rows(path, 120)
+
+    assert store.load("run/men tshirt", "p/1", REVIEW_COLUMNS) == (False, None)
+
+    CheckpointStore(path, max_age=60)
+    con = sqlite3.connect(path)
+    assert con.execute("SELECT COUNT(*) FROM products").fetchone()[0] == 0
+    con.close()
+
+
+@pytest.fixture
+def scrapper(serve, make_scrapper):
+    server = serve(site_pages(SEARCH, no_of_products=3, reviews_per_product=4))
+
+    def make(checkpoint_path: str, run_id: str = None, store_dir: str = ""):
+        return make_scrapper(server, max_reviews=4, checkpoint_path=checkpoint_path,
+                             run_id=run_id, store_dir=store_dir)
+
+    return make
+
+
+def test_checkpoints_belong_to_one_run(scrapper, tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    first, second = scrapper(path), scrapper(path)
+    product_url = first.scrape_product_urls(SEARCH)[0]
+
+    # A consumer that handled the first product and stops at the second, e.g. a cancelled job
+    batches = first.iter_review_data()
+    next(batches), next(batches)
+    batches.close()
+
+    store = CheckpointStore(path)
+    assert first.checkpoint_key != second.checkpoint_key
+    assert store.load(first.checkpoint_key, product_url, REVIEW_COLUMNS)[0]
+    assert not store.load(second.checkpoint_key, product_url, REVIEW_COLUMNS)[0]
+
+    # Another scrape of the same query neither reads nor clears them
+    assert len(list(second.iter_review_data())) == 3
+    assert store.load(first.checkpoint_key, product_url, REVIEW_COLUMNS)[0]
+
+    first.clear_checkpoints()
+    assert not store.load(first.checkpoint_key, product_url, REVIEW_COLUMNS)[0]
+
+
+def test_run_resumes_from_its_checkpoints(scrapper, tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite")
+    interrupted = scrapper(path, run_id="crawl-1")
+    batches = interrupted.iter_review_data()
+    first_batch, _ = next(batches), next(batches)
+    batches.close()
+
+    resumed = scrapper(path, run_id="crawl-1")
+    product_url = resumed.scrape_product_urls(SEARCH)[0]
+    # Served from the checkpoint: the page is never loaded again
+    resumed.extract_reviews = lambda url: pytest.fail(f"{url} was scraped again")
+    resumed_batch = next(resumed._iter_products(_NoPool(), [product_url]))
+
+    pd.testing.assert_frame_equal(resumed_batch.reset_index(drop=True),
+                                  first_batch.reset_index(drop=True), check_categorical=False)
+
+
+def test_resumed_run_stores_restored_products_once(scrapper, tmp_path):
+    path, store_dir = str(tmp_path / "checkpoints.sqlite"), str(tmp_path / "reviews")
+    interrupted = scrapper(path, run_id="crawl-1", store_dir=store_dir)
+    batches = interrupted.iter_review_data()
+    next(batches), next(batches)
+    batches.close()
+
+    resumed = list(scrapper(path, run_id="crawl-1", store_dir=store_dir).iter_review_data())
+
+    assert [from_checkpoint(batch) for batch in resumed] == [True, False, False]
+    # Raw rows, not read_reviews, which would hide duplicates
+    stored = ReviewStore(store_dir).read(columns=["review_id"])
+    assert len(stored) == 12 and stored["review_id"].is_unique
+
+
+class _NoPool:
+    size = 1
+
+    def acquire(self):
+        raise AssertionError("A checkpointed product needs no browser")
+
+    def release(self, driver):
+        pass
@@ -0,0 +1,237 @@
+import pandas as pd
+import pytest
+
+from src.cloud_io import MongoIO
+from src.constants import PRODUCT_SUMMARIES_COLLECTION, PRODUCTS_COLLECTION, REVIEW_TERMS_COLLECTION
+
+SEARCH = "men tshirt"
+
+
+def drop(mongo_io: MongoIO, collection_name: str):
+    mongo_io.mongo_ins.get_database().drop_collection(collection_name)
+
+
+@pytest.mark.parametrize("storage_mode", ["normalized", "per_query"])
+def test_summaries_count_every_stored_review(mongo_url, make_reviews, storage_mode):
+    mongo_io = MongoIO(storage_mode=storage_mode)
+
+    mongo_io.store_reviews(SEARCH, make_reviews("Blue Tshirt", 30))
+    mongo_io.store_reviews(SEARCH, make_reviews("Red Tshirt", 10, seed=1))
+
+    assert mongo_io.get_summary_stats(SEARCH)["total"] == 40
+    assert mongo_io.count_reviews(SEARCH) == 40
+    summaries = mongo_io.get_product_summaries(SEARCH).set_index("name")
+    assert summaries.loc["Blue Tshirt", "review_count"] == 30
+
+
+@pytest.mark.parametrize("storage_mode", ["normalized", "per_query"])
+def test_missing_summary_is_seeded_from_stored_reviews(mongo_url, make_reviews, storage_mode):
+    mongo_io = MongoIO(storage_mode=storage_mode)
+    reviews = make_reviews(count=30)
+    mongo_io.store_reviews(SEARCH, reviews)
+    expected = mongo_io.get_summary_stats(SEARCH)
+    # As for reviews stored before summaries existed
+    drop(mongo_io, PRODUCT_SUMMARIES_COLLECTION)
+
+    report = mongo_io.store_reviews(SEARCH, reviews)
+
+    assert report["inserted"] == 0
+    stats = mongo_io.get_summary_stats(SEARCH)
+    assert stats["total"] == mongo_io.get_review_stats(SEARCH)["total"] == 30
+    pd.testing.assert_frame_equal(stats["rating_histogram"], expected["rating_histogram"])
+
+
+def test_seeded_summary_counts_new_reviews_once(mongo_url, make_reviews):
+    mongo_io = MongoIO()
+    mongo_io.store_reviews(SEARCH, make_reviews(count=30))
+    drop(mongo_io, PRODUCT_SUMMARIES_COLLECTION)
+
+    mongo_io.store_reviews(SEARCH, pd.concat([make_reviews(count=30),
+                                              make_reviews(count=10, seed=100)]))
+    mongo_io.store_reviews(SEARCH, make_reviews(count=5, seed=200))
+
+    assert mongo_io.get_summary_stats(SEARCH)["total"] == mongo_io.count_reviews(SEARCH) == 45
+
+
+def test_seeded_summary_keeps_the_searches_of_the_product(mongo_url, make_reviews):
+    mongo_io = MongoIO()
+    reviews = make_reviews(count=30)
+    mongo_io.store_reviews("blue tshirt", reviews)
+    drop(mongo_io, PRODUCT_SUMMARIES_COLLECTION)
+
+    mongo_io.store_reviews(SEARCH, reviews)
+
+    assert mongo_io.get_summary_stats("blue tshirt")["total"] == 30
+    assert mongo_io.get_summary_stats(SEARCH)["total"] == 30
+
+
+def test_count_reviews_of_an_unknown_search(mongo_url):
+    assert MongoIO().count_reviews("unknown search") == 0
+
+
+@pytest.mark.parametrize("storage_mode", ["normalized", "per_query"])
+def test_missing_term_documents_are_seeded_from_stored_reviews(mongo_url, make_reviews,
+                                                              storage_mode):
+    mongo_io = MongoIO(storage_mode=storage_mode)
+    reviews = make_reviews(count=30)
+    mongo_io.store_reviews(SEARCH, reviews)
+    expected = mongo_io.get_top_terms(SEARCH)
+    # As for reviews stored before the term index existed
+    drop(mongo_io, REVIEW_TERMS_COLLECTION)
+    assert mongo_io.count_indexed_reviews(SEARCH) == 0
+
+    mongo_io.store_reviews(SEARCH, reviews)
+
+    assert mongo_io.count_indexed_reviews(SEARCH) == 30
+    top_terms = mongo_io.get_top_terms(SEARCH)
+    for bucket, terms in expected.items():
+        pd.testing.assert_frame_equal(top_terms[bucket], terms)
+
+
+def test_term_index_counts_new_reviews_once(mongo_url, make_reviews):
+    mongo_io = MongoIO()
+    mongo_io.store_reviews(SEARCH, make_reviews(count=30))
+    drop(mongo_io, REVIEW_TERMS_COLLECTION)
+
+    mongo_io.store_reviews(SEARCH, pd.concat([make_reviews(count=30),
+                                              make_reviews(count=10, seed=100)]))
+    mongo_io.store_reviews(SEARCH, make_reviews(count=5, seed=200))
+
+    assert mongo_io.count_indexed_reviews(SEARCH) == mongo_io.count_reviews(SEARCH) == 45
+
+
+def test_products_not_stored_again_stay_missing_until_the_rebuild(mongo_url, make_reviews):
+    mongo_io = MongoIO()
+    mongo_io.store_reviews(SEARCH, make_reviews("Blue Tshirt", 30))
+    drop(mongo_io, REVIEW_TERMS_COLLECTION)
+    mongo_io.store_reviews(SEARCH, make_reviews("Red Tshirt", 10, seed=1))
+
+    assert mongo_io.count_indexed_reviews(SEARCH) == 10
+
+    mongo_io.rebuild_review_terms()
+
+    assert mongo_io.count_indexed_reviews(SEARCH) == 40
+
+
+class TextSearchCursor:
+    """The cursor calls search_reviews makes, over documents already scored."""
+
+    def __init__(self, documents: list):
+        self.documents = documents
+
+    def sort(self, keys: list):
+        (_, _), (date_field, _) = keys
+        # Best score first, newest first among equal scores
+        self.documents.sort(key=lambda document: document[date_field], reverse=True)
+        self.documents.sort(key=lambda document: document["score"], reverse=True)
+        return self
+
+    def skip(self, count: int):
+        self.documents = self.documents[count:]
+        return self
+
+    def limit(self, count: int):
+        self.documents = self.documents[:count]
+        return self
+
+    def max_time_ms(self, milliseconds: int):
+        return self
+
+    def __iter__(self):
+        return iter(self.documents)
+
+
+class TextSearchCollection:
+    """
+    A mongomock collection with a stand-in for the $text query mongomock
+    lacks: the score is the number of search words in the comment.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+    def find(self, query: dict = None, projection: dict = None, *args, **kwargs):
+        query = dict(query or {})
+        if "$text" not in query:
+            return self.collection.find(query, projection, *args, **kwargs)
+        words = query.pop("$text")["$search"].lower().split()
+        projection = {key: value for key, value in projection.items() if key != "score"}
+        documents = []
+        for document in self.collection.find(query, projection):
+            comment = str(document.get("comment", document.get("Comment", ""))).lower().split()
+            score = sum(word in comment for word in words)
+            if score:
+                documents.append({**document, "score": float(score)})
+        return TextSearchCursor(documents)
+
+
+@pytest.fixture
+def text_search(monkeypatch):
+    """text_search(mongo_io) lets the MongoIO run $text queries on mongomock."""
+
+    def patch(mongo_io: MongoIO) -> MongoIO:
+        get_collection = mongo_io.mongo_ins.get_collection
+        monkeypatch.setattr(mongo_io.mongo_ins, "get_collection",
+                            lambda name: TextSearchCollection(get_collection(name)))
+        return mongo_io
+
+    return patch
+
+
+@pytest.mark.parametrize("storage_mode", ["normalized", "per_query"])
+def test_search_pages_through_the_matches(mongo_url, make_reviews, text_search, storage_mode):
+    mongo_io = text_search(MongoIO(storage_mode=storage_mode))
+    mongo_io.store_reviews(SEARCH, make_reviews(count=25, comment="fits perfectly"))
+    mongo_io.store_reviews(SEARCH, make_reviews("Red Tshirt", 5, seed=1, comment="faded"))
+
+    pages = [mongo_io.search_reviews("perfectly", product_name=SEARCH, page=page, page_size=10)
+             for page in range(3)]
+
+    assert [len(page["reviews"]) for page in pages] == [10, 10, 5]
+    assert [page["has_more"] for page in pages] == [True, True, False]
+    names = pd.concat([page["reviews"]["Name"] for page in pages])
+    assert names.is_unique and len(names) == 25
+
+
+def test_search_filters(mongo_url, make_reviews, text_search):
+    mongo_io = text_search(MongoIO())
+    mongo_io.store_reviews(SEARCH, make_reviews("Blue Tshirt", 28, comment="fits perfectly"))
+    mongo_io.store_reviews(SEARCH, make_reviews("Red Tshirt", 28, seed=1, comment="fits perfectly"))
+
+    found = mongo_io.search_reviews("fits", product_name=SEARCH, products=["Red Tshirt"],
+                                    min_rating=2, max_rating=4, since="2024-01-05",
+                                    until="2024-01-20", page_size=100)["reviews"]
+
+    red = make_reviews("Red Tshirt", 28, seed=1)
+    dates = pd.to_datetime(red["Date"], format="%d %b %Y")
+    expected = red[red["Rating"].between(2, 4) & dates.between("2024-01-05", "2024-01-20")]
+    assert sorted(found["Name"]) == sorted(expected["Name"])
+    assert (found["Product Name"] == "Red Tshirt").all()
+
+
+def test_search_orders_by_score_then_date(mongo_url, make_reviews, text_search):
+    mongo_io = text_search(MongoIO())
+    reviews = make_reviews(count=4)
+    reviews["Comment"] = ["fabric quality is good", "soft fabric", "fabric and quality", "too tight"]
+    mongo_io.store_reviews(SEARCH, reviews)
+
+    found = mongo_io.search_reviews("fabric quality", product_name=SEARCH)["reviews"]
+
+    # Two matching words, the newer review first, then one matching word
+    assert found["Comment"].tolist() == ["fabric and quality", "fabric quality is good",
+                                         "soft fabric"]
+    assert found["Score"].tolist() == [2.0, 2.0, 1.0]
+
+
+def test_search_keeps_reviews_of_missing_products(mongo_url, make_reviews, text_search):
+    mongo_io = text_search(MongoIO())
+    mongo_io.store_reviews(SEARCH, make_reviews(count=3, comment="fits perfectly"))
+    drop(mongo_io, PRODUCTS_COLLECTION)
+
+    found = mongo_io.search_reviews("fits", products=["Blue Tshirt"])["reviews"]
+
+    assert len(found) == 3
+    assert found["Product Name"].isna().all() and found["Price"].isna().all()
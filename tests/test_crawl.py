@@ -0,0 +1,179 @@
+import argparse
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import product_page, site_pages
+from src import crawl
+from src.scrapper import rate_limit, scrape
+from src.scrapper.rate_limit import RateLimiter
+from tests.conftest import FakeDriver
+
+
+def test_read_queries(tmp_path):
+    path = tmp_path / "queries.csv"
+    path.write_text("query,products\n"
+                    "# nightly refresh\n"
+                    "men tshirt,20\n"
+                    "\n"
+                    "women kurta\t5\n"
+                    "kids shoes\n", encoding="utf-8")
+
+    assert crawl.read_queries(str(path), default_products=10) == [
+        ("men tshirt", 20), ("women kurta", 5), ("kids shoes", 10)]
+
+
+def test_read_queries_rejects_a_bad_count(tmp_path):
+    path = tmp_path / "queries.csv"
+    path.write_text("men tshirt,20\nwomen kurta,many\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="queries.csv:2"):
+        crawl.read_queries(str(path), default_products=10)
+
+
+def test_rate_limiter_allows_a_burst_then_waits(monkeypatch):
+    clock = [100.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(rate_limit.time, "sleep", sleep)
+    limiter = RateLimiter(rate=2, burst=3)
+
+    for _ in range(4):
+        limiter.acquire()
+
+    assert sleeps == [pytest.approx(0.5)]
+    assert limiter.requests == 4
+
+
+def test_rate_limiter_bounds_requests_per_host():
+    limiter = RateLimiter(rate=1000, burst=100, max_per_host=2)
+    in_flight, peak, lock = [0], [0], threading.Lock()
+
+    def request(url):
+        with limiter.request(url):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.02)
+            with lock:
+                in_flight[0] -= 1
+
+    threads = [threading.Thread(target=request, args=(f"https://www.myntra.com/p/{i}",))
+               for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak[0] == 2
+    with limiter.request("https://www.myntra.com/p/7", token=False):
+        pass
+    assert limiter.requests == 6
+
+
+class RecordingLimiter(RateLimiter):
+    """Records, for every request, whether it took a token and how many browsers were up."""
+
+    def __init__(self, launched_drivers: list):
+        super().__init__(rate=1000, burst=100, max_per_host=1)
+        self.launched_drivers = launched_drivers
+        self.log = []
+
+    def request(self, url, token=True):
+        self.log.append((token, len(self.launched_drivers)))
+        return super().request(url, token=token)
+
+
+def test_browser_fallback_is_throttled_once(serve, make_scrapper, launched_drivers):
+    pages = site_pages("men tshirt", no_of_products=1, reviews_per_product=1)
+    pages["/tshirts/rendered/1/buy"] = "<html><body><div id='root'></div></body></html>"
+    server = serve(pages)
+    limiter = RecordingLimiter(launched_drivers)
+
+    def launch() -> FakeDriver:
+        launched_drivers.append(FakeDriver(product_page("1")))
+        return launched_drivers[-1]
+
+    scrapper = make_scrapper(server, rate_limiter=limiter, driver_factory=launch)
+    pages_before = crawl.pages_loaded()
+
+    scrapper._get_page(f"{server.url}/tshirts/rendered/1/buy", marker="pdp-price")
+
+    # The HTTP attempt takes the token; Chrome starts before the fallback takes the host slot
+    assert limiter.log == [(True, 0), (False, 1)]
+    assert limiter.requests == 1
+    assert crawl.pages_loaded() == pages_before + 1
+
+
+def crawl_args(**overrides) -> argparse.Namespace:
+    args = dict(output=["files"], out_dir="", workers=1, run_id="run", retries=2, backoff=1.0)
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+class FlakyScrapeReviews:
+    """Fails the first `failures` attempts, then yields one batch of two reviews."""
+
+    failures = 0
+    attempts = 0
+
+    def __init__(self, **options):
+        pass
+
+    def iter_review_data(self):
+        FlakyScrapeReviews.attempts += 1
+        if FlakyScrapeReviews.attempts <= FlakyScrapeReviews.failures:
+            raise RuntimeError("search page did not load")
+        yield pd.DataFrame({"Comment": ["good", "bad"]})
+
+
+@pytest.fixture
+def flaky(monkeypatch):
+    FlakyScrapeReviews.attempts = 0
+    monkeypatch.setattr(scrape, "ScrapeReviews", FlakyScrapeReviews)
+    monkeypatch.setattr(crawl.random, "uniform", lambda low, high: 1.0)
+    sleeps = []
+    monkeypatch.setattr(crawl.time, "sleep", sleeps.append)
+    return sleeps
+
+
+def test_failed_search_is_retried_with_backoff(flaky):
+    FlakyScrapeReviews.failures = 2
+
+    result = crawl.crawl_query("men tshirt", 1, crawl_args(), limiter=None)
+
+    assert (result["attempts"], result["products"], result["reviews"]) == (3, 1, 2)
+    assert result["error"] is None
+    assert flaky == [1.0, 2.0]
+
+
+def test_search_fails_after_the_last_retry(flaky):
+    FlakyScrapeReviews.failures = 5
+
+    result = crawl.crawl_query("men tshirt", 1, crawl_args(), limiter=None)
+
+    assert result["attempts"] == 3
+    assert result["error"] == "search page did not load"
+    assert flaky == [1.0, 2.0]
+
+
+def test_unreachable_mongodb_fails_only_its_search(flaky, monkeypatch):
+    import src.cloud_io
+
+    def unreachable():
+        raise ConnectionError("MongoDB is not reachable")
+
+    monkeypatch.setattr(src.cloud_io, "MongoIO", unreachable)
+
+    result = crawl.crawl_query("men tshirt", 1, crawl_args(output=["mongo"], retries=1),
+                               limiter=None)
+
+    assert result["attempts"] == 2
+    assert result["error"] == "MongoDB is not reachable"
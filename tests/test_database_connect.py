@@ -0,0 +1,89 @@
+import pandas as pd
+
+from src.database_connect import _clients, close_clients, get_shared_client, mongo_operation
+
+
+def test_shared_client_is_reused_within_a_process(mongo_url):
+    first = mongo_operation(mongo_url, "test")
+    second = mongo_operation(mongo_url, "test")
+
+    assert first.get_client() is second.get_client()
+    assert get_shared_client(mongo_url, **first.client_options)[0] is first.get_client()
+    # Data written through one instance is visible through the other
+    first.get_collection("items").insert_one({"key": 1})
+    assert second.get_collection("items").count_documents({}) == 1
+
+
+def test_shared_clients_are_keyed_by_options(mongo_url):
+    default = mongo_operation(mongo_url, "test")
+    small_pool = mongo_operation(mongo_url, "test", max_pool_size=2)
+
+    assert default.get_client() is not small_pool.get_client()
+
+
+def test_close_clients_opens_new_clients_afterwards(mongo_url):
+    operation = mongo_operation(mongo_url, "test")
+    client = operation.get_client()
+
+    close_clients()
+
+    assert not _clients
+    assert operation.get_client() is not client
+
+
+def test_close_only_drops_its_own_client(mongo_url):
+    default = mongo_operation(mongo_url, "test")
+    small_pool = mongo_operation(mongo_url, "test", max_pool_size=2)
+    client, other = default.get_client(), small_pool.get_client()
+
+    default.close()
+
+    assert default.get_client() is not client
+    assert small_pool.get_client() is other
+
+
+def test_pool_stats(mongo_url):
+    stats = mongo_operation(mongo_url, "test").pool_stats()
+
+    assert {"pools_created", "connections_created", "connections_closed", "checked_out",
+            "checked_in", "checkout_failed", "open_connections", "in_use"} <= set(stats)
+    # mongomock has no connection pool
+    assert stats["open_connections"] == 0 and stats["in_use"] == 0
+
+
+def test_bulk_upsert_is_idempotent(mongo_url):
+    operation = mongo_operation(mongo_url, "test")
+    frame = pd.DataFrame({"key": [f"k{i}" for i in range(25)], "value": range(25)})
+
+    first = operation.bulk_upsert("items", frame, key_field="key", batch_size=10)
+    second = operation.bulk_upsert("items", frame, key_field="key", batch_size=10)
+
+    assert (first["inserted"], first["matched"], first["batches"]) == (25, 0, 3)
+    assert sorted(first["inserted_keys"]) == sorted(frame["key"])
+    assert (second["inserted"], second["matched"], second["inserted_keys"]) == (0, 25, [])
+    assert operation.get_collection("items").count_documents({}) == 25
+
+
+def test_bulk_upsert_counts_repeated_rows_once(mongo_url):
+    operation = mongo_operation(mongo_url, "test")
+    frame = pd.DataFrame({"key": ["a", "b", "a"], "value": [1, 2, 3]})
+
+    report = operation.bulk_upsert("items", frame, key_field="key")
+
+    assert (report["inserted"], report["duplicates"]) == (2, 1)
+    # The first of the repeated rows is kept
+    assert operation.get_collection("items").find_one({"key": "a"})["value"] == 1
+
+
+def test_store_reviews_twice_inserts_nothing_the_second_time(mongo_url, make_reviews):
+    from src.cloud_io import MongoIO
+
+    mongo_io = MongoIO()
+    reviews = make_reviews(count=30)
+
+    first = mongo_io.store_reviews("men tshirt", reviews)
+    second = mongo_io.store_reviews("men tshirt", reviews)
+
+    assert (first["inserted"], first["matched"]) == (30, 0)
+    assert (second["inserted"], second["matched"]) == (0, 30)
+    assert mongo_io.get_review_stats("men tshirt")["total"] == 30
@@ -0,0 +1,32 @@
+from benchmarks.fixtures import site_pages
+from src.metrics import get_metrics
+from src.scrapper.scrape import ScrapeReviews
+from tests.conftest import SEARCH
+
+FAILING_PRODUCT = "10001"
+
+
+def test_failed_product_is_skipped_and_every_driver_disposed(serve, make_scrapper,
+                                                             launched_drivers, monkeypatch):
+    server = serve(site_pages(SEARCH, no_of_products=5, reviews_per_product=2))
+    extract_reviews = ScrapeReviews.extract_reviews
+
+    def failing(self, product_link):
+        if FAILING_PRODUCT in product_link:
+            raise RuntimeError("product page did not load")
+        return extract_reviews(self, product_link)
+
+    monkeypatch.setattr(ScrapeReviews, "extract_reviews", failing)
+    events = []
+    monkeypatch.setattr(get_metrics(), "log", lambda event, **fields: events.append((event, fields)))
+    scrapper = make_scrapper(server, no_of_products=3, workers=2, fetch_mode="browser")
+
+    reviews = scrapper.get_review_data()
+
+    # The remaining products keep their search-result order
+    product_ids = [name.split()[-3] for name in reviews["Product Name"].astype(str)]
+    assert product_ids == ["10000"] * 2 + ["10002"] * 2 + ["10003"] * 2
+    failures = [fields for event, fields in events if event == "scrape_product_failed"]
+    assert len(failures) == 1 and FAILING_PRODUCT in failures[0]["url"]
+    assert 1 <= len(launched_drivers) <= 2
+    assert all(driver.quit_calls == 1 for driver in launched_drivers)
@@ -0,0 +1,74 @@
+import pytest
+
+from benchmarks.fixtures import product_page, site_pages
+from src.metrics import get_metrics
+from tests.conftest import SEARCH, FakeDriver
+
+# Product page whose price is rendered by JavaScript: no "pdp-price" marker
+RENDERED_BY_SCRIPT = "<html><body><div id='root'></div><script src='app.js'></script></body></html>"
+
+
+@pytest.fixture
+def server(serve):
+    pages = site_pages(SEARCH, no_of_products=3, reviews_per_product=5)
+    pages["/tshirts/rendered/1/buy"] = RENDERED_BY_SCRIPT
+    return serve(pages)
+
+
+def test_fetch_returns_the_page(server, http_fetcher):
+    page = http_fetcher.fetch(f"{server.url}/tshirts/leotude/10000/buy")
+
+    assert "pdp-price" in page
+
+
+def test_fetch_returns_none_for_a_404(server, http_fetcher):
+    assert http_fetcher.fetch(f"{server.url}/missing") is None
+
+
+def test_fetch_many_keeps_the_order_of_the_urls(server, http_fetcher):
+    paths = ["/reviews/10002", "/missing", "/tshirts/leotude/10001/buy"]
+
+    pages = http_fetcher.fetch_many(f"{server.url}{path}" for path in paths)
+
+    assert "user-review-main" in pages[0]
+    assert pages[1] is None
+    assert "10001" in pages[2]
+
+
+def test_page_with_marker_is_parsed_without_selenium(server, make_scrapper, launched_drivers):
+    scrape = make_scrapper(server)
+
+    product_urls = scrape.scrape_product_urls(SEARCH)
+    details = scrape.extract_reviews(product_urls[0])
+
+    assert len(product_urls) == 3
+    assert details == {"href": "/reviews/10000"}
+    assert scrape.product_price is not None
+    assert scrape._driver is None and launched_drivers == []
+
+
+def test_missing_marker_falls_back_to_the_browser(server, make_scrapper):
+    driver = FakeDriver(product_page("1"))
+    scrape = make_scrapper(server, driver=driver)
+    fallbacks = get_metrics().snapshot()["counters"]
+
+    page = scrape._get_page(f"{server.url}/tshirts/rendered/1/buy", marker="pdp-price")
+
+    assert driver.urls == [f"{server.url}/tshirts/rendered/1/buy"]
+    assert page == driver.page_source
+    assert _fallbacks(get_metrics().snapshot()["counters"]) == _fallbacks(fallbacks) + 1
+
+
+def test_404_falls_back_to_the_browser(server, make_scrapper):
+    driver = FakeDriver(product_page("2"))
+    scrape = make_scrapper(server, driver=driver)
+
+    details = scrape.extract_reviews("tshirts/missing/2/buy")
+
+    assert driver.urls == [f"{server.url}/tshirts/missing/2/buy"]
+    assert details == {"href": "/reviews/2"}
+
+
+def _fallbacks(counters: list) -> float:
+    return sum(counter["value"] for counter in counters
+               if counter["name"] == "scrape_browser_fallbacks_total")
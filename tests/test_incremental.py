@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from benchmarks.fixtures import review, site_pages
+from src.cloud_io import MongoIO
+from src.scrapper.parser import get_parser
+from tests.conftest import SEARCH
+
+STORED, NEW = 40, 5
+TITLE = "Buy Leotude Men Typography Printed T Shirt 10000 | Myntra"
+
+
+def reviews_html(reviews: list) -> str:
+    return (f"<!DOCTYPE html><html><head><title>{TITLE}</title></head><body>"
+            f'<div class="detailed-reviews-userReviewsContainer">{"".join(reviews)}</div>'
+            f"</body></html>")
+
+
+@pytest.fixture
+def site(serve):
+    old_rng, new_rng = random.Random(0), random.Random(1)
+    stored = [review(old_rng) for _ in range(STORED)]
+    new = [review(new_rng) for _ in range(NEW)]
+    pages = site_pages(SEARCH, no_of_products=1, reviews_per_product=0)
+    pages["/reviews/10000"] = reviews_html(stored)
+    # Incremental runs ask for the newest reviews first
+    pages["/reviews/10000?sort=recent"] = reviews_html(new + stored)
+    return serve(pages), get_parser("lxml").reviews(reviews_html(new))
+
+
+def test_rescrape_returns_only_new_reviews_and_stops_scrolling(site, make_scrapper,
+                                                               launched_drivers, mongo_url):
+    server, new_reviews = site
+    mongoio = MongoIO()
+    first = make_scrapper(server, no_of_products=1).get_review_data()
+    mongoio.store_reviews(product_name=SEARCH, reviews=first)
+    assert len(first) == STORED
+
+    launched_drivers.clear()
+    rescrape = make_scrapper(server, no_of_products=1, review_extraction="script",
+                             seen_reviews=lambda title: mongoio.get_review_watermark(SEARCH, title))
+    new = rescrape.get_review_data()
+
+    assert new[["Name", "Comment"]].to_dict("records") == [
+        {"Name": record["Name"], "Comment": record["Comment"]} for record in new_reviews]
+    assert launched_drivers[0].urls[-1].endswith("/reviews/10000?sort=recent")
+    # Scrolling stopped at the first step of stored reviews instead of loading all of them
+    assert rescrape.scroll_stats[-1]["stop_reason"] == "seen_reviews"
+    assert rescrape.scroll_stats[-1]["reviews"] < STORED + NEW
@@ -0,0 +1,120 @@
+import os
+import sqlite3
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from src import jobs
+from src.jobs import JobQueue
+from src.jobs.store import JobStore
+
+
+class FakeExecutor:
+    """Records submitted jobs instead of running them; `broken` makes submit raise."""
+
+    instances = []
+
+    def __init__(self, *args, **kwargs):
+        self.broken = False
+        self.submitted = []
+        self.futures = []
+        FakeExecutor.instances.append(self)
+
+    def submit(self, func, db_path, results_dir, job_id):
+        if self.broken:
+            raise BrokenProcessPool("A child process terminated abruptly")
+        future = Future()
+        self.submitted.append(job_id)
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    FakeExecutor.instances = []
+    monkeypatch.setattr(jobs, "ProcessPoolExecutor", FakeExecutor)
+    return JobQueue(str(tmp_path / "jobs.sqlite"), str(tmp_path / "results"), workers=1)
+
+
+def set_worker_pid(db_path: str, job_id: str, pid: int):
+    con = sqlite3.connect(db_path)
+    with con:
+        con.execute("UPDATE jobs SET worker_pid = ? WHERE id = ?", (pid, job_id))
+    con.close()
+
+
+def dead_pid() -> int:
+    pid = 999999
+    while jobs._pid_alive(pid):
+        pid -= 1
+    return pid
+
+
+def test_queued_jobs_report_their_position(queue):
+    first, second, third = (queue.submit("men tshirt", 3) for _ in range(3))
+    queue.store.start(first)
+
+    assert queue.status(first)["status"] == JobStore.RUNNING
+    assert queue.status(first)["queue_position"] is None
+    assert queue.status(second)["queue_position"] == 1
+    assert queue.status(third)["queue_position"] == 2
+
+
+def test_cancel_stops_a_queued_job_at_once_and_a_running_one_later(queue):
+    running, queued = queue.submit("men tshirt", 3), queue.submit("men shirt", 3)
+    queue.store.start(running)
+
+    queue.cancel(running)
+    queue.cancel(queued)
+
+    assert queue.status(queued)["status"] == JobStore.CANCELLED
+    assert not queue.store.start(queued)
+    # A running job checks the flag after its current product
+    assert queue.status(running)["status"] == JobStore.RUNNING
+    assert queue.store.cancel_requested(running)
+
+
+def test_jobs_of_a_crashed_app_are_resumed(tmp_path, monkeypatch):
+    FakeExecutor.instances = []
+    monkeypatch.setattr(jobs, "ProcessPoolExecutor", FakeExecutor)
+    db_path = str(tmp_path / "jobs.sqlite")
+    store = JobStore(db_path)
+    crashed, alive, queued, done = (store.create("men tshirt", 3) for _ in range(4))
+    for job_id in (crashed, alive, done):
+        store.start(job_id)
+    set_worker_pid(db_path, crashed, dead_pid())
+    store.finish(done, JobStore.DONE)
+
+    queue = JobQueue(db_path, str(tmp_path / "results"), workers=1)
+
+    assert FakeExecutor.instances[-1].submitted == [crashed, queued]
+    assert queue.status(crashed)["status"] == JobStore.QUEUED
+    # Its worker is still running, so it is not started twice
+    assert queue.status(alive)["status"] == JobStore.RUNNING
+    assert os.getpid() == queue.status(alive)["worker_pid"]
+
+
+def test_job_fails_when_its_worker_process_dies(queue):
+    job_id = queue.submit("men tshirt", 3)
+    queue.store.start(job_id)
+
+    queue.executor.futures[0].set_exception(BrokenProcessPool("A child process terminated abruptly"))
+
+    job = queue.status(job_id)
+    assert job["status"] == JobStore.FAILED
+    assert "BrokenProcessPool" in job["error"]
+
+
+def test_broken_pool_is_replaced_on_submit(queue):
+    broken = queue.executor
+    broken.broken = True
+
+    job_id = queue.submit("men tshirt", 3)
+
+    assert queue.executor is not broken
+    assert queue.executor.submitted == [job_id]
+    assert queue.status(job_id)["status"] == JobStore.QUEUED
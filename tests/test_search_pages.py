@@ -0,0 +1,36 @@
+import pytest
+
+from benchmarks.fixtures import site_pages
+from tests.conftest import SEARCH
+
+
+@pytest.fixture
+def scrapper(serve, make_scrapper):
+    return make_scrapper(serve(site_pages(SEARCH, no_of_products=10, reviews_per_product=1)))
+
+
+def search_pages(scrapper) -> list:
+    return [url for url in scrapper.fetcher.urls if "rawQuery" in url]
+
+
+def test_next_page_is_not_loaded_for_a_few_links(scrapper):
+    product_urls = scrapper.iter_product_urls(SEARCH)
+    taken = [next(product_urls) for _ in range(3)]
+    product_urls.close()
+
+    assert len(taken) == 3
+    assert search_pages(scrapper) == [scrapper._search_url(SEARCH, 1)]
+
+
+def test_next_page_is_loaded_once_half_the_links_are_taken(scrapper):
+    product_urls = list(scrapper.iter_product_urls(SEARCH))
+
+    assert len(product_urls) == 10
+    # The second fixture page is empty, so paging stops there
+    assert search_pages(scrapper) == [scrapper._search_url(SEARCH, 1),
+                                      scrapper._search_url(SEARCH, 2)]
+
+
+def test_paging_stops_at_max_pages(scrapper):
+    assert len(list(scrapper.iter_product_urls(SEARCH, max_pages=1))) == 10
+    assert search_pages(scrapper) == [scrapper._search_url(SEARCH, 1)]